@@ -0,0 +1,355 @@
+"""
+Concurrent-session load test for the Chainlit handlers.
+
+Drives handle_chat_start and handle_message for N simulated chat sessions in
+one process. The LLM is a scripted OpenAI-compatible chat completions server
+that hands off to the query agent, calls one read-only tool and then streams
+the answer in deltas. The RPC is a fake JSON-RPC server with configurable
+latency. Both run on their own event-loop thread, so they add no lag to the loop
+being measured.
+
+For each concurrency stage it reports p50/p95/p99 latency to the first streamed
+token and to completion, plus event-loop lag. Anything that blocks the loop
+(synchronous RPC, compilation, file I/O) shows up as lag and as a long tail
+that grows with the number of sessions:
+
+    python -m benchmarks.load_test --sessions 1,10,50,100 --turns 3 --rpc-latency 0.05
+
+Results are written as JSON next to the tool benchmarks in .cache/benchmarks/.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from aiohttp import web
+
+DEFAULT_OUTPUT_DIR = ".cache/benchmarks"
+ADDRESS_PATTERN = re.compile(r"0x[a-fA-F0-9]{40}")
+
+# Phrased so they miss the fast-path grammar and go through the agent graph.
+PROMPTS = [
+    ("Could you look up the balance of wallet {address} for me?", "eth_get_balance"),
+    ("How many transactions has {address} sent so far?", "eth_get_transaction_count"),
+    ("What is the gas price right now, I want to send something soon?", "eth_gas_price"),
+]
+ANSWER = "Here is what I found on the network for your request, based on the latest block the node reported."
+
+
+class FakeBackends:
+    """Scripted LLM and fake JSON-RPC servers running on a background event-loop thread."""
+
+    def __init__(self, rpc_latency: float, llm_latency: float, token_delay: float):
+        self.rpc_latency = rpc_latency
+        self.llm_latency = llm_latency
+        self.token_delay = token_delay
+        self.rpc_calls = 0
+        self.llm_calls = 0
+        self._started_at = time.monotonic()
+        self._loop = asyncio.new_event_loop()
+        self._runners: list[web.AppRunner] = []
+
+    def start(self) -> tuple[str, str]:
+        """Starts both servers and returns (RPC URL, LLM base URL)."""
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        rpc_app, llm_app = web.Application(), web.Application()
+        rpc_app.router.add_post("/", self._handle_rpc)
+        llm_app.router.add_post("/v1/chat/completions", self._handle_chat)
+        rpc_url = asyncio.run_coroutine_threadsafe(self._serve(rpc_app), self._loop).result()
+        llm_url = asyncio.run_coroutine_threadsafe(self._serve(llm_app), self._loop).result()
+        return rpc_url + "/", llm_url + "/v1"
+
+    def stop(self) -> None:
+        for runner in self._runners:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _serve(self, app: web.Application) -> str:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self._runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    # <-------- JSON-RPC -------->
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(self.rpc_latency)
+        if isinstance(body, list):
+            self.rpc_calls += len(body)
+            return web.json_response([self._rpc_result(item) for item in body])
+        self.rpc_calls += 1
+        return web.json_response(self._rpc_result(body))
+
+    def _rpc_result(self, request: dict) -> dict:
+        method = request["method"]
+        # A new block every 3 seconds, like BSC.
+        block = int((time.monotonic() - self._started_at) // 3) + 1
+        results = {
+            "web3_clientVersion": "fake-rpc/1.0",
+            "eth_chainId": hex(97),
+            "eth_blockNumber": hex(block),
+            "eth_getBalance": hex(10**18),
+            "eth_getTransactionCount": hex(5),
+            "eth_gasPrice": hex(3 * 10**9),
+            "eth_getCode": "0x",
+            "eth_call": "0x",
+            "eth_getTransactionReceipt": None,
+            "eth_getTransactionByHash": None,
+        }
+        if method not in results:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": f"{method} not supported"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": results[method]}
+
+    # <-------- CHAT COMPLETIONS -------->
+
+    async def _handle_chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.llm_calls += 1
+        await asyncio.sleep(self.llm_latency)
+        reply = self._script(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        usage = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": reply.get("content")}
+            if "tool" in reply:
+                message["tool_calls"] = [self._tool_call(reply)]
+            return web.json_response({
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": body["model"],
+                "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if "tool" in reply else "stop"}],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(delta: dict, finish_reason: str | None = None, chunk_usage: dict | None = None) -> None:
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": body["model"],
+                "choices": [] if chunk_usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if chunk_usage:
+                chunk["usage"] = chunk_usage
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        if "tool" in reply:
+            await send({"role": "assistant", "tool_calls": [{"index": 0, **self._tool_call(reply)}]})
+            await send({}, "tool_calls")
+        else:
+            await send({"role": "assistant", "content": ""})
+            for word in reply["content"].split(" "):
+                await send({"content": word + " "})
+                await asyncio.sleep(self.token_delay)
+            await send({}, "stop")
+        await send({}, chunk_usage=usage)
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    def _script(self, body: dict) -> dict:
+        """Deterministic agent turn: guardrail verdict, handoff to the query agent, one tool call, then the answer; plain text for agents without tools."""
+        if body.get("response_format"):
+            return {"content": json.dumps({"is_safe": True, "reasoning": "Scripted load-test verdict"})}
+        messages = body["messages"]
+        called = [
+            call["function"]["name"]
+            for message in messages if message.get("role") == "assistant"
+            for call in message.get("tool_calls") or []
+        ]
+        # Tool-less agents such as the history summarizer just get text back.
+        if any(not name.startswith("transfer_to_") for name in called) or not body.get("tools"):
+            return {"content": ANSWER}
+        tool_names = [tool["function"]["name"] for tool in body.get("tools", [])]
+        handoff = next((name for name in tool_names if name.startswith("transfer_to_") and "query" in name), None)
+        if handoff is not None:
+            return {"tool": handoff, "arguments": "{}"}
+
+        prompt = next(message["content"] for message in reversed(messages) if message.get("role") == "user")
+        prompt = prompt if isinstance(prompt, str) else " ".join(part.get("text", "") for part in prompt)
+        tool = next(tool for template, tool in PROMPTS if template.split("{")[0] in prompt)
+        arguments = {"chain_id": 97}
+        if address := ADDRESS_PATTERN.search(prompt):
+            arguments["account"] = address.group(0)
+        return {"tool": tool, "arguments": json.dumps(arguments)}
+
+    @staticmethod
+    def _tool_call(reply: dict) -> dict:
+        return {
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": reply["tool"], "arguments": reply["arguments"]},
+        }
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1] * 1000, 1)}
+
+
+async def monitor_loop_lag(samples: list[float], stop: asyncio.Event, interval: float = 0.01) -> None:
+    """Records how late the loop wakes up from a fixed sleep; blocking calls show up as large values."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def run_stage(sessions: int, turns: int) -> dict:
+    import chainlit as cl
+    from chainlit.context import init_http_context
+    from chainlit.emitter import BaseChainlitEmitter
+    from src.handlers.chainlit_handlers import handle_chat_start, handle_message
+
+    class RecordingEmitter(BaseChainlitEmitter):
+        """Headless emitter that timestamps the first streamed token, counts stream frames and keeps the last assistant output."""
+
+        first_token_at: float | None = None
+        frames: int = 0
+        last_output: str = ""
+
+        async def stream_start(self, step_dict):
+            self.frames += 1
+            if self.first_token_at is None:
+                self.first_token_at = time.perf_counter()
+
+        async def send_token(self, id, token, is_sequence=False):
+            self.frames += 1
+
+        async def send_step(self, step_dict):
+            self._record(step_dict)
+
+        async def update_step(self, step_dict):
+            self._record(step_dict)
+
+        def _record(self, step_dict):
+            if step_dict.get("type") == "assistant_message":
+                self.last_output = step_dict.get("output") or ""
+
+    first_token, completion, frames, errors = [], [], [], []
+
+    async def session(index: int) -> None:
+        context = init_http_context()
+        emitter = RecordingEmitter(context.session)
+        context.emitter = emitter
+        await handle_chat_start()
+        address = "0x" + f"{index + 1:040x}"
+        for turn in range(turns):
+            template, _ = PROMPTS[(index + turn) % len(PROMPTS)]
+            emitter.first_token_at, emitter.frames, emitter.last_output = None, 0, ""
+            start = time.perf_counter()
+            await handle_message(cl.Message(content=template.format(address=address)))
+            completion.append(time.perf_counter() - start)
+            frames.append(emitter.frames)
+            if emitter.first_token_at is not None:
+                first_token.append(emitter.first_token_at - start)
+            if emitter.last_output.startswith("Error") or emitter.first_token_at is None:
+                errors.append(emitter.last_output or "no tokens streamed")
+
+    lag, stop = [], asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(lag, stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(session(i) for i in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    errors += [f"{type(result).__name__}: {result}" for result in results if isinstance(result, Exception)]
+    return {
+        "sessions": sessions,
+        "messages": sessions * turns,
+        "completed": len(completion),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "elapsed_s": round(elapsed, 2),
+        "throughput_msg_per_s": round(len(completion) / elapsed, 2) if elapsed else None,
+        "first_token_ms": percentiles(first_token),
+        "completion_ms": percentiles(completion),
+        "loop_lag_ms": percentiles(lag),
+        "frames_per_message": round(sum(frames) / len(frames), 1) if frames else None,
+    }
+
+
+async def run(args) -> dict:
+    backends = FakeBackends(args.rpc_latency, args.llm_latency, args.token_delay)
+    rpc_url, llm_url = backends.start()
+
+    # Settings are read at import time, so the fake backends have to be configured first.
+    os.environ["INFURA_URL"] = rpc_url
+    os.environ["BASE_URL"] = llm_url
+    os.environ["GEMINI_API_KEY"] = "load-test"
+    os.environ["LLM_MODEL"] = "scripted-load-test"
+    os.environ["FAST_PATH_ROUTER"] = "true" if args.fast_path else "false"
+    os.environ["OPENAI_AGENTS_DISABLE_TRACING"] = "1"
+
+    stages = []
+    for sessions in args.sessions:
+        rpc_before, llm_before = backends.rpc_calls, backends.llm_calls
+        stage = await run_stage(sessions, args.turns)
+        stage["rpc_calls"] = backends.rpc_calls - rpc_before
+        stage["llm_calls"] = backends.llm_calls - llm_before
+        stages.append(stage)
+        print_stage(stage)
+
+    from src.components.chain_clients import close_chain_clients
+    from src.utils.http import close_http_session
+    await close_chain_clients()
+    await close_http_session()
+    backends.stop()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "turns": args.turns,
+            "rpc_latency_s": args.rpc_latency,
+            "llm_latency_s": args.llm_latency,
+            "token_delay_s": args.token_delay,
+            "fast_path": args.fast_path,
+        },
+        "stages": stages,
+    }
+
+
+def print_stage(stage: dict) -> None:
+    ft, done, lag = stage["first_token_ms"], stage["completion_ms"], stage["loop_lag_ms"]
+    print(
+        f"sessions={stage['sessions']:<5} msgs={stage['completed']}/{stage['messages']} errors={stage['errors']} "
+        f"{stage['throughput_msg_per_s']} msg/s | first token p50/p95/p99 {ft['p50']}/{ft['p95']}/{ft['p99']} ms | "
+        f"completion p50/p95/p99 {done['p50']}/{done['p95']}/{done['p99']} ms | loop lag p99/max {lag['p99']}/{lag['max']} ms | "
+        f"{stage['frames_per_message']} frames/msg"
+    )
+    for sample in stage["error_samples"]:
+        print(f"    error: {sample[:160]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=lambda value: [int(n) for n in value.split(",")], default=[1, 10, 50], help="comma-separated concurrency stages (default: 1,10,50)")
+    parser.add_argument("--turns", type=int, default=3, help="messages per session (default: 3)")
+    parser.add_argument("--rpc-latency", type=float, default=0.05, help="fake RPC latency in seconds (default: 0.05)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake LLM time to first chunk in seconds (default: 0.2)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="delay between streamed deltas in seconds (default: 0.005)")
+    parser.add_argument("--fast-path", action="store_true", help="leave the fast-path router on (the scripted prompts miss it anyway)")
+    parser.add_argument("--output", help=f"result file (default: {DEFAULT_OUTPUT_DIR}/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"load-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
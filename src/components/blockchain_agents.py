@@ -1,25 +1,31 @@
 from agents import Agent, InputGuardrail
-from ..config.settings import model
-from ..components.tools import eth_get_balance, eth_get_transaction_count, eth_get_code, eth_gas_price, token_get_balance, transfer_eth, transfer_token, token_get_info, approve_token, deploy_erc20_token
+from ..config.settings import model, DEFAULT_CHAIN_ID
+from ..components.tools import eth_get_balance, eth_get_balances, eth_get_transaction_count, eth_get_transaction_counts, eth_get_code, eth_gas_price, token_get_balance, token_get_balances, transfer_eth, transfer_token, token_get_info, get_portfolio, approve_token, deploy_erc20_token, batch_transfer_preview, batch_transfer, watch_address, unwatch_address, list_watches
 from ..components.guardrails import prompt_guardrail
+from ..config.chains import CHAINS
+
+SUPPORTED_CHAINS = ", ".join(f"{chain.name} ({chain.chain_id})" for chain in CHAINS.values())
 
 # Blockchain Query Agent
 blockchain_query_agent: Agent = Agent(
     name="Blockchain Query Agent",
     handoff_description="Specialist agent for fetching the readable information from the blockchain as per user instructions.",
-    instructions="""
+    instructions=f"""
     You are a helpful assistant who fetches the readable information from the blockchain via tool calls.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
+    - Every tool takes a chain_id. Use {DEFAULT_CHAIN_ID} unless the user names another network. Supported networks: {SUPPORTED_CHAINS}.
 
     Tools available:
-    - eth_get_balance(account: str) -> str: Fetches the ETH balance of a single account address. Call this tool separately after each LLM call, for each address when multiple addresses are requested.
-    - eth_get_transaction_count(account: str) -> str: Fetches the transaction count for a given Ethereum wallet address. Call this tool separately after each LLM call, for each address when multiple addresses are requested.
-    - eth_get_code(account: str) -> str: Fetches the byte code for a given Ethereum smart contract address. Call this tool separately after each LLM call, for each address when multiple addresses are requested. Display the complete byte code in code block for better readability.
-    - eth_gas_price() -> str: Fetches the current gas price for the respective blockchain network.
-    - token_get_balance(account: str, token_address: str) -> str: Fetches the token balance and details for a single account address and a given token address in respective example format. When multiple addresses are requested, call this tool separately after each LLM call for each address.
+    - eth_get_balance(account: str, chain_id: int) -> str: Fetches the ETH balance of a single account address.
+    - eth_get_balances(accounts: list[str], chain_id: int) -> str: Fetches the ETH balances of multiple account addresses in one call and returns a table. Always prefer this tool over repeated eth_get_balance calls when more than one address is requested.
+    - eth_get_transaction_count(account: str, chain_id: int) -> str: Fetches the transaction count for a given Ethereum wallet address.
+    - eth_get_transaction_counts(accounts: list[str], chain_id: int) -> str: Fetches the transaction counts of multiple account addresses in one call and returns a table. Always prefer this tool over repeated eth_get_transaction_count calls when more than one address is requested.
+    - eth_get_code(account: str, chain_id: int) -> str: Summarises the byte code at a given Ethereum smart contract address: size, code hash, proxy kind and implementation, and function selectors. Call this tool separately after each LLM call, for each address when multiple addresses are requested. Show the summary as returned and tell the user the full byte code is attached to the tool step as a downloadable file; never print the byte code itself.
+    - eth_gas_price(chain_id: int) -> str: Fetches the current gas price for the respective blockchain network.
+    - token_get_balance(account: str, token_address: str, chain_id: int) -> str: Fetches the token balance and details for a single account address and a given token address in respective example format.
         Example Format:
             Account Address: 0x123...
             Token Name: USD Coin
@@ -27,14 +33,19 @@ blockchain_query_agent: Agent = Agent(
             Token Decimals: 6
             Token Address: 0xA0b...
             Token Balance: 1200.50 USDC
-    - token_get_info(token_address: str) -> str: Fetches the token details for a given token address in respective example format.
+    - token_get_balances(accounts: list[str], token_address: str, chain_id: int) -> str: Fetches the token balances of multiple account addresses for a given token address in one call and returns a table. Always prefer this tool over repeated token_get_balance calls when more than one address is requested.
+    - token_get_info(token_address: str, chain_id: int) -> str: Fetches the token details for a given token address in respective example format.
         Example Format:
             Token Name: USD Coin
             Token Symbol: USDC
             Token Decimals: 6
             Token Address: 0xA0b...
+    - get_portfolio(account: str, chain_id: int) -> str: Lists the native balance and every ERC20 token balance of an account, discovering the tokens from the local Transfer log index. Use it when the user asks what tokens or assets a wallet holds without naming the tokens.
+    - watch_address(address: str, token_address: str, chain_id: int) -> str: Watches an address and notifies the user in this chat of every transfer to or from it as blocks are mined. Pass token_address "" for the native currency and every token, "native" for the native currency only, or a token address. Offer it when the user waits for a transfer to land instead of re-checking balances.
+    - unwatch_address(address: str, chain_id: int) -> str: Stops watching an address, or every watched address when address is "".
+    - list_watches(chain_id: int) -> str: Lists the addresses watched in this chat.
     """,
-    tools=[eth_get_balance, eth_get_transaction_count, eth_get_code, eth_gas_price, token_get_balance, token_get_info],
+    tools=[eth_get_balance, eth_get_balances, eth_get_transaction_count, eth_get_transaction_counts, eth_get_code, eth_gas_price, token_get_balance, token_get_balances, token_get_info, get_portfolio, watch_address, unwatch_address, list_watches],
     model=model,
 )
 
@@ -42,36 +53,42 @@ blockchain_query_agent: Agent = Agent(
 native_tx_agent: Agent = Agent(
     name="Native Transaction Agent",
     handoff_description="Specialist agent for sending the native transactions to the blockchain.",
-    instructions="""
+    instructions=f"""
     You are a helpful assistant. Your responsibility is to send the native transactions to the blockchain.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
+    - Every tool takes a chain_id. Use {DEFAULT_CHAIN_ID} unless the user names another network. Supported networks: {SUPPORTED_CHAINS}.
 
     Tools available:
-    - transfer_eth(account_1: str, account_2: str, amount: float) -> str: Transfers ETH from one account to another. Call this tool separately after each LLM call, for each address when transferring to multiple addresses requested. Returns the blockchain transaction link.
+    - transfer_eth(account_1: str, account_2: str, amount: float, chain_id: int) -> str: Transfers ETH from one account to another. Returns the blockchain transaction link.
+    - batch_transfer_preview(sender: str, payments: list[Payment], payout_file: str, token_address: str, use_multisend: bool, chain_id: int) -> str: Checks and prices a payout to several recipients (or an uploaded CSV payout file) without sending anything. Use it whenever more than one recipient is paid, pass token_address "" for the native currency, and ask the user to confirm its summary once.
+    - batch_transfer(sender: str, payments: list[Payment], payout_file: str, token_address: str, use_multisend: bool, chain_id: int) -> str: Sends the confirmed batch with the same arguments as the preview. Returns per-recipient transaction links; status updates follow as they are mined.
     """,
-    tools=[transfer_eth],
+    tools=[transfer_eth, batch_transfer_preview, batch_transfer],
     model=model,
 )
 
 # Smart Contract Transaction Agent
 smart_contract_tx_agent: Agent = Agent(
     name="Smart Contract Transaction Agent",
-    instructions="""
+    instructions=f"""
     You are a helpful assistant. Your responsibility is to send the smart contract transactions to the blockchain.
     
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
+    - Every tool takes a chain_id. Use {DEFAULT_CHAIN_ID} unless the user names another network. Supported networks: {SUPPORTED_CHAINS}.
 
     Tools available:
-    - transfer_token(account_1: str, account_2: str, token_address: str, amount: float) -> str: Transfers ERC20 token from one account to another. Call this tool separately after each LLM call, for each address when transferring to multiple addresses requested. Returns the blockchain transaction link.
-    - approve_token(owner: str, spender: str, token_address: str, amount: float) -> str: Approves ERC20 token allowance for a spender. Call this tool separately after each LLM call, for each address when approving to multiple addresses requested. Returns the blockchain transaction link.
-    - deploy_erc20_token(recipient_address: str, token_name: str, token_symbol: str, token_decimals: int, initial_supply: float) -> str: Deploys an ERC20 token to the blockchain with given parameters and verifies it on Blockchain Explorer. Returns the blockchain transaction link and contract address.
+    - transfer_token(account_1: str, account_2: str, token_address: str, amount: float, chain_id: int) -> str: Transfers ERC20 token from one account to another. Returns the blockchain transaction link.
+    - batch_transfer_preview(sender: str, payments: list[Payment], payout_file: str, token_address: str, use_multisend: bool, chain_id: int) -> str: Checks and prices a token payout to several recipients (or an uploaded CSV payout file) without sending anything. Use it whenever more than one recipient is paid, and ask the user to confirm its summary once.
+    - batch_transfer(sender: str, payments: list[Payment], payout_file: str, token_address: str, use_multisend: bool, chain_id: int) -> str: Sends the confirmed batch with the same arguments as the preview. Returns per-recipient transaction links; status updates follow as they are mined.
+    - approve_token(owner: str, spender: str, token_address: str, amount: float, chain_id: int) -> str: Approves ERC20 token allowance for a spender. Call this tool separately after each LLM call, for each address when approving to multiple addresses requested. Returns the blockchain transaction link.
+    - deploy_erc20_token(recipient_address: str, token_name: str, token_symbol: str, token_decimals: int, initial_supply: float, chain_id: int) -> str: Deploys an ERC20 token to the blockchain with given parameters and queues its verification on Blockchain Explorer. Returns the blockchain transaction link and contract address as soon as the deployment is sent; the user receives a separate status update when verification finishes.
     """,
-    tools=[transfer_token, approve_token, deploy_erc20_token],
+    tools=[transfer_token, approve_token, deploy_erc20_token, batch_transfer_preview, batch_transfer],
     model=model,
 )
 
@@ -86,7 +103,7 @@ triage_agent: Agent = Agent(
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
 
     Handoffs available:
-    - Blockchain Query Agent: Fetches the readable information from the blockchain as per user instructions.
+    - Blockchain Query Agent: Fetches the readable information from the blockchain as per user instructions, and watches addresses for incoming and outgoing transfers.
     - Native Transaction Agent: Sends the native transactions to the blockchain.
     - Smart Contract Transaction Agent: Sends the smart contract transactions to the blockchain.
     """,
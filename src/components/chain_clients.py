@@ -0,0 +1,147 @@
+"""
+Per-chain clients, created lazily on first use and kept for the life of the process.
+
+Each client owns an AsyncWeb3 provider that fails over and hedges across the
+chain's RPC endpoints over its own pooled keep-alive session, plus the per-chain services built on it: block watcher, gas oracle, nonce
+manager, read cache, receipt tracker, transfer watcher, verification queue and, for chains in
+INDEXER_CHAIN_IDS, the Transfer log indexer.
+"""
+
+import asyncio
+import logging
+import aiohttp
+from web3 import AsyncWeb3
+from ..config.chains import ChainConfig, get_chain_config
+from ..config.settings import (
+    DEFAULT_CHAIN_ID, RPC_TIMEOUT, RPC_HEDGE_PERCENTILE, RPC_MIN_HEDGE_DELAY, RPC_CIRCUIT_FAILURE_THRESHOLD, RPC_CIRCUIT_COOLDOWN, HTTP_POOL_SIZE, HTTP_KEEPALIVE_TIMEOUT,
+    BLOCK_POLL_INTERVAL, GAS_STRATEGY, GAS_FEE_PERCENTILE, GAS_ORACLE_REFRESH_INTERVAL,
+    VERIFICATION_WORKERS, VERIFICATION_MAX_ATTEMPTS, READ_CACHE_MAX_ENTRIES, READ_CACHE_MAX_IMMUTABLE_ENTRIES,
+    INDEXER_CHAIN_IDS, INDEXER_PATH, INDEXER_START_BLOCK, INDEXER_CHUNK_SIZE, INDEXER_MAX_CHUNK_SIZE, INDEXER_CONCURRENCY, INDEXER_CONFIRMATIONS,
+)
+from ..utils.block_watcher import BlockWatcher
+from ..utils.holdings_index import HoldingsIndex
+from ..utils.gas_oracle import GasOracle, FeeHistoryGasStrategy, LegacyGasStrategy
+from ..utils.nonce_manager import NonceManager
+from ..utils.read_cache import ReadCache
+from ..utils.rpc_provider import FailoverHTTPProvider
+from .receipt_tracker import ReceiptTracker
+from .transfer_indexer import TransferIndexer
+from .transfer_watcher import TransferWatcher
+from .verification_queue import VerificationQueue
+from ..utils.logging import UNSAMPLED
+from ..utils.metrics import http_trace_config
+
+logger = logging.getLogger(__name__)
+
+# Shared by the Transfer indexers of every chain in INDEXER_CHAIN_IDS
+holdings_index = HoldingsIndex(INDEXER_PATH)
+
+
+class ChainClient:
+    def __init__(self, chain: ChainConfig, provider=None):
+        """Builds the client over the chain's RPC endpoints, or over provider if given (e.g. a local test EVM)."""
+        self.chain = chain
+        self.chain_id = chain.chain_id
+        self._owns_provider = provider is None
+        self.w3 = AsyncWeb3(provider or FailoverHTTPProvider(
+            chain.rpc_urls,
+            request_kwargs={"timeout": aiohttp.ClientTimeout(total=RPC_TIMEOUT)},
+            hedge_percentile=RPC_HEDGE_PERCENTILE,
+            min_hedge_delay=RPC_MIN_HEDGE_DELAY,
+            failure_threshold=RPC_CIRCUIT_FAILURE_THRESHOLD,
+            cooldown=RPC_CIRCUIT_COOLDOWN,
+        ))
+        self.block_watcher = BlockWatcher(self.w3, BLOCK_POLL_INTERVAL)
+        self.nonce_manager = NonceManager(self.w3)
+        self.gas_oracle = GasOracle(
+            self.w3,
+            FeeHistoryGasStrategy(GAS_FEE_PERCENTILE) if GAS_STRATEGY == "eip1559" else LegacyGasStrategy(),
+            self.block_watcher,
+            refresh_interval=GAS_ORACLE_REFRESH_INTERVAL,
+        )
+        self.read_cache = ReadCache(self.block_watcher, READ_CACHE_MAX_ENTRIES, READ_CACHE_MAX_IMMUTABLE_ENTRIES, chainid=chain.chain_id)
+        self.receipt_tracker = ReceiptTracker(self.w3, self.block_watcher)
+        self.transfer_watcher = TransferWatcher(self.w3, chain, self.block_watcher, self.read_cache)
+        self.transfer_indexer = TransferIndexer(
+            self.w3,
+            chain.chain_id,
+            self.block_watcher,
+            holdings_index,
+            start_block=INDEXER_START_BLOCK,
+            chunk_size=INDEXER_CHUNK_SIZE,
+            max_chunk_size=INDEXER_MAX_CHUNK_SIZE,
+            concurrency=INDEXER_CONCURRENCY,
+            confirmations=INDEXER_CONFIRMATIONS,
+        ) if chain.chain_id in INDEXER_CHAIN_IDS else None
+        self.verification_queue = VerificationQueue(
+            self.receipt_tracker,
+            chain.explorer_api_url,
+            chain.explorer_api_key,
+            chain.chain_id,
+            workers=VERIFICATION_WORKERS,
+            max_attempts=VERIFICATION_MAX_ATTEMPTS,
+        )
+        self._session: aiohttp.ClientSession | None = None
+
+    async def open(self) -> None:
+        """Hands the provider its own connection pool, checks connectivity and starts the gas oracle."""
+        if self._owns_provider:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT),
+                timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT),
+                trace_configs=[http_trace_config("rpc")],
+            )
+            await self.w3.provider.cache_async_session(self._session)
+        connected = await self.w3.is_connected()
+        if connected:
+            logger.info("%s (%s) connection successful", self.chain.name, self.chain_id, extra=UNSAMPLED)
+        else:
+            logger.error("%s (%s) connection failed", self.chain.name, self.chain_id)
+        self.gas_oracle.start()
+        if self.transfer_indexer is not None:
+            self.transfer_indexer.start()
+
+    async def close(self) -> None:
+        if self.transfer_indexer is not None:
+            await self.transfer_indexer.stop()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_clients: dict[int, ChainClient] = {}
+_locks: dict[int, asyncio.Lock] = {}
+
+
+async def get_chain_client(chain_id: int | None = None) -> ChainClient:
+    """Returns the client for chain_id (the default chain if None), creating it on first use."""
+    chain_id = DEFAULT_CHAIN_ID if chain_id is None else int(chain_id)
+    client = _clients.get(chain_id)
+    if client is None:
+        chain = get_chain_config(chain_id)
+        # Per-chain locks so a slow endpoint does not hold up clients for other chains.
+        async with _locks.setdefault(chain.chain_id, asyncio.Lock()):
+            client = _clients.get(chain.chain_id)
+            if client is None:
+                client = ChainClient(chain)
+                await client.open()
+                _clients[chain.chain_id] = client
+    return client
+
+
+async def install_chain_client(client: ChainClient) -> None:
+    """Opens and registers a prebuilt client, e.g. one backed by a local test provider."""
+    await client.open()
+    _clients[client.chain_id] = client
+
+
+def open_chain_clients() -> list[ChainClient]:
+    """Returns the clients created so far, without opening new ones."""
+    return list(_clients.values())
+
+
+async def close_chain_clients() -> None:
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
+    holdings_index.close()
@@ -0,0 +1,68 @@
+"""
+Deterministic fast-path router for common read-only queries.
+
+Messages that fully match one of the read-only grammar rules shared with the
+guardrail pre-classifier (utils/prompt_classifier.py) are answered by
+calling the matching tool directly, skipping the triage, handoff and
+tool-selection LLM hops. Anything that does not match exactly, and every
+write operation, goes through the agent graph as usual.
+"""
+
+import logging
+import re
+import textwrap
+from .tools import TOOL_FUNCTIONS
+from ..config.chains import find_chain
+from ..utils.prompt_classifier import ADDRESS, READ_ONLY_RULES, compile_rules
+
+logger = logging.getLogger(__name__)
+
+COMPILED_RULES = compile_rules(READ_ONLY_RULES)
+
+# Single-address tools that have a batch variant for several addresses.
+BATCH_VARIANTS = {
+    "eth_get_balance": "eth_get_balances",
+    "eth_get_transaction_count": "eth_get_transaction_counts",
+    "token_get_balance": "token_get_balances",
+}
+
+
+def match_intent(text: str) -> tuple[str, dict] | None:
+    """Returns (tool name, keyword arguments) if text is a recognised read-only query, otherwise None."""
+    text = " ".join(text.split())
+    for pattern, tool_name in COMPILED_RULES:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        kwargs = {}
+        if groups.get("chain"):
+            chain = find_chain(groups["chain"])
+            if chain is None:
+                # Unknown network names are left to the agents to interpret.
+                return None
+            kwargs["chain_id"] = chain.chain_id
+        if groups.get("accounts"):
+            accounts = re.findall(ADDRESS, groups["accounts"])
+            if len(accounts) > 1:
+                tool_name = BATCH_VARIANTS[tool_name]
+                kwargs["accounts"] = accounts
+            else:
+                kwargs["account"] = accounts[0]
+        if groups.get("account"):
+            kwargs["account"] = groups["account"]
+        if groups.get("token"):
+            kwargs["token_address"] = groups["token"]
+        return tool_name, kwargs
+    return None
+
+
+async def try_fast_path(text: str) -> str | None:
+    """Answers text directly from a tool if it matches the fast-path grammar; returns None to fall back to the agents."""
+    intent = match_intent(text)
+    if intent is None:
+        return None
+    tool_name, kwargs = intent
+    logger.info("Fast path: %s(%s)", tool_name, kwargs)
+    result = await TOOL_FUNCTIONS[tool_name](**kwargs)
+    return textwrap.dedent(result).strip()
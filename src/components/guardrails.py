@@ -1,27 +1,67 @@
+import logging
 from agents import Runner, GuardrailFunctionOutput, input_guardrail
 from ..models.data_models import PromptAnalysis
-from ..config.settings import config
+from ..config.settings import config, GUARDRAIL_CACHE_TTL, GUARDRAIL_CACHE_MAX_ENTRIES, GUARDRAIL_PRECLASSIFIER
 from ..components.guardrail_agents import prompt_guardrail_agent
+from ..utils.prompt_classifier import normalize_prompt, preclassify
+from ..utils.ttl_cache import TTLCache
+from ..utils.metrics import llm_hop_metrics
+
+logger = logging.getLogger(__name__)
+
+# Short replies such as "yes" or "go ahead" depend on the conversation, so their verdicts are never cached.
+MIN_CACHED_WORDS = 3
+
+verdict_cache = TTLCache(GUARDRAIL_CACHE_MAX_ENTRIES, GUARDRAIL_CACHE_TTL)
+guardrail_stats = {"calls": 0, "preclassified": 0, "cache_hits": 0, "llm_calls": 0}
 
 @input_guardrail
 async def prompt_guardrail(ctx, agent, input):
     """Analyzes user prompts for safety, validaty and scope defined."""
     try:
-        result = await Runner.run(prompt_guardrail_agent, input=input, context=ctx.context, run_config=config)
-        final_output = result.final_output_as(PromptAnalysis)
+        guardrail_stats["calls"] += 1
+        prompt = latest_user_prompt(input)
+        cache_key = normalize_prompt(prompt)
+        cacheable = len(cache_key.split()) >= MIN_CACHED_WORDS
 
-        if final_output.is_safe:
-            print(f"🟢 Your prompt is safe. \n is_safe={final_output.is_safe} \n Reasoning: {final_output.reasoning}")
+        operation = preclassify(prompt) if GUARDRAIL_PRECLASSIFIER else None
+        final_output = verdict_cache.get(cache_key) if cacheable and operation is None else None
+
+        if operation is not None:
+            guardrail_stats["preclassified"] += 1
+            final_output = PromptAnalysis(is_safe=True, reasoning=f"Pre-classified as in-scope operation: {operation}")
+        elif final_output is not None:
+            guardrail_stats["cache_hits"] += 1
         else:
-            print(f"🔴 Your prompt is not safe. \n is_safe={final_output.is_safe} \n Reasoning: {final_output.reasoning}")  
+            guardrail_stats["llm_calls"] += 1
+            result = await Runner.run(prompt_guardrail_agent, input=input, context=ctx.context, run_config=config, hooks=llm_hop_metrics)
+            final_output = result.final_output_as(PromptAnalysis)
+            if cacheable:
+                verdict_cache.set(cache_key, final_output)
+
+        skipped = 1 - guardrail_stats["llm_calls"] / guardrail_stats["calls"]
+        logger.debug("Guardrail stats: %s, skipped LLM share: %.0f%%", guardrail_stats, skipped * 100)
+        logger.info("Guardrail verdict is_safe=%s: %s", final_output.is_safe, final_output.reasoning)
 
         return GuardrailFunctionOutput(
             output_info=final_output,
             tripwire_triggered=not final_output.is_safe,
         )
     except Exception as e:
-        print(f"🔴 Exception in guardrail: {str(e)}")
+        logger.error("Exception in guardrail: %s", e)
         return GuardrailFunctionOutput(
             output_info=PromptAnalysis(is_safe=False, reasoning=f"Error analyzing prompt: {str(e)}"),
             tripwire_triggered=True,
         )
+
+def latest_user_prompt(input) -> str:
+    """Returns the text of the most recent user message from a guardrail input string or item list."""
+    if isinstance(input, str):
+        return input
+    for item in reversed(input):
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content", "")
+            if isinstance(content, str):
+                return content
+            return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
@@ -0,0 +1,51 @@
+"""
+Background folding of evicted chat turns into each session's rolling summary.
+
+After a turn pushes older turns out of a ChatHistory's recent window, schedule()
+starts one task per session that sends the current summary and the pending turns
+to the summary agent and stores the extended summary. Turns evicted while a call
+is running are picked up by the next call, so the reply to the user never waits
+on the summary and the summary is never rebuilt from the whole conversation.
+"""
+
+import asyncio
+import logging
+from agents import Runner
+from ..config.settings import config
+from ..utils.metrics import llm_hop_metrics
+from .summary_agents import conversation_summary_agent
+
+logger = logging.getLogger(__name__)
+
+
+class HistorySummarizer:
+    def __init__(self, session_store):
+        self.session_store = session_store
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def schedule(self, session_id: str) -> None:
+        """Starts folding the session's pending turns into its summary, unless that is already running."""
+        if session_id not in self._tasks:
+            task = asyncio.create_task(self._summarize(session_id))
+            self._tasks[session_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(session_id, None))
+
+    async def stop(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _summarize(self, session_id: str) -> None:
+        try:
+            while True:
+                history = await self.session_store.load(session_id)
+                if not history.pending:
+                    return
+                covered = history.folded + len(history.pending)
+                result = await Runner.run(conversation_summary_agent, input=history.summary_request(), run_config=config, hooks=llm_hop_metrics)
+                if not await self.session_store.update_summary(session_id, str(result.final_output), covered):
+                    return
+                logger.debug("Folded %d turns into the summary of session %s", len(history.pending), session_id)
+        except Exception as e:
+            # The pending turns stay queued and are sent shortened, so the next eviction retries.
+            logger.warning("Error summarizing session %s: %s", session_id, e)
@@ -0,0 +1,296 @@
+"""
+Batch payouts: pays many recipients from one wallet in a single tool call.
+
+plan_payout() checks and prices a batch without sending anything, which gives the one
+summary the user confirms. execute_payout() then sends it, either as one transaction per
+recipient or, on chains with a Disperse contract configured, as a single multisend transaction:
+
+- Nonces for every transaction are reserved locally up front, so no send waits on the node.
+- Transactions are signed on a thread pool and each is sent as soon as its signature is
+  ready, with at most BATCH_SEND_CONCURRENCY sends in flight.
+- Receipts are followed by the chain's receipt tracker, and the session gets one status
+  update per block listing the recipients whose transfers resolved.
+"""
+
+import asyncio
+import csv
+import functools
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from web3 import Web3
+from ..config.settings import PRI_KEY, BATCH_MAX_RECIPIENTS, BATCH_SIGNING_WORKERS, BATCH_SEND_CONCURRENCY
+from ..utils.abis import ERC20_ABI, DISPERSE_ABI
+from ..utils.formatting import format_table
+from ..utils.multicall import batch_rpc
+from ..utils.nonce_manager import is_already_known, is_nonce_error, may_have_been_broadcast
+from ..utils.notifications import notify_session
+from .chain_clients import ChainClient
+from .receipt_tracker import TransactionDropped
+
+logger = logging.getLogger(__name__)
+
+# Gas estimates are padded by this factor, since state can move between planning and sending.
+GAS_MARGIN = 1.2
+# Tables list at most this many recipients; the rest are summarised as a count.
+MAX_TABLE_ROWS = 20
+
+_signing_pool = ThreadPoolExecutor(max_workers=BATCH_SIGNING_WORKERS, thread_name_prefix="payout-signer")
+_reporters: set[asyncio.Task] = set()
+
+
+@dataclass
+class Asset:
+    symbol: str
+    decimals: int
+    token_address: str | None = None  # None for the chain's native currency
+    token_balance: int = 0  # sender's token balance in base units
+
+
+@dataclass
+class PayoutTx:
+    to: str
+    value: int
+    data: str
+    recipients: list[int]  # indexes into PayoutPlan.recipients paid by this transaction
+    gas: int = 0
+
+
+@dataclass
+class PayoutPlan:
+    client: ChainClient
+    sender: str
+    asset: Asset
+    multisend: bool
+    recipients: list[str] = field(default_factory=list)
+    amounts: list[Decimal] = field(default_factory=list)
+    units: list[int] = field(default_factory=list)
+    txs: list[PayoutTx] = field(default_factory=list)
+    fee_fields: dict = field(default_factory=dict)
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def max_fee(self) -> int:
+        """Upper bound on the network fee in wei: every transaction using its full gas limit at the max fee."""
+        price = self.fee_fields.get("maxFeePerGas", self.fee_fields.get("gasPrice", 0))
+        return sum(tx.gas for tx in self.txs) * price
+
+    def summary(self) -> str:
+        chain = self.client.chain
+        total = sum(self.amounts, Decimal(0))
+        mode = "one multisend transaction" if self.multisend else f"{len(self.recipients)} transactions"
+        lines = [
+            f"Batch payout of {total.normalize():f} {self.asset.symbol} to {len(self.recipients)} recipients from {self.sender} on {chain.name}",
+            f"Sent as {mode}, max network fee {Web3.from_wei(self.max_fee, 'ether'):.6f} {chain.native_symbol}",
+            "",
+            _table(["Recipient", f"Amount ({self.asset.symbol})"], [[r, f"{a.normalize():f}"] for r, a in zip(self.recipients, self.amounts)]),
+        ]
+        if self.problems:
+            lines += ["", "Problems, nothing will be sent until they are fixed:", *(f"- {problem}" for problem in self.problems)]
+        return "\n".join(lines)
+
+
+def parse_payout_csv(text: str) -> list[tuple[str, str]]:
+    """Parses "recipient,amount" rows, skipping blank lines and a header row."""
+    payments = []
+    for line_number, row in enumerate(csv.reader(io.StringIO(text)), 1):
+        cells = [cell.strip() for cell in row if cell.strip()]
+        if not cells or (line_number == 1 and not cells[0].lower().startswith("0x")):
+            continue
+        if len(cells) < 2:
+            raise ValueError(f"Line {line_number}: expected recipient,amount")
+        payments.append((cells[0], cells[1]))
+    return payments
+
+
+async def plan_payout(client: ChainClient, sender: str, payments: list[tuple[str, float | str]], asset: Asset, multisend: bool = False) -> PayoutPlan:
+    """Validates, prices and funds-checks a batch. Anything that would stop it from going through is listed in plan.problems."""
+    if not payments:
+        raise ValueError("No payments given")
+    if len(payments) > BATCH_MAX_RECIPIENTS:
+        raise ValueError(f"A batch can pay at most {BATCH_MAX_RECIPIENTS} recipients, got {len(payments)}")
+
+    plan = PayoutPlan(client, sender, asset, multisend)
+    for row, (recipient, amount) in enumerate(payments, 1):
+        try:
+            address = Web3.to_checksum_address(recipient)
+        except Exception:
+            plan.problems.append(f"Row {row}: invalid address {recipient}")
+            continue
+        try:
+            value = Decimal(str(amount))
+        except InvalidOperation:
+            plan.problems.append(f"Row {row}: invalid amount {amount}")
+            continue
+        units = int(value.scaleb(asset.decimals))
+        if units <= 0:
+            plan.problems.append(f"Row {row}: amount must be positive, got {amount}")
+            continue
+        plan.recipients.append(address)
+        plan.amounts.append(value)
+        plan.units.append(units)
+    if plan.problems:
+        return plan
+
+    if multisend and client.chain.multisend_address is None:
+        plan.problems.append(f"No multisend contract is configured for {client.chain.name}; set MULTISEND_ADDRESS_{client.chain_id} or send without multisend")
+        return plan
+    plan.txs = _multisend_txs(plan) if multisend else _direct_txs(plan)
+    plan.fee_fields = await client.gas_oracle.fee_fields()
+    if await _check_allowance(plan):
+        await _estimate_gas(plan)
+    await _check_funds(plan)
+    return plan
+
+
+def _direct_txs(plan: PayoutPlan) -> list[PayoutTx]:
+    if plan.asset.token_address is None:
+        return [PayoutTx(recipient, units, "0x", [index]) for index, (recipient, units) in enumerate(zip(plan.recipients, plan.units))]
+    token = plan.client.w3.eth.contract(address=plan.asset.token_address, abi=ERC20_ABI)
+    return [
+        PayoutTx(plan.asset.token_address, 0, token.encode_abi("transfer", args=[recipient, units]), [index])
+        for index, (recipient, units) in enumerate(zip(plan.recipients, plan.units))
+    ]
+
+
+def _multisend_txs(plan: PayoutPlan) -> list[PayoutTx]:
+    disperse = plan.client.w3.eth.contract(address=plan.client.chain.multisend_address, abi=DISPERSE_ABI)
+    everyone = list(range(len(plan.recipients)))
+    if plan.asset.token_address is None:
+        return [PayoutTx(disperse.address, sum(plan.units), disperse.encode_abi("disperseEther", args=[plan.recipients, plan.units]), everyone)]
+    data = disperse.encode_abi("disperseToken", args=[plan.asset.token_address, plan.recipients, plan.units])
+    return [PayoutTx(disperse.address, 0, data, everyone)]
+
+
+async def _check_allowance(plan: PayoutPlan) -> bool:
+    """A multisend token payout pulls the total through transferFrom, so the contract needs an allowance for it."""
+    if not plan.multisend or plan.asset.token_address is None:
+        return True
+    token = plan.client.w3.eth.contract(address=plan.asset.token_address, abi=ERC20_ABI)
+    allowance = await token.functions.allowance(plan.sender, plan.client.chain.multisend_address).call()
+    if allowance < sum(plan.units):
+        plan.problems.append(f"The multisend contract {plan.client.chain.multisend_address} may only spend {allowance} base units of {plan.asset.symbol}; approve it for the batch total first")
+        return False
+    return True
+
+
+async def _estimate_gas(plan: PayoutPlan) -> None:
+    """Estimates every transaction in one JSON-RPC batch; a failed estimate means the transfer would revert."""
+    w3 = plan.client.w3
+    params = [{"from": plan.sender, "to": tx.to, "value": tx.value, "data": tx.data} for tx in plan.txs]
+    try:
+        estimates = await batch_rpc(w3, w3.eth.estimate_gas, params)
+    except Exception:
+        # One reverting transfer fails the whole batch, so estimate them one by one to find which.
+        estimates = await asyncio.gather(*(w3.eth.estimate_gas(param) for param in params), return_exceptions=True)
+    for tx, estimate in zip(plan.txs, estimates):
+        if isinstance(estimate, Exception):
+            who = "the multisend transaction" if plan.multisend else f"the transfer to {plan.recipients[tx.recipients[0]]}"
+            plan.problems.append(f"Gas estimation for {who} failed, so it would revert: {str(estimate)}")
+        else:
+            tx.gas = int(estimate * GAS_MARGIN)
+
+
+async def _check_funds(plan: PayoutPlan) -> None:
+    w3 = plan.client.w3
+    native_balance, _ = await plan.client.read_cache.fetch("eth_getBalance", (plan.sender,), lambda: w3.eth.get_balance(plan.sender))
+    native_needed = plan.max_fee + sum(tx.value for tx in plan.txs)
+    if native_balance < native_needed:
+        symbol = plan.client.chain.native_symbol
+        plan.problems.append(f"{plan.sender} holds {Web3.from_wei(native_balance, 'ether')} {symbol} but needs up to {Web3.from_wei(native_needed, 'ether')} {symbol} including fees")
+    if plan.asset.token_address is not None and plan.asset.token_balance < sum(plan.units):
+        held = Decimal(plan.asset.token_balance).scaleb(-plan.asset.decimals)
+        plan.problems.append(f"{plan.sender} holds {held.normalize():f} {plan.asset.symbol} but the batch pays {sum(plan.amounts, Decimal(0)).normalize():f}")
+
+
+async def execute_payout(plan: PayoutPlan, session_id: str | None = None) -> str:
+    """Signs and sends a problem-free plan, starts the receipt reporter and returns the send results."""
+    client = plan.client
+    nonces = [await client.nonce_manager.reserve(plan.sender, client.chain_id) for _ in plan.txs]
+    loop = asyncio.get_running_loop()
+    sends = asyncio.Semaphore(BATCH_SEND_CONCURRENCY)
+
+    async def sign_and_send(tx: PayoutTx, nonce: int) -> str:
+        params = {"nonce": nonce, "to": tx.to, "value": tx.value, "data": tx.data, "gas": tx.gas, **plan.fee_fields, "chainId": client.chain_id}
+        signed = await loop.run_in_executor(_signing_pool, functools.partial(client.w3.eth.account.sign_transaction, params, PRI_KEY))
+        async with sends:
+            try:
+                return Web3.to_hex(await client.w3.eth.send_raw_transaction(signed.raw_transaction))
+            except Exception as e:
+                if is_already_known(e):
+                    return Web3.to_hex(signed.hash)
+                raise
+
+    results = await asyncio.gather(*(sign_and_send(tx, nonce) for tx, nonce in zip(plan.txs, nonces)), return_exceptions=True)
+    await _settle_nonces(plan, nonces, results)
+
+    sent = [(tx, result) for tx, result in zip(plan.txs, results) if isinstance(result, str)]
+    if sent:
+        task = asyncio.create_task(_report_receipts(plan, sent, session_id))
+        _reporters.add(task)
+        task.add_done_callback(_reporters.discard)
+
+    rows = []
+    for tx, result in zip(plan.txs, results):
+        status = f"sent: {client.chain.tx_link(result)}" if isinstance(result, str) else f"failed: {result}"
+        rows += [[plan.recipients[index], status] for index in tx.recipients]
+    failed = sum(1 for result in results if not isinstance(result, str))
+    header = f"Sent {len(sent)} of {len(plan.txs)} payout transactions on {client.chain.name}" + (f", {failed} failed" if failed else "")
+    return f"{header}. Status updates will follow as they are mined.\n\n" + _table(["Recipient", "Status"], rows)
+
+
+async def _settle_nonces(plan: PayoutPlan, nonces: list[int], results: list) -> None:
+    """
+    Releases the nonces of sends the node rejected. A failed nonce below one that was sent would hold
+    the later transactions in the node's queue, so it is filled with a zero-value self-transfer instead.
+    Sends that failed in transit may have been broadcast, so their nonces are left alone and the sender resynced.
+    """
+    client = plan.client
+    sent = [nonce for nonce, result in zip(nonces, results) if isinstance(result, str)]
+    failed = [(nonce, result) for nonce, result in zip(nonces, results) if not isinstance(result, str)]
+    highest_sent = max(sent, default=-1)
+    for nonce, error in sorted(failed, key=lambda item: item[0], reverse=True):
+        logger.warning("Payout transaction with nonce %d failed: %s", nonce, error)
+        if is_nonce_error(error) or may_have_been_broadcast(error):
+            continue
+        if nonce > highest_sent:
+            client.nonce_manager.release(plan.sender, nonce, client.chain_id)
+            continue
+        filler = {"nonce": nonce, "to": plan.sender, "value": 0, "gas": 21000, **plan.fee_fields, "chainId": client.chain_id}
+        try:
+            signed = client.w3.eth.account.sign_transaction(filler, PRI_KEY)
+            await client.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            logger.warning("Could not fill nonce gap %d for %s: %s", nonce, plan.sender, e)
+    if any(is_nonce_error(error) or may_have_been_broadcast(error) for _, error in failed):
+        await client.nonce_manager.resync(plan.sender, client.chain_id)
+
+
+async def _report_receipts(plan: PayoutPlan, sent: list[tuple[PayoutTx, str]], session_id: str | None) -> None:
+    """Sends the session one update per block with the recipients whose payout transactions resolved."""
+    client = plan.client
+    pending = {client.receipt_tracker.track(tx_hash): (tx, tx_hash) for tx, tx_hash in sent}
+    total = sum(len(tx.recipients) for tx, _ in sent)
+    resolved = 0
+    while pending:
+        await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        # The tracker resolves a whole block's receipts at once, so collect everything that is done by now.
+        rows = []
+        for future in [future for future in pending if future.done()]:
+            tx, tx_hash = pending.pop(future)
+            try:
+                status = "✅ paid" if future.result()["status"] == 1 else "🔴 reverted"
+            except TransactionDropped:
+                status = "🔴 dropped"
+            rows += [[plan.recipients[index], f"{plan.amounts[index].normalize():f} {plan.asset.symbol}", f"{status}: {client.chain.tx_link(tx_hash)}"] for index in tx.recipients]
+        resolved += len(rows)
+        await notify_session(session_id, f"Batch payout update: {resolved}/{total} recipients resolved\n\n" + _table(["Recipient", "Amount", "Status"], rows))
+
+
+def _table(headers: list[str], rows: list[list[str]]) -> str:
+    table = format_table(headers, rows[:MAX_TABLE_ROWS])
+    if len(rows) > MAX_TABLE_ROWS:
+        table += f"\n\n...and {len(rows) - MAX_TABLE_ROWS} more"
+    return table
@@ -0,0 +1,103 @@
+"""
+Shared tracker for pending transactions across all sessions.
+
+On every new block the receipts of all tracked transactions are fetched in a
+single JSON-RPC batch. Each transaction resolves as mined, reverted or dropped,
+and the Chainlit session that sent it is notified.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from web3 import AsyncWeb3
+from ..utils.block_watcher import BlockWatcher
+from ..utils.multicall import batch_raw_rpc
+from ..utils.notifications import notify_session
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionDropped(Exception):
+    pass
+
+
+@dataclass
+class TrackedTransaction:
+    tx_hash: str
+    description: str
+    explorer_link: str
+    session_ids: set[str | None] = field(default_factory=set)
+    first_seen_block: int | None = None
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class ReceiptTracker:
+    def __init__(self, w3: AsyncWeb3, block_watcher: BlockWatcher, drop_after_blocks: int = 50):
+        self.w3 = w3
+        self.block_watcher = block_watcher
+        self.drop_after_blocks = drop_after_blocks
+        self._pending: dict[str, TrackedTransaction] = {}
+        block_watcher.subscribe(self._on_block)
+
+    def track(self, tx_hash: str, session_id: str | None = None, description: str = "Transaction", explorer_link: str = "") -> asyncio.Future:
+        """
+        Starts tracking tx_hash and returns a future resolved with its receipt once mined.
+        The future raises TransactionDropped if the transaction disappears from the network.
+        Pass session_id to have that Chainlit session notified of the outcome.
+        """
+        tx_hash = tx_hash.lower()
+        tracked = self._pending.get(tx_hash)
+        if tracked is None:
+            tracked = TrackedTransaction(tx_hash, description, explorer_link)
+            self._pending[tx_hash] = tracked
+        if session_id is not None:
+            tracked.session_ids.add(session_id)
+        self.block_watcher.start()
+        return tracked.future
+
+    async def wait(self, tx_hash: str, timeout: float | None = None) -> dict:
+        """Waits for the receipt of tx_hash without notifying any session."""
+        return await asyncio.wait_for(asyncio.shield(self.track(tx_hash)), timeout)
+
+    async def _on_block(self, block_number: int) -> None:
+        if not self._pending:
+            return
+        tracked_list = list(self._pending.values())
+        for tracked in tracked_list:
+            if tracked.first_seen_block is None:
+                tracked.first_seen_block = block_number
+
+        # Old transactions without a receipt are also looked up by hash to detect drops, in the same batch.
+        stale = [t for t in tracked_list if block_number - t.first_seen_block >= self.drop_after_blocks]
+        results = await batch_raw_rpc(
+            self.w3,
+            [("eth_getTransactionReceipt", [t.tx_hash]) for t in tracked_list]
+            + [("eth_getTransactionByHash", [t.tx_hash]) for t in stale],
+        )
+        receipts = results[:len(tracked_list)]
+        lookups = dict(zip((t.tx_hash for t in stale), results[len(tracked_list):]))
+
+        for tracked, receipt in zip(tracked_list, receipts):
+            if receipt is not None:
+                receipt = {**receipt, "status": int(receipt["status"], 16), "blockNumber": int(receipt["blockNumber"], 16)}
+                if receipt["status"] == 1:
+                    message = f"✅ {tracked.description} mined in block {receipt['blockNumber']}: {tracked.explorer_link}"
+                else:
+                    message = f"🔴 {tracked.description} reverted in block {receipt['blockNumber']}: {tracked.explorer_link}"
+                await self._resolve(tracked, message, receipt=receipt)
+            elif tracked.tx_hash in lookups and lookups[tracked.tx_hash] is None:
+                message = f"🔴 {tracked.description} was dropped from the network: {tracked.explorer_link}"
+                await self._resolve(tracked, message, error=TransactionDropped(tracked.tx_hash))
+
+    async def _resolve(self, tracked: TrackedTransaction, message: str, receipt: dict | None = None, error: Exception | None = None) -> None:
+        del self._pending[tracked.tx_hash]
+        if not tracked.future.done():
+            if error is not None:
+                tracked.future.set_exception(error)
+                # Mark the exception retrieved for callers that only wanted the notification.
+                tracked.future.exception()
+            else:
+                tracked.future.set_result(receipt)
+        logger.info("Transaction %s resolved: %s", tracked.tx_hash, message)
+        for session_id in tracked.session_ids:
+            await notify_session(session_id, message)
@@ -0,0 +1,114 @@
+"""
+Background warmup so the app serves requests as soon as it is imported.
+
+Nothing connects or compiles at import time: chain clients, the solc install and the
+ERC20 artifact are all created lazily on first use. The warmup only makes sure that
+first use finds them ready. start() launches these phases and returns at once:
+
+- connect: opens the client for the default chain and for every chain in WARMUP_CHAIN_IDS
+- erc20_artifact: installs solc and compiles the ERC20 template used by deploy_erc20_token
+- token_preload: once connected, caches the ABI and metadata of every token in WARMUP_TOKENS
+
+`ready` is set once the default chain client is open; status() reports each phase's state and timing.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable
+from web3 import Web3
+from ..config.chains import CHAINS
+from ..config.settings import ARTIFACT_CACHE_DIR, DEFAULT_CHAIN_ID, WARMUP_CHAIN_IDS, WARMUP_TOKENS
+from ..utils.erc20_artifact import get_erc20_artifact
+from ..utils.logging import UNSAMPLED
+from .chain_clients import get_chain_client
+from .tools import cached_token_reads, preload_contract_abi
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Phase:
+    name: str
+    state: str = "pending"  # pending, running, done or failed
+    started_ms: float | None = None  # since the warmup started
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+class Warmup:
+    def __init__(self):
+        self.ready = asyncio.Event()
+        self.phases: dict[str, Phase] = {}
+        self._started_at: float | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Launches the warmup phases in the background; calling it again is a no-op."""
+        if self._started_at is not None:
+            return
+        self._started_at = time.monotonic()
+        connect = self._spawn("connect", self._connect)
+        self._spawn("erc20_artifact", lambda: asyncio.to_thread(get_erc20_artifact, ARTIFACT_CACHE_DIR))
+        if WARMUP_TOKENS:
+            self._spawn("token_preload", lambda: self._preload_tokens(connect))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def status(self) -> dict:
+        return {"ready": self.ready.is_set(), "phases": {name: asdict(phase) for name, phase in self.phases.items()}}
+
+    def _spawn(self, name: str, run: Callable[[], Awaitable]) -> asyncio.Task:
+        phase = self.phases[name] = Phase(name)
+
+        async def timed():
+            start = time.monotonic()
+            phase.state = "running"
+            phase.started_ms = round((start - self._started_at) * 1000, 1)
+            try:
+                await run()
+                phase.state = "done"
+            except Exception as e:
+                phase.state = "failed"
+                phase.error = str(e)
+                logger.warning("Warmup phase %s failed: %s", name, e)
+            finally:
+                phase.duration_ms = round((time.monotonic() - start) * 1000, 1)
+            logger.info("Warmup phase %s %s in %.0f ms", name, phase.state, phase.duration_ms, extra=UNSAMPLED)
+
+        task = asyncio.create_task(timed())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _connect(self) -> None:
+        await get_chain_client()
+        self.ready.set()
+        others = [chain_id for chain_id in WARMUP_CHAIN_IDS if chain_id in CHAINS and chain_id != DEFAULT_CHAIN_ID]
+        await asyncio.gather(*(get_chain_client(chain_id) for chain_id in others))
+
+    async def _preload_tokens(self, connect: asyncio.Task) -> None:
+        await connect
+        await asyncio.gather(*(self._preload_token(chain_id, address) for chain_id, address in parse_tokens(WARMUP_TOKENS)))
+
+    async def _preload_token(self, chain_id: int, address: str) -> None:
+        client = await get_chain_client(chain_id)
+        address = Web3.to_checksum_address(address)
+        abi = await preload_contract_abi(address, chain_id)
+        await cached_token_reads(client, client.w3.eth.contract(address=address, abi=abi), [])
+
+
+def parse_tokens(value: str) -> list[tuple[int, str]]:
+    """Parses "0xToken,56:0xOtherToken" into (chain_id, address) pairs; entries without a chain ID use the default chain."""
+    tokens = []
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        chain_id, _, address = entry.rpartition(":")
+        tokens.append((int(chain_id) if chain_id else DEFAULT_CHAIN_ID, address))
+    return tokens
+
+
+warmup = Warmup()
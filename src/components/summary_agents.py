@@ -0,0 +1,21 @@
+from agents import Agent
+from ..config.settings import model, HISTORY_SUMMARY_TOKEN_BUDGET
+
+# Conversation Summary Agent
+conversation_summary_agent = Agent(
+    name="Conversation Summary Agent",
+    instructions=f"""
+    You maintain the running summary of a conversation between a user and a Web3 assistant.
+    You are given the current summary and the new turns that have just left the assistant's context.
+    Return the updated summary: the current summary extended with what matters from the new turns.
+
+    Rules:
+    - Keep every fact the assistant may need later: accounts, token and contract addresses, chains,
+      amounts, transaction hashes and their outcome, deployed contracts, active watches, and any
+      request that is still waiting for the user's confirmation.
+    - Drop greetings, repeated questions and formatting; merge related facts instead of listing turns.
+    - Write plain sentences or short bullet points in the third person, oldest first.
+    - Stay under {HISTORY_SUMMARY_TOKEN_BUDGET * 3 // 4} words. Return only the summary text.
+    """,
+    model=model,
+)
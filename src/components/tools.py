@@ -1,19 +1,60 @@
-import requests
+import asyncio
+import json
+import logging
+import rlp
 import time
+from typing import Awaitable, Callable
 import chainlit as cl
+from chainlit.context import ChainlitContextException
 from agents.tool import function_tool
+from eth_utils import keccak
+from web3 import Web3
 from web3.types import TxParams
-from solcx import compile_source, install_solc
-from ..config.settings import w3, ETHERSCAN_API_KEY, BSCSCAN_API_KEY, PRI_KEY
+from ..config.settings import (
+    ETHERSCAN_API_KEY, ETHERSCAN_API_URL, PRI_KEY, DEFAULT_CHAIN_ID,
+    ABI_CACHE_PATH, ABI_CACHE_TTL, ABI_CACHE_MAX_MEMORY_ENTRIES, ABI_CACHE_MAX_DISK_ENTRIES, ARTIFACT_CACHE_DIR,
+    BYTECODE_STORE_DIR, WATCH_TTL, WATCH_MAX_PER_SESSION, PORTFOLIO_CALL_CHUNK_SIZE, PORTFOLIO_CALL_CONCURRENCY,
+)
+from ..utils.abi_cache import AbiCache
+from ..utils.abis import ERC20_ABI, with_erc20
+from ..utils.bytecode_store import BytecodeStore, EIP1967_BEACON_SLOT, EIP1967_IMPLEMENTATION_SLOT, selector_names
+from ..utils.formatting import format_table
+from ..utils.http import get_http_session
+from ..utils.metrics import timed_tool
+from ..models.data_models import Payment
+from ..utils.notifications import current_session_id
+from .chain_clients import ChainClient, get_chain_client, holdings_index
+from .payouts import Asset, PayoutPlan, plan_payout, execute_payout
+from .transfer_watcher import ALL, NATIVE
+from .verification_queue import VerificationJob
+from ..utils.multicall import batch_call, batch_rpc
+from ..utils.nonce_manager import is_already_known, is_nonce_error, may_have_been_broadcast
+from ..utils.erc20_artifact import (
+    get_erc20_artifact, ERC20_SOURCE, CONTRACT_NAME, CONSTRUCTOR_TYPES, OPTIMIZE_RUNS, SOLC_LONG_VERSION,
+)
+
+logger = logging.getLogger(__name__)
+
+abi_cache = AbiCache(ABI_CACHE_PATH, ABI_CACHE_TTL, ABI_CACHE_MAX_MEMORY_ENTRIES, ABI_CACHE_MAX_DISK_ENTRIES)
+bytecode_store = BytecodeStore(BYTECODE_STORE_DIR)
+_abi_fetches: dict[tuple[int, str], asyncio.Task] = {}
+
+# Chainlit-traced tool coroutines by name, for callers that bypass the agent graph (e.g. the fast-path router).
+TOOL_FUNCTIONS: dict[str, Callable[..., Awaitable[str]]] = {}
+
+def agent_tool(func):
+    """Wraps func as a timed Chainlit tool step and an agent function tool, keeping the step directly callable."""
+    step = cl.step(type="tool")(timed_tool(func))
+    TOOL_FUNCTIONS[func.__name__] = step
+    return function_tool(step)
 
 # <-------- NATIVE TRANSACTION AGENT TOOLS -------->
 
-@function_tool
-@cl.step(type="tool")
-def transfer_eth(account_1: str, account_2: str, amount: float) -> str:
+@agent_tool
+async def transfer_eth(account_1: str, account_2: str, amount: float, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Transfers ETH from one account to another.
-    For transfer to multiple accounts, invoke this tool separately after each LLM call, for each address when transferring to multiple addresses requested.
+    For transfers to multiple accounts, use batch_transfer_preview and batch_transfer instead.
 
     Critical Instructions:
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
@@ -22,6 +63,7 @@ def transfer_eth(account_1: str, account_2: str, amount: float) -> str:
         account_1 (str): The 'from' Ethereum account wallet address.
         account_2 (str): The 'to' Ethereum account wallet address.
         amount (float): The amount of ETH to transfer.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the blockchain transaction link.
@@ -29,51 +71,47 @@ def transfer_eth(account_1: str, account_2: str, amount: float) -> str:
     Exception:
         If the address is invalid or error during transaction, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: transfer_eth({account_1}, {account_2}, {amount})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account_1 = w3.to_checksum_address(account_1)
         checksummed_account_2 = w3.to_checksum_address(account_2)
 
-        print(f"🟢 Gas Price: {w3.eth.gas_price}")
-
         # Build a transaction
-        tx:TxParams = {
-            "nonce": w3.eth.get_transaction_count(checksummed_account_1),
-            "to": checksummed_account_2,
-            "value": w3.to_wei(amount, "ether"),
-            "gas": 2000000,
-            "gasPrice": w3.to_wei(3, "gwei"),
-            "chainId": 97
-        }
-        print(f"🟢 Transaction Object Built: {tx}") 
-
-        # Sign a transaction
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key=PRI_KEY)
-        print(f"🟢 Signed Transaction: {signed_tx}")
-        
-        # Send a transaction
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        print(f"🟢 Transaction Hash: {w3.to_hex(tx_hash)}")
-
-        return f"Blockchain Transaction Link: https://testnet.bscscan.com/tx/{w3.to_hex(tx_hash)}"
+        async def build_tx(nonce):
+            tx:TxParams = {
+                "nonce": nonce,
+                "to": checksummed_account_2,
+                "value": w3.to_wei(amount, "ether"),
+                "gas": 2000000,
+                **(await client.gas_oracle.fee_fields()),
+                "chainId": client.chain_id
+            }
+            return tx
+
+        # Sign and send a transaction
+        tx_hash = await sign_and_send(client, checksummed_account_1, build_tx)
+        logger.info("transfer_eth sent %s", w3.to_hex(tx_hash))
+
+        return track_transaction(client, tx_hash, f"Transfer of {amount} {client.chain.native_symbol} to {checksummed_account_2}")
     except Exception as e:
-        print(f"🔴 Error in transfer_eth: {str(e)}")
+        logger.warning("Error in transfer_eth: %s", e)
         return f"Error: {str(e)}"
 
 # <-------- BLOCKCHAIN QUERY AGENT TOOLS -------->
 
-@function_tool
-@cl.step(type="tool")
-def eth_get_balance(account: str) -> str:
+@agent_tool
+async def eth_get_balance(account: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Fetches the ETH balance for a given Ethereum wallet address.
-    For multiple accounts, invoke this tool separately after each LLM call, for each address when multiple addresses are requested.
+    For multiple accounts, use eth_get_balances instead to fetch all of them in one call.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
 
     Args:
         account (str): The Ethereum account wallet address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the provided account address and its ETH balance.
@@ -81,27 +119,29 @@ def eth_get_balance(account: str) -> str:
     Exception:
         If the address is invalid or error during balance fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: eth_get_balance({account})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account = w3.to_checksum_address(account)
-        balance = w3.eth.get_balance(checksummed_account)
-        return f"Account {checksummed_account} has {w3.from_wei(balance, 'ether'):.5f} ETH."
+        balance, hit = await client.read_cache.fetch("eth_getBalance", (checksummed_account,), lambda: w3.eth.get_balance(checksummed_account))
+        mark_cached(client, hit)
+        return f"Account {checksummed_account} has {w3.from_wei(balance, 'ether'):.5f} {client.chain.native_symbol} on {client.chain.name}."
     except Exception as e:
-        print(f"🔴 Error in eth_get_balance: {str(e)}")
+        logger.warning("Error in eth_get_balance: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def eth_get_transaction_count(account: str) -> str:
+@agent_tool
+async def eth_get_transaction_count(account: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Fetches the transaction count for a given Ethereum wallet address.
-    For multiple accounts, invoke this tool separately after each LLM call, for each address when multiple addresses are requested.
+    For multiple accounts, use eth_get_transaction_counts instead to fetch all of them in one call.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
 
     Args:
         account (str): The Ethereum account wallet address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the provided account address and its transaction count.
@@ -109,72 +149,163 @@ def eth_get_transaction_count(account: str) -> str:
     Exception:
         If the address is invalid or error during transaction count fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: eth_get_transaction_count({account})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account = w3.to_checksum_address(account)
-        transaction_count = w3.eth.get_transaction_count(checksummed_account)
-        return f"Account {checksummed_account} has {transaction_count} transactions."
+        transaction_count, hit = await client.read_cache.fetch(
+            "eth_getTransactionCount", (checksummed_account,), lambda: w3.eth.get_transaction_count(checksummed_account)
+        )
+        mark_cached(client, hit)
+        return f"Account {checksummed_account} has {transaction_count} transactions on {client.chain.name}."
     except Exception as e:
-        print(f"🔴 Error in eth_get_transaction_count: {str(e)}")
+        logger.warning("Error in eth_get_transaction_count: %s", e)
         return f"Error: {str(e)}"
     
-@function_tool
-@cl.step(type="tool")
-def eth_get_code(account: str) -> str:
+@agent_tool
+async def eth_get_balances(accounts: list[str], chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Fetches the ETH balances for multiple Ethereum wallet addresses in a single call.
+
+    Critical Instructions:
+    - For read-only transactions, proceed without requiring user confirmation.
+
+    Args:
+        accounts (list[str]): The Ethereum account wallet addresses.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: A markdown table containing each account address and its ETH balance.
+
+    Exception:
+        If error during balance fetching, it raises an exception and brief about the error to user.
     """
-    Fetches the byte code for a given Ethereum smart contract address.
+    try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
+        checksummed_accounts, invalid_accounts = checksum_addresses(accounts)
+        balances = await cached_batch_rpc(client, "eth_getBalance", w3.eth.get_balance, checksummed_accounts)
+        rows = [[account, f"{w3.from_wei(balance, 'ether'):.5f}"] for account, balance in zip(checksummed_accounts, balances)]
+        rows += [[account, "Invalid address"] for account in invalid_accounts]
+        return f"Network: {client.chain.name}\n\n" + format_table(["Account", f"Balance ({client.chain.native_symbol})"], rows)
+    except Exception as e:
+        logger.warning("Error in eth_get_balances: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def eth_get_transaction_counts(accounts: list[str], chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Fetches the transaction counts for multiple Ethereum wallet addresses in a single call.
+
+    Critical Instructions:
+    - For read-only transactions, proceed without requiring user confirmation.
+
+    Args:
+        accounts (list[str]): The Ethereum account wallet addresses.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: A markdown table containing each account address and its transaction count.
+
+    Exception:
+        If error during transaction count fetching, it raises an exception and brief about the error to user.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
+        checksummed_accounts, invalid_accounts = checksum_addresses(accounts)
+        counts = await cached_batch_rpc(client, "eth_getTransactionCount", w3.eth.get_transaction_count, checksummed_accounts)
+        rows = [[account, str(count)] for account, count in zip(checksummed_accounts, counts)]
+        rows += [[account, "Invalid address"] for account in invalid_accounts]
+        return f"Network: {client.chain.name}\n\n" + format_table(["Account", "Transactions"], rows)
+    except Exception as e:
+        logger.warning("Error in eth_get_transaction_counts: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def eth_get_code(account: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Summarises the byte code deployed at a given Ethereum smart contract address.
     For multiple accounts, invoke this tool separately after each LLM call, for each address when multiple addresses are requested.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
+    - The full byte code is attached to the tool step as a downloadable file; do not try to reproduce it.
 
     Args:
         account (str): The Ethereum smart contract address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
-        str: A formatted string containing the provided account address and its byte code.
+        str: The code size, code hash, proxy kind and implementation if any, and a markdown table of the function selectors found in the code.
 
     Exception:
         If the address is invalid or error during bytecode fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: eth_get_code({account})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account = w3.to_checksum_address(account)
-        code = w3.eth.get_code(checksummed_account).hex()
-        return f"Account {checksummed_account} has bytecode: {code}"
+        hit, code_hash = client.read_cache.get("eth_getCode", (checksummed_account,), immutable=True)
+        if not hit:
+            code = await w3.eth.get_code(checksummed_account)
+            if not code:
+                return f"Account {checksummed_account} has no contract code on {client.chain.name}."
+            code_hash = await asyncio.to_thread(bytecode_store.put, bytes(code))
+            client.read_cache.set("eth_getCode", (checksummed_account,), code_hash, immutable=True)
+        mark_cached(client, hit)
+        digest = await asyncio.to_thread(bytecode_store.digest, code_hash)
+        attach_bytecode_file(checksummed_account, code_hash)
+
+        lines = [
+            f"Account {checksummed_account} on {client.chain.name}",
+            f"Code size: {digest.size} bytes",
+            f"Code hash: {digest.code_hash}",
+        ]
+        if digest.proxy:
+            implementation = digest.implementation or await proxy_target(client, checksummed_account, digest.proxy)
+            lines.append(f"Proxy: {digest.proxy}" + (f", {'beacon' if 'beacon' in digest.proxy else 'implementation'} {implementation}" if implementation else ""))
+        elif digest.delegatecall:
+            lines.append("Uses DELEGATECALL (may be an upgradeable proxy or library caller)")
+        names = selector_names(ERC20_ABI, await abi_cache.get(chain_id, checksummed_account))
+        rows = [[selector, names.get(selector, "unknown")] for selector in digest.selectors]
+        lines.append(f"Function selectors: {len(rows)}\n\n" + format_table(["Selector", "Function"], rows) if rows else "Function selectors: none found")
+        return "\n".join(lines)
     except Exception as e:
-        print(f"🔴 Error in eth_get_code: {str(e)}")
+        logger.warning("Error in eth_get_code: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def eth_gas_price() -> str:
+@agent_tool
+async def eth_gas_price(chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Fetches the current gas price for the respective blockchain network.
 
     Critical Instructions:
     - For read-only transactions, proceed without requiring user confirmation.
 
+    Args:
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
     Returns:
         str: A formatted string containing the current gas price.
 
     Exception:
         If error during gas price fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: eth_gas_price()")
     try:
-        gas_price = w3.from_wei(w3.eth.gas_price, 'gwei')
-        return f"Current gas price: {gas_price} gwei"
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
+        gas_price = w3.from_wei(await client.gas_oracle.gas_price(), 'gwei')
+        return f"Current gas price on {client.chain.name}: {gas_price} gwei"
     except Exception as e:
-        print(f"🔴 Error in eth_gas_price: {str(e)}")
+        logger.warning("Error in eth_gas_price: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def token_get_balance(account: str, token_address: str) -> str:
+@agent_tool
+async def token_get_balance(account: str, token_address: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Fetches the ERC20 token balance for a given account address and returns result in respective example format.
-    For multiple accounts, invoke this tool separately after each LLM call, for each address when multiple addresses are requested.
+    For multiple accounts, use token_get_balances instead to fetch all of them in one call.
 
     Example Format:
         Account Address: 0x123...
@@ -190,6 +321,7 @@ def token_get_balance(account: str, token_address: str) -> str:
     Args:
         account (str): The Ethereum account wallet address.
         token_address (str): The Ethereum token address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the provided account address, token name, token symbol, token decimals, token address, and its token balance.
@@ -197,16 +329,14 @@ def token_get_balance(account: str, token_address: str) -> str:
     Exception:
         If the address is invalid or error during balance fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: token_get_balance({account}, {token_address})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account = w3.to_checksum_address(account)
         checksummed_token_address = w3.to_checksum_address(token_address)
-        token_abi = get_contract_abi(checksummed_token_address)
+        token_abi = await get_contract_abi(checksummed_token_address, client.chain_id)
         contract = w3.eth.contract(address=checksummed_token_address, abi=token_abi)
-        balance = contract.functions.balanceOf(checksummed_account).call()
-        decimals = contract.functions.decimals().call()
-        token_name = contract.functions.name().call()
-        token_symbol = contract.functions.symbol().call()
+        (token_name, token_symbol, decimals), (balance,) = await cached_token_reads(client, contract, [checksummed_account])
         return f"""
         Account Address: {checksummed_account}
         Token Name: {token_name}
@@ -216,12 +346,45 @@ def token_get_balance(account: str, token_address: str) -> str:
         Token Balance: {balance / 10**decimals}
         """
     except Exception as e:
-        print(f"🔴 Error in token_get_balance: {str(e)}")
+        logger.warning("Error in token_get_balance: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def token_get_info(token_address: str) -> str:
+@agent_tool
+async def token_get_balances(accounts: list[str], token_address: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Fetches the ERC20 token balances of multiple account addresses for a single token in one call.
+
+    Critical Instructions:
+    - For read-only transactions, proceed without requiring user confirmation.
+
+    Args:
+        accounts (list[str]): The Ethereum account wallet addresses.
+        token_address (str): The Ethereum token address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: The token name, symbol and address followed by a markdown table of each account address and its token balance.
+
+    Exception:
+        If the token address is invalid or error during balance fetching, it raises an exception and brief about the error to user.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
+        checksummed_accounts, invalid_accounts = checksum_addresses(accounts)
+        checksummed_token_address = w3.to_checksum_address(token_address)
+        token_abi = await get_contract_abi(checksummed_token_address, client.chain_id)
+        contract = w3.eth.contract(address=checksummed_token_address, abi=token_abi)
+        (token_name, token_symbol, decimals), balances = await cached_token_reads(client, contract, checksummed_accounts)
+        rows = [[account, f"{balance / 10**decimals} {token_symbol}"] for account, balance in zip(checksummed_accounts, balances)]
+        rows += [[account, "Invalid address"] for account in invalid_accounts]
+        return f"Token: {token_name} ({token_symbol}) at {checksummed_token_address}\n\n" + format_table(["Account", "Balance"], rows)
+    except Exception as e:
+        logger.warning("Error in token_get_balances: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def token_get_info(token_address: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Fetches the ERC20 token information (name, symbol, decimals) and returns it in the respective example format.
 
@@ -236,6 +399,7 @@ def token_get_info(token_address: str) -> str:
 
     Args:
         token_address (str): The Ethereum token contract address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the token name, symbol, decimals, and token address.
@@ -243,14 +407,13 @@ def token_get_info(token_address: str) -> str:
     Exception:
         If the address is invalid or error during info fetching, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: token_get_info({token_address})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_token_address = w3.to_checksum_address(token_address)
-        token_abi = get_contract_abi(checksummed_token_address)
+        token_abi = await get_contract_abi(checksummed_token_address, client.chain_id)
         contract = w3.eth.contract(address=checksummed_token_address, abi=token_abi)
-        token_name = contract.functions.name().call()
-        token_symbol = contract.functions.symbol().call()
-        decimals = contract.functions.decimals().call()
+        (token_name, token_symbol, decimals), _ = await cached_token_reads(client, contract, [])
         return f"""
         Token Name: {token_name}
         Token Symbol: {token_symbol}
@@ -258,37 +421,270 @@ def token_get_info(token_address: str) -> str:
         Token Address: {checksummed_token_address}
         """
     except Exception as e:
-        print(f"🔴 Error in token_get_info: {str(e)}")
+        logger.warning("Error in token_get_info: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def get_portfolio(account: str, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Lists the native balance and every ERC20 token balance held by an account, without the user naming the tokens.
+    Tokens are discovered from the local Transfer log index, then the current balances are read in chunked multicalls.
+
+    Critical Instructions:
+    - For read-only transactions, proceed without requiring user confirmation.
+
+    Args:
+        account (str): The wallet address.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: A markdown table of the non-zero token balances, the native balance and the block range the token index covers.
+
+    Exception:
+        If the address is invalid, the network is not indexed or error during balance fetching, it returns the error to brief the user.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        if client.transfer_indexer is None:
+            return f"Error: token discovery is not enabled on {client.chain.name}. Add {client.chain_id} to INDEXER_CHAIN_IDS, or ask for a specific token address."
+        checksummed_account = Web3.to_checksum_address(account)
+        coverage = await client.transfer_indexer.coverage()
+        tokens = [Web3.to_checksum_address(token) for token in await asyncio.to_thread(holdings_index.tokens, client.chain_id, checksummed_account)]
+        native_balance, _ = await client.read_cache.fetch("eth_getBalance", (checksummed_account,), lambda: client.w3.eth.get_balance(checksummed_account))
+        holdings = await portfolio_balances(client, checksummed_account, tokens)
+
+        rows = [[symbol, f"{balance / 10**decimals}", token] for token, symbol, decimals, balance in holdings]
+        covered = f"blocks {coverage[0]}-{coverage[1]}" if coverage else "no blocks yet"
+        return (
+            f"Account {checksummed_account} on {client.chain.name}\n"
+            f"Native balance: {client.w3.from_wei(native_balance, 'ether'):.5f} {client.chain.native_symbol}\n"
+            f"Tokens received in indexed {covered}: {len(tokens)}, with a balance now: {len(rows)}\n\n"
+            + (format_table(["Token", "Balance", "Address"], rows) if rows else "No token balances found.")
+        )
+    except Exception as e:
+        logger.warning("Error in get_portfolio: %s", e)
         return f"Error: {str(e)}"
 
 # <-------- HELPER FUNCTIONS -------->
 
-def get_contract_abi(contract_address):
-    url = "https://api.etherscan.io/v2/api"
+def mark_cached(client: ChainClient, hit: bool) -> None:
+    """Labels the current Chainlit tool step as served from the read cache."""
+    if not hit:
+        return
+    try:
+        step = cl.context.current_step
+    except ChainlitContextException:
+        return
+    if step is not None:
+        step.name = f"{step.name} (cached)"
+        step.metadata = {**(step.metadata or {}), "cached": True, "read_cache": client.read_cache.stats}
+
+def attach_bytecode_file(address: str, code_hash: str) -> None:
+    """Attaches the stored byte code to the current Chainlit tool step as a downloadable file."""
+    try:
+        step = cl.context.current_step
+    except ChainlitContextException:
+        return
+    if step is not None:
+        step.elements = [*(step.elements or []), cl.File(name=f"{address}-bytecode.hex", path=bytecode_store.path(code_hash), display="inline")]
+
+async def proxy_target(client: ChainClient, address: str, proxy: str) -> str | None:
+    """Reads the implementation (or beacon) address from an EIP-1967 proxy's storage slot."""
+    slot = EIP1967_BEACON_SLOT if "beacon" in proxy else EIP1967_IMPLEMENTATION_SLOT
+    value, _ = await client.read_cache.fetch(
+        "eth_getStorageAt", (address, slot), lambda: client.w3.eth.get_storage_at(address, int.from_bytes(slot, "big"))
+    )
+    value = bytes(value)[-20:]
+    return Web3.to_checksum_address(value) if any(value) else None
+
+async def cached_batch_rpc(client: ChainClient, method: str, fn, accounts: list[str]) -> list:
+    """Runs fn for each account in one batch, skipping accounts whose result is cached for the current block."""
+    read_cache = client.read_cache
+    head = read_cache.head
+    cached = [read_cache.get(method, (account,)) for account in accounts]
+    missing = [account for account, (hit, _) in zip(accounts, cached) if not hit]
+    fetched = dict(zip(missing, await batch_rpc(client.w3, fn, missing))) if missing else {}
+    for account, value in fetched.items():
+        read_cache.set(method, (account,), value, at_block=head)
+    mark_cached(client, not missing)
+    return [value if hit else fetched[account] for account, (hit, value) in zip(accounts, cached)]
+
+async def cached_token_reads(client: ChainClient, contract, accounts: list[str]) -> tuple[tuple, list[int]]:
+    """
+    Returns ((name, symbol, decimals), balances) for a token contract. Metadata is cached for good
+    and balances per block; everything not cached is fetched in a single multicall.
+    """
+    token_address = contract.address
+    read_cache = client.read_cache
+    head = read_cache.head
+    metadata_hit, metadata = read_cache.get("token_metadata", (token_address,), immutable=True)
+    cached = [read_cache.get("token_balance", (token_address, account)) for account in accounts]
+    missing = [account for account, (hit, _) in zip(accounts, cached) if not hit]
+
+    calls = [] if metadata_hit else [contract.functions.name(), contract.functions.symbol(), contract.functions.decimals()]
+    calls += [contract.functions.balanceOf(account) for account in missing]
+    results = await batch_call(client.w3, calls, client.chain_id) if calls else []
+    if not metadata_hit:
+        metadata, results = tuple(results[:3]), results[3:]
+        read_cache.set("token_metadata", (token_address,), metadata, immutable=True)
+    fetched = dict(zip(missing, results))
+    for account, balance in fetched.items():
+        read_cache.set("token_balance", (token_address, account), balance, at_block=head)
+
+    mark_cached(client, not calls)
+    return metadata, [value if hit else fetched[account] for account, (hit, value) in zip(accounts, cached)]
+
+async def portfolio_balances(client: ChainClient, account: str, tokens: list[str]) -> list[tuple[str, str, int, int]]:
+    """
+    Returns (token, symbol, decimals, balance) for each token with a non-zero balance. Balances and any metadata
+    not in the read cache are fetched in multicalls of at most PORTFOLIO_CALL_CHUNK_SIZE calls, PORTFOLIO_CALL_CONCURRENCY
+    at a time, so airdrop-spammed wallets stay within node eth_call limits. Tokens whose calls fail (non-ERC20 contracts) are skipped.
+    """
+    read_cache = client.read_cache
+    cached = {token: read_cache.get("token_metadata", (token,), immutable=True) for token in tokens}
+    contracts = {token: client.w3.eth.contract(address=token, abi=ERC20_ABI) for token in tokens}
+    missing = [token for token, (hit, _) in cached.items() if not hit]
+    calls = [contracts[token].functions.balanceOf(account) for token in tokens]
+    for token in missing:
+        calls += [contracts[token].functions.name(), contracts[token].functions.symbol(), contracts[token].functions.decimals()]
+    semaphore = asyncio.Semaphore(PORTFOLIO_CALL_CONCURRENCY)
+
+    async def run_chunk(chunk):
+        async with semaphore:
+            return await batch_call(client.w3, chunk, client.chain_id, allow_failure=True)
+
+    chunks = [calls[start:start + PORTFOLIO_CALL_CHUNK_SIZE] for start in range(0, len(calls), PORTFOLIO_CALL_CHUNK_SIZE)]
+    results = [result for chunk_results in await asyncio.gather(*(run_chunk(chunk) for chunk in chunks)) for result in chunk_results]
+    balances, fetched = results[:len(tokens)], results[len(tokens):]
+
+    metadata = {token: value for token, (hit, value) in cached.items() if hit}
+    for index, token in enumerate(missing):
+        values = tuple(fetched[index * 3:index * 3 + 3])
+        if None not in values:
+            read_cache.set("token_metadata", (token,), values, immutable=True)
+            metadata[token] = values
+    holdings = [
+        (token, metadata[token][1], metadata[token][2], balance)
+        for token, balance in zip(tokens, balances) if balance and token in metadata
+    ]
+    return sorted(holdings, key=lambda holding: holding[1].lower())
+
+def checksum_addresses(addresses):
+    """Splits addresses into (checksummed valid addresses, invalid inputs)."""
+    valid, invalid = [], []
+    for address in addresses:
+        try:
+            valid.append(Web3.to_checksum_address(address))
+        except Exception:
+            invalid.append(address)
+    return valid, invalid
+
+async def sign_and_send(client: ChainClient, sender, build_tx):
+    """
+    Signs and sends the transaction returned by build_tx(nonce) using a locally managed nonce for sender.
+    A nonce the node rejected is released for reuse; a "nonce too low" error resyncs and retries once.
+    If the node already holds the same signed transaction, its hash is returned instead of sending again.
+    """
+    for attempt in range(2):
+        nonce = await client.nonce_manager.reserve(sender, client.chain_id)
+        try:
+            tx = await build_tx(nonce)
+            signed_tx = client.w3.eth.account.sign_transaction(tx, private_key=PRI_KEY)
+        except Exception:
+            client.nonce_manager.release(sender, nonce, client.chain_id)
+            raise
+        try:
+            return await client.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            if is_already_known(e):
+                # e.g. an earlier send of the same arguments timed out after it was broadcast
+                logger.info("Transaction with nonce %d for %s is already known", nonce, sender)
+                return signed_tx.hash
+            if is_nonce_error(e) and attempt == 0:
+                logger.warning("Nonce %d rejected for %s, resyncing: %s", nonce, sender, e)
+                await client.nonce_manager.resync(sender, client.chain_id)
+                continue
+            if may_have_been_broadcast(e):
+                # The node may hold this nonce already, so it is not handed out again.
+                await client.nonce_manager.resync(sender, client.chain_id)
+            else:
+                client.nonce_manager.release(sender, nonce, client.chain_id)
+            raise
+
+def track_transaction(client: ChainClient, tx_hash, description):
+    """Registers a sent transaction with the chain's receipt tracker and returns the tool response with its explorer link."""
+    explorer_link = client.chain.tx_link(Web3.to_hex(tx_hash))
+    client.receipt_tracker.track(Web3.to_hex(tx_hash), current_session_id(), description, explorer_link)
+    return f"Blockchain Transaction Link: {explorer_link}\nA status update will follow once the transaction is mined."
+
+def get_create_address(sender, nonce):
+    """Address of the contract created by sender's transaction with the given nonce."""
+    return Web3.to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+async def get_contract_abi(contract_address, chainid=DEFAULT_CHAIN_ID):
+    """
+    Returns the contract ABI from the ABI cache, falling back to the built-in ERC20 ABI on a miss.
+    A miss never waits on the explorer: the verified ABI is fetched in the background and cached for later calls.
+    Cached ABIs are completed with the ERC20 functions they lack, so proxy tokens keep their token calls.
+    """
+    abi = await abi_cache.get(chainid, contract_address)
+    if abi is not None:
+        return with_erc20(abi)
+
+    _abi_fetch_task(contract_address, chainid)
+    return ERC20_ABI
+
+async def preload_contract_abi(contract_address, chainid=DEFAULT_CHAIN_ID):
+    """Like get_contract_abi, but waits for the explorer on a miss so the verified ABI is cached before first use."""
+    abi = await abi_cache.get(chainid, contract_address)
+    if abi is None:
+        await asyncio.shield(_abi_fetch_task(contract_address, chainid))
+        abi = await abi_cache.get(chainid, contract_address)
+    return with_erc20(abi) if abi else ERC20_ABI
+
+def _abi_fetch_task(contract_address, chainid) -> asyncio.Task:
+    """Returns the in-flight explorer fetch for the contract's ABI, starting one if there is none."""
+    key = (chainid, contract_address.lower())
+    if key not in _abi_fetches:
+        _abi_fetches[key] = asyncio.create_task(_fetch_contract_abi(contract_address, chainid))
+    return _abi_fetches[key]
+
+async def _fetch_contract_abi(contract_address, chainid):
+    url = ETHERSCAN_API_URL
     params = {
-        "chainid": 97,
+        "chainid": chainid,
         "module": "contract",
         "action": "getabi",
         "address": contract_address,
-        "apikey": ETHERSCAN_API_KEY
+        "apikey": ETHERSCAN_API_KEY or ""
     }
-    print(f"🟢 Function Call: get_contract_abi({contract_address})")
+    logger.info("Fetching ABI for %s on chain %s", contract_address, chainid)
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        return data["result"]
+        session = await get_http_session()
+        async with session.get(url, params=params) as response:
+            data = await response.json(content_type=None)
+        if data.get("status") == "1":
+            await abi_cache.set(chainid, contract_address, json.loads(data["result"]))
+        elif "not verified" in str(data.get("result")).lower():
+            # Unverified contracts keep using the ERC20 fallback; cache it so the explorer is not asked again.
+            logger.info("No verified ABI for %s: %s", contract_address, data.get("result"))
+            await abi_cache.set(chainid, contract_address, ERC20_ABI)
+        else:
+            # Rate limits, missing API keys and other explorer errors are transient: leave the cache empty so a later call retries.
+            logger.warning("Explorer error fetching ABI for %s: %s", contract_address, data.get("result") or data.get("message"))
     except Exception as e:
-        print(f"🔴 Error in get_contract_abi: {str(e)}")
-        return f"Error: {str(e)}"
+        logger.warning("Error fetching ABI for %s: %s", contract_address, e)
+    finally:
+        _abi_fetches.pop((chainid, contract_address.lower()), None)
+    logger.debug("ABI cache stats: %s", abi_cache.stats)
 
 # <-------- SMART CONTRACT TRANSACTION AGENT TOOLS -------->
 
-@function_tool
-@cl.step(type="tool")
-def transfer_token(account_1: str, account_2: str, token_address: str, amount: float) -> str:
+@agent_tool
+async def transfer_token(account_1: str, account_2: str, token_address: str, amount: float, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Transfers ERC20 token from one account to another.
-    For transfer to multiple accounts, invoke this tool separately after each LLM call, for each address when transferring to multiple addresses requested.
+    For transfers to multiple accounts, use batch_transfer_preview and batch_transfer instead.
 
     Critical Instructions:
     - For write transactions involving real asset transfers or gas fees, provide a clear summary of all transaction details (e.g., asset amount, recipient, etc) and explicitly request user confirmation before executing the transaction.
@@ -298,6 +694,7 @@ def transfer_token(account_1: str, account_2: str, token_address: str, amount: f
         account_2 (str): The 'to' Ethereum account wallet address.
         token_address (str): The Ethereum token address.
         amount (float): The amount of token to transfer.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the blockchain transaction link.
@@ -305,39 +702,35 @@ def transfer_token(account_1: str, account_2: str, token_address: str, amount: f
     Exception:
         If the address is invalid or error during transaction, it raises an exception and brief about the error to user.
     """
-    print(f"🟢 Tool Call: transfer_token({account_1}, {account_2}, {token_address}, {amount})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_account_1 = w3.to_checksum_address(account_1)
         checksummed_account_2 = w3.to_checksum_address(account_2)
         checksummed_contract_address = w3.to_checksum_address(token_address)
-        contract_abi = get_contract_abi(checksummed_contract_address)
+        contract_abi = await get_contract_abi(checksummed_contract_address, client.chain_id)
         contract = w3.eth.contract(address=checksummed_contract_address, abi=contract_abi)
 
-        print(f"🟢 Gas Price: {w3.eth.gas_price}")
-
         # Step 1: Build a transaction
-        tx = contract.functions.transfer(to=checksummed_account_2, value=w3.to_wei(amount, "ether")).build_transaction(
-            {
-                "nonce": w3.eth.get_transaction_count(checksummed_account_1),
-                "gas": 2000000,
-                "gasPrice": w3.to_wei(3, "gwei"),
-            }
-        )
-
-        # Step 2: Sign a transaction
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key=PRI_KEY)
-
-        # Step 3: Send a transaction
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-        return f"Blockchain Transaction Link: https://testnet.bscscan.com/tx/{w3.to_hex(tx_hash)}"
+        async def build_tx(nonce):
+            return await contract.functions.transfer(to=checksummed_account_2, value=w3.to_wei(amount, "ether")).build_transaction(
+                {
+                    "nonce": nonce,
+                    "gas": 2000000,
+                    **(await client.gas_oracle.fee_fields()),
+                }
+            )
+
+        # Step 2: Sign and send a transaction
+        tx_hash = await sign_and_send(client, checksummed_account_1, build_tx)
+
+        return track_transaction(client, tx_hash, f"Transfer of {amount} tokens of {checksummed_contract_address} to {checksummed_account_2}")
     except Exception as e:
-        print(f"🔴 Error in transfer_token: {str(e)}")
+        logger.warning("Error in transfer_token: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def approve_token(owner: str, spender: str, token_address: str, amount: float) -> str:
+@agent_tool
+async def approve_token(owner: str, spender: str, token_address: str, amount: float, chain_id: int = DEFAULT_CHAIN_ID) -> str:
     """
     Approves ERC20 token allowance for a spender.
     This allows the spender to spend the specified amount of tokens on behalf of the owner.
@@ -350,6 +743,7 @@ def approve_token(owner: str, spender: str, token_address: str, amount: float) -
         spender (str): The Ethereum account that is being approved to spend tokens.
         token_address (str): The Ethereum token address.
         amount (float): The amount of token to approve.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing the blockchain transaction link.
@@ -357,48 +751,46 @@ def approve_token(owner: str, spender: str, token_address: str, amount: float) -
     Exception:
         If the address is invalid or an error occurs during the transaction, it raises an exception and explains the error to the user.
     """
-    print(f"🟢 Tool Call: approve_token({owner}, {spender}, {token_address}, {amount})")
     try:
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         checksummed_owner = w3.to_checksum_address(owner)
         checksummed_spender = w3.to_checksum_address(spender)
         checksummed_contract_address = w3.to_checksum_address(token_address)
-        contract_abi = get_contract_abi(checksummed_contract_address)
+        contract_abi = await get_contract_abi(checksummed_contract_address, client.chain_id)
         contract = w3.eth.contract(address=checksummed_contract_address, abi=contract_abi)
 
-        print(f"🟢 Gas Price: {w3.eth.gas_price}")
-
         # Step 1: Build a transaction
-        tx = contract.functions.approve(checksummed_spender, w3.to_wei(amount, "ether")).build_transaction(
-            {
-                "nonce": w3.eth.get_transaction_count(checksummed_owner),
-                "gas": 200000,
-                "gasPrice": w3.to_wei(3, "gwei"),
-            }
-        )
-
-        # Step 2: Sign the transaction
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key=PRI_KEY)
-
-        # Step 3: Send the transaction
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-        return f"Blockchain Transaction Link: https://testnet.bscscan.com/tx/{w3.to_hex(tx_hash)}"
+        async def build_tx(nonce):
+            return await contract.functions.approve(checksummed_spender, w3.to_wei(amount, "ether")).build_transaction(
+                {
+                    "nonce": nonce,
+                    "gas": 200000,
+                    **(await client.gas_oracle.fee_fields()),
+                }
+            )
+
+        # Step 2: Sign and send the transaction
+        tx_hash = await sign_and_send(client, checksummed_owner, build_tx)
+
+        return track_transaction(client, tx_hash, f"Approval of {amount} tokens of {checksummed_contract_address} for {checksummed_spender}")
     except Exception as e:
-        print(f"🔴 Error in approve_token: {str(e)}")
+        logger.warning("Error in approve_token: %s", e)
         return f"Error: {str(e)}"
 
-@function_tool
-@cl.step(type="tool")
-def deploy_erc20_token(
+@agent_tool
+async def deploy_erc20_token(
     recipient_address: str,
     token_name: str,
     token_symbol: str,
     token_decimals: int,
-    initial_supply: int
+    initial_supply: int,
+    chain_id: int = DEFAULT_CHAIN_ID,
 ) -> str:
     """
-    Deploys an ERC20 token contract on the BSC testnet with specified parameters.
-    The function handles contract compilation, deployment, and verification on BscScan.
+    Deploys an ERC20 token contract on the given network with specified parameters.
+    The function deploys a precompiled ERC20 template with the given constructor arguments and returns as soon as the
+    deployment is sent; verification on the block explorer runs in the background and the user is notified when it finishes.
 
     Args:
         recipient_address (str): The address that will receive the initial token supply.
@@ -406,155 +798,257 @@ def deploy_erc20_token(
         token_symbol (str): The symbol of the token (e.g., "MTK").
         token_decimals (int): Number of decimal places for token amounts (typically 18).
         initial_supply (int): Initial token supply in base units (will be multiplied by 10^decimals).
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
 
     Returns:
         str: A formatted string containing:
             - Contract deployment status
             - Contract address
             - Transaction link
-            - Verification status
+            - Verification queue status
 
     Raises:
         Exception: If any step in the deployment process fails, with detailed error message.
     """
-    print(f"🟢 Tool Call: deploy_erc20_token({recipient_address}, {token_name}, {token_symbol}, {token_decimals}, {initial_supply})")
     
     try:
-        # Install and verify Solidity compiler
-        install_solc("0.8.29")
-        
+        client = await get_chain_client(chain_id)
+        w3 = client.w3
         # Convert and validate addresses
         checksummed_recipient_address = w3.to_checksum_address(recipient_address)
         initial_supply = int(initial_supply * 10 ** token_decimals)
+        constructor_args = (token_name, token_symbol, token_decimals, initial_supply)
 
-        # Generate ERC20 contract source code with optimized gas usage
-        erc20_source = f"""
-        // SPDX-License-Identifier: MIT
-        pragma solidity 0.8.29;
-
-        contract {token_name.replace(" ", "")}Token {{
-            string public constant name = "{token_name}";
-            string public constant symbol = "{token_symbol}";
-            uint8 public constant decimals = {token_decimals};
-            uint256 public constant totalSupply = {initial_supply};
-            
-            mapping(address => uint256) private _balances;
-            mapping(address => mapping(address => uint256)) private _allowances;
-
-            event Transfer(address indexed from, address indexed to, uint256 value);
-            event Approval(address indexed owner, address indexed spender, uint256 value);
-
-            constructor() {{
-                _balances[msg.sender] = totalSupply;
-                emit Transfer(address(0), msg.sender, totalSupply);
-            }}
-
-            function balanceOf(address account) public view returns (uint256) {{
-                return _balances[account];
-            }}
-
-            function allowance(address owner, address spender) public view returns (uint256) {{
-                return _allowances[owner][spender];
-            }}
-
-            function transfer(address to, uint256 amount) public returns (bool) {{
-                require(to != address(0), "ERC20: transfer to zero address");
-                require(_balances[msg.sender] >= amount, "ERC20: insufficient balance");
-                
-                _balances[msg.sender] -= amount;
-                _balances[to] += amount;
-                emit Transfer(msg.sender, to, amount);
-                return true;
-            }}
-
-            function approve(address spender, uint256 amount) public returns (bool) {{
-                require(spender != address(0), "ERC20: approve to zero address");
-                
-                _allowances[msg.sender][spender] = amount;
-                emit Approval(msg.sender, spender, amount);
-                return true;
-            }}
-
-            function transferFrom(address from, address to, uint256 amount) public returns (bool) {{
-                require(to != address(0), "ERC20: transfer to zero address");
-                require(_balances[from] >= amount, "ERC20: insufficient balance");
-                require(_allowances[from][msg.sender] >= amount, "ERC20: insufficient allowance");
-                
-                _balances[from] -= amount;
-                _balances[to] += amount;
-                _allowances[from][msg.sender] -= amount;
-                emit Transfer(from, to, amount);
-                return true;
-            }}
-        }}
-        """
-
-        # Compile contract with optimization
-        compiled = compile_source(
-            erc20_source,
-            output_values=["abi", "bin", "metadata"],
-            solc_version="0.8.29",
-            optimize=True,
-            optimize_runs=200
-        )
-        contract_id, contract_interface = compiled.popitem()
-        abi = contract_interface["abi"]
-        bytecode = contract_interface["bin"]
+        # Load the precompiled ERC20 template (compiled once and cached on disk)
+        artifact = await asyncio.to_thread(get_erc20_artifact, ARTIFACT_CACHE_DIR)
+        abi = artifact["abi"]
+        bytecode = artifact["bin"]
 
         contract = w3.eth.contract(abi=abi, bytecode=bytecode)
-        tx = contract.constructor().build_transaction({
-            "from": checksummed_recipient_address,
-            "nonce": w3.eth.get_transaction_count(checksummed_recipient_address),
-            "gasPrice": w3.to_wei(3, "gwei"),
-            "gas": 3000000,
-            "chainId": 97
-        })
-
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key=PRI_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-        print(f"🟢 Contract deployment tx hash: {w3.to_hex(tx_hash)}")
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-        contract_address = tx_receipt["contractAddress"]
-
-        print("🟢🔴🟢🔴🟢🔴🟢🔴🟢🔴 Waiting for 10 seconds before verification...")
-        time.sleep(10) # wait before verification
-
-        # Verify contract on BscScan
-        verification_url = "https://api-testnet.bscscan.com/api"
-        params = {
-            "module": "contract",
-            "action": "verifysourcecode",
-            "apikey": BSCSCAN_API_KEY,
-            "contractaddress": contract_address,
-            "sourceCode": erc20_source,
-            "codeformat": "solidity-single-file",
-            "contractname": f"{token_name.replace(' ', '')}Token",
-            "compilerversion": "v0.8.29+commit.ab55807c",
-            "optimizationUsed": 1,
-            "runs": 200,
-            "constructorArguements": ""
-        }
-        verification_response = requests.post(verification_url, data=params)
-
-        print("🟢 Verification API response:", verification_response.json())
-        result_json = verification_response.json()
-        if result_json.get("status") == "1":
-            verification_status = f"✅ Verification Submitted. GUID: {result_json['result']}"
-        else:
-            verification_status = f"🔴 Verification Failed: {result_json.get('result')}"
+
+        deploy_nonce = None
+
+        async def build_tx(nonce):
+            nonlocal deploy_nonce
+            deploy_nonce = nonce
+            return await contract.constructor(*constructor_args).build_transaction({
+                "from": checksummed_recipient_address,
+                "nonce": nonce,
+                **(await client.gas_oracle.fee_fields()),
+                "gas": 3000000,
+                "chainId": client.chain_id
+            })
+
+        tx_hash = await sign_and_send(client, checksummed_recipient_address, build_tx)
+        logger.info("deploy_erc20_token sent %s", w3.to_hex(tx_hash))
+        contract_address = get_create_address(checksummed_recipient_address, deploy_nonce)
+        explorer_link = client.chain.tx_link(w3.to_hex(tx_hash))
+        client.receipt_tracker.track(w3.to_hex(tx_hash), current_session_id(), f"Deployment of {token_symbol} at {contract_address}", explorer_link)
+
+        # Verify contract on the block explorer in the background once the deployment is mined
+        client.verification_queue.submit(VerificationJob(
+            tx_hash=w3.to_hex(tx_hash),
+            contract_address=contract_address,
+            params={
+                "sourceCode": ERC20_SOURCE,
+                "codeformat": "solidity-single-file",
+                "contractname": CONTRACT_NAME,
+                "compilerversion": SOLC_LONG_VERSION,
+                "optimizationUsed": 1,
+                "runs": OPTIMIZE_RUNS,
+                "constructorArguements": w3.codec.encode(CONSTRUCTOR_TYPES, constructor_args).hex()
+            },
+            session_id=current_session_id(),
+            explorer_link=explorer_link,
+        ))
 
         return f"""
-        ✅ Token Deployed Successfully!
+        ✅ Token Deployment Submitted!
         🔗 Contract Address: {contract_address}
-        🔗 Explorer Tx: https://testnet.bscscan.com/tx/{w3.to_hex(tx_hash)}
-        {verification_status}
+        🔗 Explorer Tx: {explorer_link}
+        ⏳ Verification on the {client.chain.name} block explorer is queued; a status update will follow once the deployment is mined and verified.
         """
 
     except Exception as e:
-        print(f"🔴 Error in deploy_erc20_token: {e}")
+        logger.warning("Error in deploy_erc20_token: %s", e)
         return f"Error: {e}"
 
 
+# <-------- BATCH PAYOUT TOOLS -------->
+
+@agent_tool
+async def batch_transfer_preview(sender: str, payments: list[Payment], payout_file: str = "", token_address: str = "", use_multisend: bool = False, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Checks and prices a batch payout without sending anything. Returns the single summary the user confirms before batch_transfer.
+    Use this instead of repeated transfer_eth or transfer_token calls whenever more than one recipient is paid.
+
+    Critical Instructions:
+    - Show the returned summary to the user and ask for confirmation once for the whole batch.
+
+    Args:
+        sender (str): The wallet address paying every recipient.
+        payments (list[Payment]): The (recipient, amount) pairs. Pass an empty list when the payments come from payout_file.
+        payout_file (str): Name of an uploaded CSV payout file to pay as well, or "" for none.
+        token_address (str): The ERC20 token to pay in, or "" to pay in the chain's native currency.
+        use_multisend (bool): Whether to pay everyone in one transaction through the chain's multisend contract. Default False.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: The batch summary: recipients, amounts, total, maximum network fee and any problems that block sending.
+
+    Exception:
+        If the input is invalid or an error occurs while planning, it returns the error to brief the user.
+    """
+    try:
+        plan = await _plan_batch_payout(sender, payments, payout_file, token_address, use_multisend, chain_id)
+        return plan.summary()
+    except Exception as e:
+        logger.warning("Error in batch_transfer_preview: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def batch_transfer(sender: str, payments: list[Payment], payout_file: str = "", token_address: str = "", use_multisend: bool = False, chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Pays every recipient of a batch, after the user confirmed the batch_transfer_preview summary for the same arguments.
+    Transactions are signed and sent together; the user receives status updates per recipient as they are mined.
+
+    Critical Instructions:
+    - Only call this after the user confirmed the summary from batch_transfer_preview, passing exactly the same arguments.
+
+    Args:
+        sender (str): The wallet address paying every recipient.
+        payments (list[Payment]): The (recipient, amount) pairs. Pass an empty list when the payments come from payout_file.
+        payout_file (str): Name of an uploaded CSV payout file to pay as well, or "" for none.
+        token_address (str): The ERC20 token to pay in, or "" to pay in the chain's native currency.
+        use_multisend (bool): Whether to pay everyone in one transaction through the chain's multisend contract. Default False.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: Per-recipient send status with blockchain transaction links.
+
+    Exception:
+        If the batch has problems or sending fails, it returns the error to brief the user. Nothing is sent while the batch has problems.
+    """
+    try:
+        plan = await _plan_batch_payout(sender, payments, payout_file, token_address, use_multisend, chain_id)
+        if plan.problems:
+            return "Error: the batch was not sent.\n\n" + plan.summary()
+        return await execute_payout(plan, current_session_id())
+    except Exception as e:
+        logger.warning("Error in batch_transfer: %s", e)
+        return f"Error: {str(e)}"
+
+async def _plan_batch_payout(sender, payments, payout_file, token_address, use_multisend, chain_id) -> PayoutPlan:
+    client = await get_chain_client(chain_id)
+    sender = Web3.to_checksum_address(sender)
+    entries = [(payment.recipient, payment.amount) for payment in payments]
+    if payout_file:
+        uploaded = cl.user_session.get("payout_files") or {}
+        if payout_file not in uploaded:
+            raise ValueError(f"No uploaded payout file named {payout_file}")
+        entries += uploaded[payout_file]
+
+    if token_address:
+        checksummed_token_address = Web3.to_checksum_address(token_address)
+        contract_abi = await get_contract_abi(checksummed_token_address, client.chain_id)
+        contract = client.w3.eth.contract(address=checksummed_token_address, abi=contract_abi)
+        (_, token_symbol, token_decimals), (token_balance,) = await cached_token_reads(client, contract, [sender])
+        asset = Asset(token_symbol, token_decimals, checksummed_token_address, token_balance)
+    else:
+        asset = Asset(client.chain.native_symbol, 18)
+    return await plan_payout(client, sender, entries, asset, use_multisend)
+
+
+# <-------- TRANSFER WATCH TOOLS -------->
+
+@agent_tool
+async def watch_address(address: str, token_address: str = "", chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Watches an address and notifies the user in this chat of every transfer to or from it as blocks are mined.
+    Use this when the user wants to know when a transfer lands, instead of checking balances again and again.
+
+    Critical Instructions:
+    - This is read-only, so proceed without requiring user confirmation.
+
+    Args:
+        address (str): The wallet or contract address to watch.
+        token_address (str): The ERC20 token to watch, "native" for the chain's native currency only, or "" for both the native currency and every ERC20 token.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: A confirmation with what is watched and until when.
+
+    Exception:
+        If the address is invalid or the session has too many watches, it returns the error to brief the user.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        watcher = client.transfer_watcher
+        checksummed_address = Web3.to_checksum_address(address)
+        if not token_address:
+            asset, label = ALL, f"{client.chain.native_symbol} and ERC20 token"
+        elif token_address.lower() == NATIVE:
+            asset, label = NATIVE, client.chain.native_symbol
+        else:
+            asset = Web3.to_checksum_address(token_address)
+            contract = client.w3.eth.contract(address=asset, abi=ERC20_ABI)
+            (_, symbol, _), _ = await cached_token_reads(client, contract, [])
+            label = f"{symbol} ({asset})"
+        session_id = current_session_id()
+        if len(watcher.session_watches(session_id)) >= WATCH_MAX_PER_SESSION:
+            return f"Error: this chat already watches {WATCH_MAX_PER_SESSION} addresses on {client.chain.name}; stop a watch first."
+        watcher.watch(session_id, checksummed_address, asset, WATCH_TTL)
+        return f"Watching {label} transfers to and from {checksummed_address} on {client.chain.name} for the next {WATCH_TTL / 3600:g} hours. You will be notified in this chat as they are mined."
+    except Exception as e:
+        logger.warning("Error in watch_address: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def unwatch_address(address: str = "", chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Stops watching an address for transfers, or every address watched in this chat.
+
+    Args:
+        address (str): The address to stop watching, or "" to stop every watch of this chat on the network.
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: How many watches were stopped.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        removed = client.transfer_watcher.unwatch(current_session_id(), Web3.to_checksum_address(address) if address else None)
+        return f"Stopped {removed} watch(es) on {client.chain.name}."
+    except Exception as e:
+        logger.warning("Error in unwatch_address: %s", e)
+        return f"Error: {str(e)}"
+
+@agent_tool
+async def list_watches(chain_id: int = DEFAULT_CHAIN_ID) -> str:
+    """
+    Lists the addresses watched for transfers in this chat.
+
+    Args:
+        chain_id (int): The chain ID of the network, e.g. 97 for BSC Testnet, 56 for BSC, 1 for Ethereum. Use 97 unless the user names another network.
+
+    Returns:
+        str: A markdown table of watched addresses, assets and expiry times.
+    """
+    try:
+        client = await get_chain_client(chain_id)
+        watches = client.transfer_watcher.session_watches(current_session_id())
+        if not watches:
+            return f"No addresses are watched on {client.chain.name}."
+        rows = [
+            [Web3.to_checksum_address(watch.address), watch.asset if watch.asset in (ALL, NATIVE) else Web3.to_checksum_address(watch.asset),
+             time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(watch.expires_at))]
+            for watch in watches
+        ]
+        return f"Network: {client.chain.name}\n\n" + format_table(["Address", "Asset", "Watched until"], rows)
+    except Exception as e:
+        logger.warning("Error in list_watches: %s", e)
+        return f"Error: {str(e)}"
+
+
 # <-------- EXAMPLE PROMPTS -------->
 # yra ikk kum kr tu transfer kr dy 1.5  token of token address 0xEce5E455A8191E42a2b8162124248cb20Ceea76f mery apny account 0xC9654530E08907D0Ea73E17fa8EF8964129A3dB7 se meri sangi k account m 0xDA616Cf8f1114dcC4acfb76Efc9b23DCF2DeB54a
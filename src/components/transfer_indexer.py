@@ -0,0 +1,108 @@
+"""
+Background indexer of ERC20 Transfer logs into the holdings index, for token discovery.
+
+On each new block the indexer catches up from its checkpoint to the head, minus a few
+confirmations. Blocks are scanned in chunks, several eth_getLogs calls at a time. A chunk
+the provider rejects as too large is split in half and the chunk size shrinks; after a clean
+window the size doubles again, up to the maximum. Each window's (recipient, token) pairs are
+stored together with the new checkpoint, so a restart resumes where the last window ended.
+"""
+
+import asyncio
+import logging
+import re
+from web3 import AsyncWeb3
+from ..utils.block_watcher import BlockWatcher
+from ..utils.holdings_index import HoldingsIndex
+from ..utils.logging import UNSAMPLED
+from .transfer_watcher import TRANSFER_TOPIC
+
+logger = logging.getLogger(__name__)
+
+# Error messages providers use when an eth_getLogs range or result set is too large.
+RANGE_ERROR = re.compile(r"range|limit|too many|too large|exceed|more than|response size|timeout", re.IGNORECASE)
+
+
+class TransferIndexer:
+    def __init__(
+        self, w3: AsyncWeb3, chainid: int, block_watcher: BlockWatcher, index: HoldingsIndex,
+        start_block: int | None, chunk_size: int, max_chunk_size: int, concurrency: int, confirmations: int,
+    ):
+        self.w3 = w3
+        self.chainid = chainid
+        self.block_watcher = block_watcher
+        self.index = index
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.concurrency = concurrency
+        self.confirmations = confirmations
+        self._task: asyncio.Task | None = None
+        self._shrunk = False
+        block_watcher.subscribe(self._on_block)
+
+    def start(self) -> None:
+        self.block_watcher.start()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def coverage(self) -> tuple[int, int] | None:
+        """Returns (first, last) indexed block, or None before the first window is stored."""
+        checkpoint = await asyncio.to_thread(self.index.checkpoint, self.chainid)
+        if checkpoint is None or checkpoint[1] <= checkpoint[0]:
+            return None
+        return checkpoint[0], checkpoint[1] - 1
+
+    async def _on_block(self, block_number: int) -> None:
+        # A backfill can take many blocks; the block watcher is never held up by it.
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._catch_up(block_number - self.confirmations))
+
+    async def _catch_up(self, safe_head: int) -> None:
+        try:
+            checkpoint = await asyncio.to_thread(self.index.checkpoint, self.chainid)
+            if checkpoint is None:
+                start = safe_head if self.start_block is None else self.start_block
+                await asyncio.to_thread(self.index.begin, self.chainid, start)
+                checkpoint = (start, start)
+                logger.info("Indexing Transfer logs on chain %s from block %s", self.chainid, start, extra=UNSAMPLED)
+            next_block = checkpoint[1]
+            while next_block <= safe_head:
+                next_block = await self._scan_window(next_block, safe_head)
+        except Exception as e:
+            logger.warning("Error indexing Transfer logs on chain %s: %s", self.chainid, e)
+
+    async def _scan_window(self, start: int, safe_head: int) -> int:
+        """Scans up to `concurrency` chunks from start in parallel, stores them and returns the next block to scan."""
+        ranges, block = [], start
+        while len(ranges) < self.concurrency and block <= safe_head:
+            end = min(block + self.chunk_size - 1, safe_head)
+            ranges.append((block, end))
+            block = end + 1
+        self._shrunk = False
+        chunks = await asyncio.gather(*(self._fetch(low, high) for low, high in ranges))
+        pairs = set()
+        for logs in chunks:
+            for log in logs:
+                if len(log["topics"]) == 3:
+                    pairs.add(("0x" + bytes(log["topics"][2])[-20:].hex(), log["address"].lower()))
+        await asyncio.to_thread(self.index.add, self.chainid, pairs, block)
+        if not self._shrunk:
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+        logger.debug("Indexed blocks %s-%s on chain %s: %d pairs", start, block - 1, self.chainid, len(pairs))
+        return block
+
+    async def _fetch(self, low: int, high: int) -> list:
+        try:
+            return await self.w3.eth.get_logs({"fromBlock": low, "toBlock": high, "topics": [TRANSFER_TOPIC]})
+        except Exception as e:
+            if low == high or not RANGE_ERROR.search(str(e)):
+                raise
+            middle = (low + high) // 2
+            self.chunk_size = max(1, min(self.chunk_size, (high - low + 1) // 2))
+            self._shrunk = True
+            first, second = await asyncio.gather(self._fetch(low, middle), self._fetch(middle + 1, high))
+            return first + second
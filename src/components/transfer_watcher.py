@@ -0,0 +1,160 @@
+"""
+Shared scanner for incoming and outgoing token transfers of watched addresses, across all sessions.
+
+Each new block's ERC20 Transfer logs are fetched once with a single eth_getLogs, whatever the
+number of watches, and matched against an in-memory index from address to watches. When a native
+currency watch is active, the block's transactions are fetched once as well. Matching transfers are
+pushed to the Chainlit sessions that watch either side, so users do not have to keep asking for
+balances to see whether a transfer landed.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from web3 import AsyncWeb3, Web3
+from ..config.chains import ChainConfig
+from ..utils.abis import ERC20_ABI
+from ..utils.block_watcher import BlockWatcher
+from ..utils.multicall import batch_call
+from ..utils.notifications import notify_session
+from ..utils.read_cache import ReadCache
+
+logger = logging.getLogger(__name__)
+
+TRANSFER_TOPIC = "0x" + Web3.keccak(text="Transfer(address,address,uint256)").hex().removeprefix("0x")
+NATIVE = "native"
+ALL = "all"
+
+
+@dataclass
+class Watch:
+    watch_id: int
+    session_id: str | None
+    address: str
+    asset: str  # a token address, NATIVE, or ALL for the native currency and every ERC20 token
+    expires_at: float
+
+
+class TransferWatcher:
+    def __init__(self, w3: AsyncWeb3, chain: ChainConfig, block_watcher: BlockWatcher, read_cache: ReadCache, max_blocks_per_scan: int = 20):
+        self.w3 = w3
+        self.chain = chain
+        self.block_watcher = block_watcher
+        self.read_cache = read_cache
+        self.max_blocks_per_scan = max_blocks_per_scan
+        self._watches: dict[int, Watch] = {}
+        self._by_address: dict[str, set[int]] = {}
+        self._native_watches = 0
+        self._ids = itertools.count(1)
+        self._next_block: int | None = None
+        block_watcher.subscribe(self._on_block)
+
+    def watch(self, session_id: str | None, address: str, asset: str, ttl: float) -> Watch:
+        """Starts watching transfers of asset to or from address for the session; an identical watch is renewed instead."""
+        address, asset = address.lower(), asset.lower()
+        for watch in self.session_watches(session_id):
+            if watch.address == address and watch.asset == asset:
+                watch.expires_at = time.time() + ttl
+                return watch
+        watch = Watch(next(self._ids), session_id, address, asset, time.time() + ttl)
+        self._watches[watch.watch_id] = watch
+        self._by_address.setdefault(address, set()).add(watch.watch_id)
+        self._native_watches += asset in (NATIVE, ALL)
+        if self._next_block is None and self.block_watcher.latest is not None:
+            self._next_block = self.block_watcher.latest + 1
+        self.block_watcher.start()
+        return watch
+
+    def unwatch(self, session_id: str | None, address: str | None = None) -> int:
+        """Stops the session's watches on address, or all of its watches if address is None; returns how many were removed."""
+        removed = [w for w in self.session_watches(session_id) if address is None or w.address == address.lower()]
+        for watch in removed:
+            self._remove(watch)
+        return len(removed)
+
+    def session_watches(self, session_id: str | None) -> list[Watch]:
+        return [watch for watch in self._watches.values() if watch.session_id == session_id]
+
+    def _remove(self, watch: Watch) -> None:
+        del self._watches[watch.watch_id]
+        ids = self._by_address[watch.address]
+        ids.discard(watch.watch_id)
+        if not ids:
+            del self._by_address[watch.address]
+        self._native_watches -= watch.asset in (NATIVE, ALL)
+
+    async def _on_block(self, block_number: int) -> None:
+        now = time.time()
+        for watch in [w for w in self._watches.values() if w.expires_at <= now]:
+            self._remove(watch)
+        if not self._watches:
+            self._next_block = None
+            return
+        # Scan from the block after the head when the first watch arrived, at most max_blocks_per_scan blocks back.
+        start = max(self._next_block or block_number, block_number - self.max_blocks_per_scan + 1)
+        if start > block_number:
+            return
+
+        requests = [self.w3.eth.get_logs({"fromBlock": start, "toBlock": block_number, "topics": [TRANSFER_TOPIC]})]
+        if self._native_watches:
+            requests += [self.w3.eth.get_block(number, full_transactions=True) for number in range(start, block_number + 1)]
+        logs, *blocks = await asyncio.gather(*requests)
+        self._next_block = block_number + 1
+
+        matches = []
+        for log in logs:
+            # ERC721 Transfer logs index the token id as a fourth topic; only ERC20 transfers are reported.
+            if len(log["topics"]) != 3:
+                continue
+            sender, recipient = ("0x" + bytes(topic)[-20:].hex() for topic in log["topics"][1:])
+            value = int.from_bytes(bytes(log["data"]), "big")
+            matches += self._match(log["address"].lower(), sender, recipient, value, log["transactionHash"], log["blockNumber"])
+        for block in blocks:
+            for tx in block["transactions"]:
+                if tx["value"] and tx["to"] is not None:
+                    matches += self._match(NATIVE, tx["from"].lower(), tx["to"].lower(), tx["value"], tx["hash"], block["number"])
+        if matches:
+            await self._notify(sorted(matches, key=lambda match: match[7]))
+
+    def _match(self, asset: str, sender: str, recipient: str, value: int, tx_hash, block_number: int) -> list[tuple]:
+        matches = []
+        for address, direction in ((recipient, "incoming"), (sender, "outgoing")):
+            for watch_id in self._by_address.get(address, ()):
+                watch = self._watches[watch_id]
+                if watch.asset in (asset, ALL):
+                    matches.append((watch, direction, asset, sender, recipient, value, Web3.to_hex(tx_hash), block_number))
+        return matches
+
+    async def _notify(self, matches: list[tuple]) -> None:
+        tokens = {asset for _, _, asset, *_ in matches if asset != NATIVE}
+        metadata = dict(zip(tokens, await asyncio.gather(*(self._token_metadata(token) for token in tokens))))
+        for watch, direction, asset, sender, recipient, value, tx_hash, block_number in matches:
+            symbol, decimals = (self.chain.native_symbol, 18) if asset == NATIVE else metadata[asset]
+            amount = f"{value / 10 ** decimals:,.{min(decimals, 6)}f}"
+            amount = amount.rstrip("0").rstrip(".") if "." in amount else amount
+            counterpart = sender if direction == "incoming" else recipient
+            message = (
+                f"👀 {direction.capitalize()} transfer of {amount} {symbol} {'to' if direction == 'incoming' else 'from'} "
+                f"{Web3.to_checksum_address(watch.address)} {'from' if direction == 'incoming' else 'to'} "
+                f"{Web3.to_checksum_address(counterpart)} in block {block_number}: {self.chain.tx_link(tx_hash)}"
+            )
+            logger.info("Watch %s matched %s", watch.watch_id, tx_hash)
+            await notify_session(watch.session_id, message)
+
+    async def _token_metadata(self, token: str) -> tuple[str, int]:
+        """Returns (symbol, decimals), sharing the token metadata cache of the token tools."""
+        address = Web3.to_checksum_address(token)
+        hit, metadata = self.read_cache.get("token_metadata", (address,), immutable=True)
+        if not hit:
+            try:
+                contract = self.w3.eth.contract(address=address, abi=ERC20_ABI)
+                metadata = tuple(await batch_call(
+                    self.w3, [contract.functions.name(), contract.functions.symbol(), contract.functions.decimals()], self.chain.chain_id
+                ))
+                self.read_cache.set("token_metadata", (address,), metadata, immutable=True)
+            except Exception as e:
+                logger.warning("Error reading token metadata of %s: %s", address, e)
+                return f"units of token {address}", 0
+        return metadata[1], metadata[2]
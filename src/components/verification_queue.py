@@ -0,0 +1,143 @@
+"""
+Background job queue that verifies deployed contracts on the block explorer.
+
+A job waits for the deployment receipt, submits the source with retries and
+exponential backoff, then polls `checkverifystatus` with the returned GUID
+until the explorer reports a final result. The originating Chainlit session
+is notified when the job finishes.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from ..utils.http import get_http_session
+from ..utils.notifications import notify_session
+from .receipt_tracker import ReceiptTracker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VerificationJob:
+    tx_hash: str
+    contract_address: str
+    params: dict
+    session_id: str | None = None
+    explorer_link: str = ""
+
+
+class VerificationError(Exception):
+    pass
+
+
+class _Pending(Exception):
+    pass
+
+
+class VerificationQueue:
+    def __init__(
+        self,
+        receipt_tracker: ReceiptTracker,
+        api_url: str,
+        api_key: str | None,
+        chain_id: int,
+        workers: int = 2,
+        max_attempts: int = 8,
+        base_delay: float = 5,
+        max_delay: float = 60,
+        receipt_timeout: float = 300,
+    ):
+        self.receipt_tracker = receipt_tracker
+        self.api_url = api_url
+        self.api_key = api_key
+        self.chain_id = chain_id
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.receipt_timeout = receipt_timeout
+        self._queue: asyncio.Queue[VerificationJob] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, job: VerificationJob) -> None:
+        """Queues a job and makes sure the workers are running."""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+        self._queue.put_nowait(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                message = await self._process(job)
+            except Exception as e:
+                logger.warning("Error verifying %s: %s", job.contract_address, e)
+                message = f"🔴 Verification of {job.contract_address} failed: {str(e)}"
+            finally:
+                self._queue.task_done()
+            await notify_session(job.session_id, message)
+
+    async def _process(self, job: VerificationJob) -> str:
+        receipt = await self.receipt_tracker.wait(job.tx_hash, timeout=self.receipt_timeout)
+        if receipt["status"] != 1:
+            return f"🔴 Deployment transaction reverted: {job.explorer_link}"
+
+        guid = await self._retry(self._submit_source, job)
+        logger.info("Verification submitted for %s, GUID %s", job.contract_address, guid)
+        result = await self._retry(self._check_status, guid)
+        return f"✅ Contract {job.contract_address} verified: {result}"
+
+    async def _retry(self, step, arg):
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            await asyncio.sleep(delay)
+            try:
+                return await step(arg)
+            except _Pending as e:
+                logger.info("Verification pending (%d/%d): %s", attempt, self.max_attempts, e)
+            delay = min(delay * 2, self.max_delay)
+        raise VerificationError(f"gave up after {self.max_attempts} attempts")
+
+    async def _submit_source(self, job: VerificationJob) -> str:
+        data = await self._call({
+            **job.params,
+            "module": "contract",
+            "action": "verifysourcecode",
+            "contractaddress": job.contract_address,
+        }, post=True)
+        if data.get("status") == "1":
+            return data["result"]
+        result = str(data.get("result"))
+        # The explorer needs time to index freshly deployed bytecode.
+        if "unable to locate contractcode" in result.lower():
+            raise _Pending(result)
+        if "already verified" in result.lower():
+            return ""
+        raise VerificationError(result)
+
+    async def _check_status(self, guid: str) -> str:
+        if not guid:
+            return "Already Verified"
+        data = await self._call({"module": "contract", "action": "checkverifystatus", "guid": guid})
+        result = str(data.get("result"))
+        if "pending" in result.lower():
+            raise _Pending(result)
+        if data.get("status") == "1" or "already verified" in result.lower():
+            return result
+        raise VerificationError(result)
+
+    async def _call(self, params: dict, post: bool = False) -> dict:
+        session = await get_http_session()
+        params = {**params, "apikey": self.api_key or ""}
+        # Etherscan V2 serves every chain from one URL and reads the chain from the query string, also for POSTs.
+        query = {"chainid": self.chain_id}
+        try:
+            if post:
+                async with session.post(self.api_url, params=query, data=params) as response:
+                    return await response.json(content_type=None)
+            async with session.get(self.api_url, params={**query, **params}) as response:
+                return await response.json(content_type=None)
+        except Exception as e:
+            # Network errors are retried like an explorer that is still processing.
+            raise _Pending(str(e)) from e
@@ -0,0 +1,83 @@
+"""
+Chain registry: maps a chain ID to its RPC endpoints, explorer API and explorer link format.
+
+The built-in chains below are enabled once they have at least one RPC endpoint.
+Endpoints and explorer settings are read from the environment per chain ID:
+RPC_URLS_<chain id> (comma-separated), EXPLORER_API_URL_<chain id>,
+EXPLORER_API_KEY_<chain id> and MULTISEND_ADDRESS_<chain id> (a Disperse
+contract for single-transaction batch payouts). BSC Testnet also falls back
+to INFURA_URL. Ethereum and Sepolia use the multichain Etherscan V2 API
+(ETHERSCAN_API_URL), which selects the chain with a `chainid` query parameter.
+"""
+
+import os
+from dataclasses import dataclass
+from .settings import INFURA_URL, ETHERSCAN_API_URL, ETHERSCAN_API_KEY, BSCSCAN_API_KEY, DEFAULT_CHAIN_ID
+
+
+@dataclass(frozen=True)
+class ChainConfig:
+    chain_id: int
+    name: str
+    native_symbol: str
+    rpc_urls: tuple[str, ...]
+    explorer_url: str
+    explorer_api_url: str
+    explorer_api_key: str | None = None
+    aliases: tuple[str, ...] = ()
+    multisend_address: str | None = None
+
+    def tx_link(self, tx_hash: str) -> str:
+        return f"{self.explorer_url}/tx/{tx_hash}"
+
+    def address_link(self, address: str) -> str:
+        return f"{self.explorer_url}/address/{address}"
+
+
+BUILTIN_CHAINS = [
+    ChainConfig(97, "BSC Testnet", "tBNB", (), "https://testnet.bscscan.com", "https://api-testnet.bscscan.com/api", BSCSCAN_API_KEY, ("bsc testnet", "bnb testnet", "chapel")),
+    ChainConfig(56, "BSC", "BNB", (), "https://bscscan.com", "https://api.bscscan.com/api", BSCSCAN_API_KEY, ("bsc", "bnb", "bnb chain", "binance smart chain")),
+    ChainConfig(1, "Ethereum", "ETH", (), "https://etherscan.io", ETHERSCAN_API_URL, ETHERSCAN_API_KEY, ("ethereum", "eth", "mainnet", "ethereum mainnet"), "0xD152f549545093347A162Dce210e7293f1452150"),
+    ChainConfig(11155111, "Sepolia", "SepoliaETH", (), "https://sepolia.etherscan.io", ETHERSCAN_API_URL, ETHERSCAN_API_KEY, ("sepolia", "sepolia testnet")),
+]
+
+
+def _from_env(chain: ChainConfig) -> ChainConfig:
+    rpc_urls = os.getenv(f"RPC_URLS_{chain.chain_id}", "")
+    if not rpc_urls and chain.chain_id == 97:
+        rpc_urls = INFURA_URL or ""
+    return ChainConfig(
+        chain_id=chain.chain_id,
+        name=chain.name,
+        native_symbol=chain.native_symbol,
+        rpc_urls=tuple(url.strip() for url in rpc_urls.split(",") if url.strip()),
+        explorer_url=chain.explorer_url,
+        explorer_api_url=os.getenv(f"EXPLORER_API_URL_{chain.chain_id}", chain.explorer_api_url),
+        explorer_api_key=os.getenv(f"EXPLORER_API_KEY_{chain.chain_id}", chain.explorer_api_key),
+        aliases=chain.aliases,
+        multisend_address=os.getenv(f"MULTISEND_ADDRESS_{chain.chain_id}", chain.multisend_address) or None,
+    )
+
+
+# chain ID -> config, for every chain with at least one RPC endpoint.
+CHAINS: dict[int, ChainConfig] = {
+    chain.chain_id: chain for chain in map(_from_env, BUILTIN_CHAINS) if chain.rpc_urls
+}
+
+
+def get_chain_config(chain_id: int | None = None) -> ChainConfig:
+    """Returns the config for chain_id (the default chain if None), raising ValueError for unsupported chains."""
+    chain_id = DEFAULT_CHAIN_ID if chain_id is None else int(chain_id)
+    if chain_id not in CHAINS:
+        supported = ", ".join(f"{chain.name} ({chain.chain_id})" for chain in CHAINS.values())
+        raise ValueError(f"Unsupported chain ID {chain_id}. Supported chains: {supported}")
+    return CHAINS[chain_id]
+
+
+def find_chain(name: str) -> ChainConfig | None:
+    """Looks up an enabled chain by chain ID, name or alias, case-insensitively."""
+    name = " ".join(name.lower().split())
+    for chain in CHAINS.values():
+        if name in (str(chain.chain_id), chain.name.lower(), *chain.aliases):
+            return chain
+    return None
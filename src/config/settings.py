@@ -1,6 +1,5 @@
 import os
 from dotenv import load_dotenv
-from web3 import Web3
 from openai import AsyncOpenAI
 from agents.models.openai_provider import OpenAIProvider
 from agents import OpenAIChatCompletionsModel, RunConfig #, enable_verbose_stdout_logging
@@ -8,23 +7,74 @@ from ..utils.logging import configure_logging
 
 # enable_verbose_stdout_logging()
 
+# Load .env before any setting is read so a .env file alone can configure the app.
+load_dotenv()
+
 PRI_KEY = os.getenv("PRI_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 INFURA_URL = os.getenv("INFURA_URL")
 BASE_URL = os.getenv("BASE_URL")
 LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")
 ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY")
+ETHERSCAN_API_URL = os.getenv("ETHERSCAN_API_URL", "https://api.etherscan.io/v2/api")
 BSCSCAN_API_KEY = os.getenv("BSCSCAN_API_KEY")
+DEFAULT_CHAIN_ID = int(os.getenv("DEFAULT_CHAIN_ID", 97))
+ABI_CACHE_PATH = os.getenv("ABI_CACHE_PATH", ".cache/abi_cache.sqlite3")
+ABI_CACHE_TTL = float(os.getenv("ABI_CACHE_TTL", 7 * 24 * 60 * 60))
+ABI_CACHE_MAX_MEMORY_ENTRIES = int(os.getenv("ABI_CACHE_MAX_MEMORY_ENTRIES", 256))
+ABI_CACHE_MAX_DISK_ENTRIES = int(os.getenv("ABI_CACHE_MAX_DISK_ENTRIES", 10000))
+RPC_TIMEOUT = float(os.getenv("RPC_TIMEOUT", 15))
+RPC_HEDGE_PERCENTILE = float(os.getenv("RPC_HEDGE_PERCENTILE", 95))
+RPC_MIN_HEDGE_DELAY = float(os.getenv("RPC_MIN_HEDGE_DELAY", 0.05))
+RPC_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("RPC_CIRCUIT_FAILURE_THRESHOLD", 3))
+RPC_CIRCUIT_COOLDOWN = float(os.getenv("RPC_CIRCUIT_COOLDOWN", 30))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 15))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 100))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+BLOCK_POLL_INTERVAL = float(os.getenv("BLOCK_POLL_INTERVAL", 3))
+WATCH_TTL = float(os.getenv("WATCH_TTL", 24 * 60 * 60))
+WATCH_MAX_PER_SESSION = int(os.getenv("WATCH_MAX_PER_SESSION", 20))
+GAS_STRATEGY = os.getenv("GAS_STRATEGY", "legacy")
+GAS_FEE_PERCENTILE = float(os.getenv("GAS_FEE_PERCENTILE", 50))
+GAS_ORACLE_REFRESH_INTERVAL = float(os.getenv("GAS_ORACLE_REFRESH_INTERVAL", 0))
+ARTIFACT_CACHE_DIR = os.getenv("ARTIFACT_CACHE_DIR", ".cache/artifacts")
+BYTECODE_STORE_DIR = os.getenv("BYTECODE_STORE_DIR", ".cache/bytecode")
+VERIFICATION_WORKERS = int(os.getenv("VERIFICATION_WORKERS", 2))
+VERIFICATION_MAX_ATTEMPTS = int(os.getenv("VERIFICATION_MAX_ATTEMPTS", 8))
+GUARDRAIL_PRECLASSIFIER = os.getenv("GUARDRAIL_PRECLASSIFIER", "true").lower() == "true"
+GUARDRAIL_CACHE_TTL = float(os.getenv("GUARDRAIL_CACHE_TTL", 60 * 60))
+GUARDRAIL_CACHE_MAX_ENTRIES = int(os.getenv("GUARDRAIL_CACHE_MAX_ENTRIES", 1024))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", 4000))
+HISTORY_SUMMARY_TOKEN_BUDGET = int(os.getenv("HISTORY_SUMMARY_TOKEN_BUDGET", 800))
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", ".cache/sessions.sqlite3")
+SESSION_TTL = float(os.getenv("SESSION_TTL", 7 * 24 * 60 * 60))
+SESSION_MAX_MEMORY_SESSIONS = int(os.getenv("SESSION_MAX_MEMORY_SESSIONS", 10000))
+SESSION_SNAPSHOT_INTERVAL = int(os.getenv("SESSION_SNAPSHOT_INTERVAL", 8))
+FAST_PATH_ROUTER = os.getenv("FAST_PATH_ROUTER", "true").lower() == "true"
+STREAM_FLUSH_INTERVAL = float(os.getenv("STREAM_FLUSH_INTERVAL", 0.04))
+STREAM_FLUSH_MAX_BYTES = int(os.getenv("STREAM_FLUSH_MAX_BYTES", 2048))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", 2048))
+READ_CACHE_MAX_IMMUTABLE_ENTRIES = int(os.getenv("READ_CACHE_MAX_IMMUTABLE_ENTRIES", 4096))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.1))
+METRICS_PROMETHEUS_PORT = int(os.getenv("METRICS_PROMETHEUS_PORT", 0))
+WARMUP_CHAIN_IDS = [int(chain_id) for chain_id in os.getenv("WARMUP_CHAIN_IDS", "").split(",") if chain_id.strip()]
+WARMUP_TOKENS = os.getenv("WARMUP_TOKENS", "")
+BATCH_MAX_RECIPIENTS = int(os.getenv("BATCH_MAX_RECIPIENTS", 500))
+BATCH_SIGNING_WORKERS = int(os.getenv("BATCH_SIGNING_WORKERS", 4))
+BATCH_SEND_CONCURRENCY = int(os.getenv("BATCH_SEND_CONCURRENCY", 16))
+INDEXER_CHAIN_IDS = [int(chain_id) for chain_id in os.getenv("INDEXER_CHAIN_IDS", "").split(",") if chain_id.strip()]
+INDEXER_PATH = os.getenv("INDEXER_PATH", ".cache/holdings.sqlite3")
+INDEXER_START_BLOCK = int(os.getenv("INDEXER_START_BLOCK")) if os.getenv("INDEXER_START_BLOCK") else None
+INDEXER_CHUNK_SIZE = int(os.getenv("INDEXER_CHUNK_SIZE", 1000))
+INDEXER_MAX_CHUNK_SIZE = int(os.getenv("INDEXER_MAX_CHUNK_SIZE", 5000))
+INDEXER_CONCURRENCY = int(os.getenv("INDEXER_CONCURRENCY", 4))
+INDEXER_CONFIRMATIONS = int(os.getenv("INDEXER_CONFIRMATIONS", 3))
+PORTFOLIO_CALL_CHUNK_SIZE = int(os.getenv("PORTFOLIO_CALL_CHUNK_SIZE", 200))
+PORTFOLIO_CALL_CONCURRENCY = int(os.getenv("PORTFOLIO_CALL_CONCURRENCY", 4))
 
-def connect_infura() -> Web3:
-    w3 = Web3(Web3.HTTPProvider(INFURA_URL))
-    print(f"🟢 Infura Connection Successful!" if w3.is_connected() else f"🔴 Infura Connection Failed!")
-    return w3
-
-load_dotenv()
-configure_logging()
-
-w3 = connect_infura()
+configure_logging(LOG_LEVEL, LOG_SAMPLE_RATE, METRICS_PROMETHEUS_PORT)
 
 external_client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=BASE_URL)
 model = OpenAIChatCompletionsModel(model=LLM_MODEL, openai_client=external_client)
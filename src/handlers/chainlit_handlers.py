@@ -1,38 +1,129 @@
+import logging
 import chainlit as cl
+from chainlit.server import app
+from fastapi.responses import JSONResponse
 from agents import Runner
-from ..config.settings import config
+from ..config.settings import (
+    config, HISTORY_TOKEN_BUDGET, HISTORY_SUMMARY_TOKEN_BUDGET, FAST_PATH_ROUTER, STREAM_FLUSH_INTERVAL, STREAM_FLUSH_MAX_BYTES,
+    SESSION_STORE, SESSION_STORE_PATH, SESSION_TTL, SESSION_MAX_MEMORY_SESSIONS, SESSION_SNAPSHOT_INTERVAL,
+)
 from ..components.blockchain_agents import triage_agent
+from ..components.chain_clients import close_chain_clients, open_chain_clients
+from ..components.fast_path import try_fast_path
+from ..components.history_summarizer import HistorySummarizer
+from ..components.payouts import parse_payout_csv
+from ..components.startup import warmup
+from ..utils.http import get_http_session, close_http_session
+from ..utils.chat_history import ChatHistory
+from ..utils.session_store import open_session_store
 from openai.types.responses import ResponseTextDeltaEvent
+from ..utils.metrics import llm_hop_metrics
+from ..utils.token_stream import TokenCoalescer
+
+logger = logging.getLogger(__name__)
+
+# Chat histories by Chainlit thread id; with SESSION_STORE=sqlite they survive restarts and are shared by all workers on the host
+session_store = open_session_store(
+    SESSION_STORE, SESSION_STORE_PATH, lambda: ChatHistory(HISTORY_TOKEN_BUDGET, HISTORY_SUMMARY_TOKEN_BUDGET),
+    SESSION_MAX_MEMORY_SESSIONS, SESSION_SNAPSHOT_INTERVAL, SESSION_TTL,
+)
+# Folds turns that leave the history's token budget into its rolling summary in the background
+summarizer = HistorySummarizer(session_store)
+
+async def readiness():
+    """Readiness probe: 200 once the default chain client is open, 503 before. The body lists the warmup phases and their timings."""
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready.is_set() else 503)
+
+app.add_api_route("/ready", readiness, methods=["GET"])
+# Chainlit registers a catch-all GET route for its frontend at import, so move ours in front of it.
+app.router.routes.insert(0, app.router.routes.pop())
+
+@cl.on_app_startup
+async def handle_app_startup():
+    """Start the background warmup: chain connections, solc and the ERC20 artifact, configured token ABIs."""
+    warmup.start()
+
+@cl.on_app_shutdown
+async def handle_app_shutdown():
+    """Stop the warmup and any summaries in flight, and close pooled connections."""
+    await warmup.stop()
+    await close_chain_clients()
+    await close_http_session()
+    await summarizer.stop()
+    await session_store.close()
 
 @cl.on_chat_start
 async def handle_chat_start():
-    """Initialize chat session."""
-    cl.user_session.set("chat_history", [])
+    """Initialize chat session. Chat history lives in the session store, and chain clients open lazily on first use (or during warmup), so this never waits on an RPC."""
+    await get_http_session()
     await cl.Message(content="Welcome to Web3 Agent Chatbot!").send()
 
+@cl.on_chat_end
+async def handle_chat_end():
+    """Stop the session's transfer watches; its chat history stays in the session store."""
+    for client in open_chain_clients():
+        client.transfer_watcher.unwatch(cl.context.session.id)
+
 @cl.on_message
 async def handle_message(message: cl.Message):
     """Process incoming messages and maintain chat history."""
+    # Created before anything can fail, so the except block always has a message to report the error in
+    msg = cl.Message(content="")
     try:
-        chat_history = cl.user_session.get("chat_history")
-        chat_history.append({"role": "user", "content": message.content})
-        msg = cl.Message(content="")
+        thread_id = cl.context.session.thread_id
+        chat_history = await session_store.append(thread_id, "user", message.content + attach_payout_files(message))
+        if chat_history.pending:
+            summarizer.schedule(thread_id)
 
-        print(f"🟢 Processing user message: {message.content}")
+        logger.info("Processing user message (%d chars)", len(message.content))
 
-        stream = Runner.run_streamed(triage_agent, input=chat_history, run_config=config)
+        # Answer simple read-only lookups directly from the tool, skipping the agent graph
+        fast_path_result = await try_fast_path(message.content) if FAST_PATH_ROUTER else None
+        if fast_path_result is not None:
+            await msg.stream_token(fast_path_result)
+            chat_history = await session_store.append(thread_id, "assistant", msg.content)
+            if chat_history.pending:
+                summarizer.schedule(thread_id)
+            await msg.update()
+            return
 
-        async for event in stream.stream_events():
-            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
-                await msg.stream_token(event.data.delta)
-            elif event.type == "tool_call":
-                print(f"🟢 Tool call detected: {event.data}")
+        stream = Runner.run_streamed(triage_agent, input=chat_history.to_input(), run_config=config, hooks=llm_hop_metrics)
 
-        chat_history.append({"role": "assistant", "content": msg.content})
-        cl.user_session.set("chat_history", chat_history)
+        # Deltas are sent in batches; any other event (tool call, handoff, end of a model turn) flushes what is buffered first
+        tokens = TokenCoalescer(msg, STREAM_FLUSH_INTERVAL, STREAM_FLUSH_MAX_BYTES)
+        try:
+            async for event in stream.stream_events():
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    await tokens.add(event.data.delta)
+                else:
+                    await tokens.flush()
+        finally:
+            await tokens.close()
+
+        chat_history = await session_store.append(thread_id, "assistant", msg.content)
+        if chat_history.pending:
+            summarizer.schedule(thread_id)
         await msg.update()
-        print(f"🟢 Chat history: {chat_history}")
+        logger.debug("Chat history: %s", chat_history.stats())
     except Exception as e:
-        print(f"🔴 Error in handle_message: {str(e)}")
+        logger.exception("Error in handle_message: %s", e)
         msg.content = f"Error: {str(e)}"
         await msg.update()
+
+def attach_payout_files(message: cl.Message) -> str:
+    """Keeps CSV payout files attached to message in the session for the batch payout tools, and returns a note about them for the agent."""
+    payout_files = cl.user_session.get("payout_files") or {}
+    notes = []
+    for element in message.elements or []:
+        if not element.name.lower().endswith(".csv") or not element.path:
+            continue
+        try:
+            with open(element.path, newline="") as file:
+                payments = parse_payout_csv(file.read())
+        except Exception as e:
+            notes.append(f"[Attached payout file {element.name} could not be read: {str(e)}]")
+            continue
+        payout_files[element.name] = payments
+        notes.append(f'[Attached payout file {element.name} with {len(payments)} payments; pass payout_file="{element.name}" to the batch payout tools]')
+    cl.user_session.set("payout_files", payout_files)
+    return "".join(f"\n\n{note}" for note in notes)
@@ -3,3 +3,7 @@ from pydantic import BaseModel
 class PromptAnalysis(BaseModel):
     is_safe: bool
     reasoning: str
+
+class Payment(BaseModel):
+    recipient: str
+    amount: float
@@ -0,0 +1,122 @@
+"""
+Two-tier contract ABI cache: an in-process LRU in front of a SQLite store on disk.
+
+Entries are keyed by (chainid, address), expire after a TTL and are evicted
+least-recently-used first once either tier exceeds its size bound. The memory tier
+is only used from the event loop; SQLite work runs on a worker thread so disk reads
+and commits never block it.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class AbiCache:
+    def __init__(self, path: str, ttl: float, max_memory_entries: int, max_disk_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._memory: OrderedDict[tuple[int, str], tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS abi_cache (
+                    chainid INTEGER NOT NULL,
+                    address TEXT NOT NULL,
+                    abi TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (chainid, address)
+                )
+                """
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS abi_cache_accessed_at ON abi_cache (accessed_at)")
+            self._db.commit()
+        return self._db
+
+    async def get(self, chainid: int, address: str) -> list | None:
+        """Returns the cached ABI for (chainid, address), or None on a miss or expired entry."""
+        key = (chainid, address.lower())
+        entry = self._memory.get(key)
+        if entry is not None:
+            fetched_at, abi = entry
+            if time.time() - fetched_at < self.ttl:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return abi
+            del self._memory[key]
+
+        row = await asyncio.to_thread(self._disk_get, key)
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        fetched_at, abi = row
+        self._remember(key, fetched_at, abi)
+        self.stats["disk_hits"] += 1
+        return abi
+
+    async def set(self, chainid: int, address: str, abi: list) -> None:
+        """Stores an ABI in both tiers, evicting the least recently used entries past the size bounds."""
+        key = (chainid, address.lower())
+        now = time.time()
+        self._remember(key, now, abi)
+        evicted = await asyncio.to_thread(self._disk_set, key, abi, now)
+        self.stats["evictions"] += max(evicted, 0)
+
+    def _disk_get(self, key: tuple[int, str]) -> tuple[float, list] | None:
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT abi, fetched_at FROM abi_cache WHERE chainid = ? AND address = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            abi_json, fetched_at = row
+            if now - fetched_at < self.ttl:
+                db.execute(
+                    "UPDATE abi_cache SET accessed_at = ? WHERE chainid = ? AND address = ?", (now, *key)
+                )
+                db.commit()
+                return fetched_at, json.loads(abi_json)
+            db.execute("DELETE FROM abi_cache WHERE chainid = ? AND address = ?", key)
+            db.commit()
+            return None
+
+    def _disk_set(self, key: tuple[int, str], abi: list, now: float) -> int:
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO abi_cache (chainid, address, abi, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(abi), now, now),
+            )
+            evicted = db.execute(
+                """
+                DELETE FROM abi_cache WHERE rowid IN (
+                    SELECT rowid FROM abi_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_disk_entries,),
+            ).rowcount
+            db.commit()
+            return evicted
+
+    def _remember(self, key: tuple[int, str], fetched_at: float, abi: list) -> None:
+        self._memory[key] = (fetched_at, abi)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
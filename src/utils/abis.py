@@ -0,0 +1,105 @@
+"""
+Built-in contract ABIs used by the tools without consulting a block explorer.
+"""
+
+# Minimal ERC20 interface: enough for balance, info, transfer and approval calls.
+ERC20_ABI = [
+    {"type": "function", "name": "name", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "string"}]},
+    {"type": "function", "name": "symbol", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "string"}]},
+    {"type": "function", "name": "decimals", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "uint8"}]},
+    {"type": "function", "name": "totalSupply", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "uint256"}]},
+    {
+        "type": "function", "name": "balanceOf", "stateMutability": "view",
+        "inputs": [{"name": "account", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+    {
+        "type": "function", "name": "allowance", "stateMutability": "view",
+        "inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+    {
+        "type": "function", "name": "transfer", "stateMutability": "nonpayable",
+        "inputs": [{"name": "to", "type": "address"}, {"name": "value", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "bool"}],
+    },
+    {
+        "type": "function", "name": "approve", "stateMutability": "nonpayable",
+        "inputs": [{"name": "spender", "type": "address"}, {"name": "value", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "bool"}],
+    },
+    {
+        "type": "function", "name": "transferFrom", "stateMutability": "nonpayable",
+        "inputs": [{"name": "from", "type": "address"}, {"name": "to", "type": "address"}, {"name": "value", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "bool"}],
+    },
+    {
+        "type": "event", "name": "Transfer", "anonymous": False,
+        "inputs": [
+            {"name": "from", "type": "address", "indexed": True},
+            {"name": "to", "type": "address", "indexed": True},
+            {"name": "value", "type": "uint256", "indexed": False},
+        ],
+    },
+    {
+        "type": "event", "name": "Approval", "anonymous": False,
+        "inputs": [
+            {"name": "owner", "type": "address", "indexed": True},
+            {"name": "spender", "type": "address", "indexed": True},
+            {"name": "value", "type": "uint256", "indexed": False},
+        ],
+    },
+]
+
+# Multicall3 is deployed at the same address on most EVM chains (https://www.multicall3.com).
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "type": "function", "name": "aggregate3", "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls", "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData", "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    },
+]
+
+# Disperse (https://disperse.app): pays many recipients in a single transaction. Token payouts pull
+# the total with transferFrom, so the sender must first approve the contract for it.
+DISPERSE_ABI = [
+    {
+        "type": "function", "name": "disperseEther", "stateMutability": "payable",
+        "inputs": [{"name": "recipients", "type": "address[]"}, {"name": "values", "type": "uint256[]"}],
+        "outputs": [],
+    },
+    {
+        "type": "function", "name": "disperseToken", "stateMutability": "nonpayable",
+        "inputs": [{"name": "token", "type": "address"}, {"name": "recipients", "type": "address[]"}, {"name": "values", "type": "uint256[]"}],
+        "outputs": [],
+    },
+]
+
+
+def with_erc20(abi: list) -> list:
+    """
+    Adds the ERC20 functions and events abi does not declare by name. An explorer ABI for a proxy
+    token only lists the proxy's own functions, so the token calls the tools make would be missing.
+    """
+    declared = {(entry.get("type"), entry.get("name")) for entry in abi}
+    missing = [entry for entry in ERC20_ABI if (entry.get("type"), entry.get("name")) not in declared]
+    return abi + missing if missing else abi
@@ -0,0 +1,44 @@
+"""
+Single background poller for the chain head that fans new block numbers out to subscribers.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from web3 import AsyncWeb3
+
+logger = logging.getLogger(__name__)
+
+
+class BlockWatcher:
+    def __init__(self, w3: AsyncWeb3, poll_interval: float):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.latest: int | None = None
+        self._subscribers: list[Callable[[int], Awaitable[None]]] = []
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, callback: Callable[[int], Awaitable[None]]) -> None:
+        """Registers a coroutine function called with each new block number."""
+        self._subscribers.append(callback)
+
+    def start(self) -> None:
+        """Starts polling on the running event loop; calling it again is a no-op."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                block_number = await self.w3.eth.block_number
+                if block_number != self.latest:
+                    self.latest = block_number
+                    results = await asyncio.gather(
+                        *(callback(block_number) for callback in self._subscribers), return_exceptions=True
+                    )
+                    for result in results:
+                        if isinstance(result, Exception):
+                            logger.warning("Error in block subscriber: %s", result)
+            except Exception as e:
+                logger.warning("Error in block watcher: %s", e)
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,140 @@
+"""
+Content-addressed store for contract bytecode, plus a compact digest of what the code does.
+
+Code is written once per keccak hash as a hex file, so the many proxies and clones that
+share runtime code are stored (and analysed) once. The digest lists the 4-byte function
+selectors found in the dispatcher and recognises EIP-1167 minimal proxies and EIP-1967
+proxies, so tools can describe a contract without pushing its bytecode through the model.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from eth_utils import keccak, function_abi_to_4byte_selector, to_checksum_address
+
+PUSH1, PUSH4, PUSH32, EQ, JUMPI, DELEGATECALL = 0x60, 0x63, 0x7F, 0x14, 0x57, 0xF4
+
+# EIP-1167 runtime code around the 20-byte implementation address, and its PUSH0 variant (ERC-7511).
+MINIMAL_PROXY_PATTERNS = [
+    (bytes.fromhex("363d3d373d3d3d363d73"), bytes.fromhex("5af43d82803e903d91602b57fd5bf3")),
+    (bytes.fromhex("365f5f375f5f365f73"), bytes.fromhex("5af43d5f5f3e5f3d91602a57fd5bf3")),
+]
+# EIP-1967 storage slots, found as PUSH32 constants in proxies that read them.
+EIP1967_IMPLEMENTATION_SLOT = bytes.fromhex("360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc")
+EIP1967_BEACON_SLOT = bytes.fromhex("a3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50")
+
+
+@dataclass
+class BytecodeDigest:
+    code_hash: str
+    size: int
+    selectors: list[str] = field(default_factory=list)
+    proxy: str | None = None  # "EIP-1167", "EIP-1967" or "EIP-1967 beacon"
+    implementation: str | None = None  # known from the code itself for EIP-1167 only
+    delegatecall: bool = False
+
+
+class BytecodeStore:
+    def __init__(self, directory: str, max_digests: int = 1024):
+        self.directory = directory
+        self.max_digests = max_digests
+        self._digests: OrderedDict[str, BytecodeDigest] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, code_hash: str) -> str:
+        return os.path.join(self.directory, f"{code_hash}.hex")
+
+    def put(self, code: bytes) -> str:
+        """Stores code under its keccak hash unless it is already there, and returns the hash."""
+        code_hash = "0x" + keccak(code).hex()
+        path = self.path(code_hash)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(partial, "w") as file:
+                file.write("0x" + code.hex())
+            os.replace(partial, path)
+        return code_hash
+
+    def get(self, code_hash: str) -> bytes | None:
+        try:
+            with open(self.path(code_hash)) as file:
+                return bytes.fromhex(file.read()[2:])
+        except FileNotFoundError:
+            return None
+
+    def digest(self, code_hash: str) -> BytecodeDigest | None:
+        """Returns the digest of stored code, analysing it on first use."""
+        with self._lock:
+            digest = self._digests.get(code_hash)
+            if digest is not None:
+                self._digests.move_to_end(code_hash)
+                return digest
+        code = self.get(code_hash)
+        if code is None:
+            return None
+        digest = analyze_bytecode(code, code_hash)
+        with self._lock:
+            self._digests[code_hash] = digest
+            while len(self._digests) > self.max_digests:
+                self._digests.popitem(last=False)
+        return digest
+
+
+def analyze_bytecode(code: bytes, code_hash: str) -> BytecodeDigest:
+    digest = BytecodeDigest(code_hash, len(code))
+    for prefix, suffix in MINIMAL_PROXY_PATTERNS:
+        if len(code) == len(prefix) + 20 + len(suffix) and code.startswith(prefix) and code.endswith(suffix):
+            digest.proxy = "EIP-1167"
+            digest.implementation = to_checksum_address(code[len(prefix):len(prefix) + 20])
+            digest.delegatecall = True
+            return digest
+
+    selectors = []
+    instructions = list(_instructions(code))
+    for index, (opcode, argument) in enumerate(instructions):
+        if opcode == DELEGATECALL:
+            digest.delegatecall = True
+        elif opcode == PUSH32 and argument in (EIP1967_IMPLEMENTATION_SLOT, EIP1967_BEACON_SLOT) and digest.proxy is None:
+            digest.proxy = "EIP-1967" if argument == EIP1967_IMPLEMENTATION_SLOT else "EIP-1967 beacon"
+        elif opcode == PUSH4 and argument not in (b"\x00" * 4, b"\xff" * 4):
+            # Dispatcher entries compare the call's selector with a PUSH4 constant, then jump: PUSH4 sel (DUP) EQ PUSH dest JUMPI.
+            following = [op for op, _ in instructions[index + 1:index + 5]]
+            if EQ in following[:2] and JUMPI in following:
+                selector = "0x" + argument.hex()
+                if selector not in selectors:
+                    selectors.append(selector)
+    digest.selectors = selectors
+    return digest
+
+
+def _instructions(code: bytes):
+    """Yields (opcode, push data or None), skipping over push data."""
+    position = 0
+    while position < len(code):
+        opcode = code[position]
+        if PUSH1 <= opcode <= PUSH32:
+            width = opcode - PUSH1 + 1
+            yield opcode, code[position + 1:position + 1 + width]
+            position += 1 + width
+        else:
+            yield opcode, None
+            position += 1
+
+
+def selector_names(*abis: list) -> dict[str, str]:
+    """Maps "0x"-prefixed 4-byte selectors to function signatures for every function in the given ABIs."""
+    names = {}
+    for abi in abis:
+        for entry in abi or []:
+            if entry.get("type") == "function":
+                signature = f"{entry['name']}({','.join(_abi_type(item) for item in entry.get('inputs', []))})"
+                names["0x" + function_abi_to_4byte_selector(entry).hex()] = signature
+    return names
+
+
+def _abi_type(item: dict) -> str:
+    if item["type"].startswith("tuple"):
+        return f"({','.join(_abi_type(component) for component in item['components'])}){item['type'][5:]}"
+    return item["type"]
@@ -0,0 +1,146 @@
+"""
+Token-budgeted chat history for the agent runner.
+
+Recent turns are kept verbatim within a token budget. Turns that fall out of
+the budget are queued as pending, and a background model call (see
+components/history_summarizer.py) folds them into a rolling summary: each call
+extends the previous summary with the pending turns only, so the summary is
+built incrementally instead of being recomputed on every message. Until a
+pending turn is folded in, it is sent as a shortened line after the summary.
+Addresses and transaction hashes mentioned anywhere in the conversation are
+pinned as structured facts and always sent with the history.
+"""
+
+import json
+import re
+import zlib
+
+ADDRESS_PATTERN = re.compile(r"\b0x[a-fA-F0-9]{40}\b")
+TX_HASH_PATTERN = re.compile(r"\b0x[a-fA-F0-9]{64}\b")
+
+# Rough characters-per-token ratio; good enough to enforce a budget without a tokenizer.
+CHARS_PER_TOKEN = 4
+PENDING_LINE_CHARS = 240
+# If the summarizer falls this far behind (e.g. the model is unreachable), the oldest pending turns are dropped.
+MAX_PENDING_TURNS = 50
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def shorten(turn: dict, limit: int = PENDING_LINE_CHARS) -> str:
+    """Renders a turn as one "- role: text" line, cut to limit characters."""
+    text = " ".join(turn["content"].split())
+    if len(text) > limit:
+        text = text[:limit] + "…"
+    return f"- {turn['role']}: {text}"
+
+
+class ChatHistory:
+    def __init__(self, token_budget: int = 4000, summary_budget: int = 800, min_recent_turns: int = 4, max_pinned: int = 50):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.min_recent_turns = min_recent_turns
+        self.max_pinned = max_pinned
+        self.turns: list[dict] = []
+        self.summary = ""
+        # Turns evicted from the recent window but not yet folded into the summary, oldest first.
+        self.pending: list[dict] = []
+        # How many evicted turns have left the pending queue, i.e. the position of pending[0] among all evicted turns.
+        self.folded = 0
+        self.addresses: dict[str, None] = {}
+        self.tx_hashes: dict[str, None] = {}
+        self._recent_tokens = 0
+
+    def append(self, role: str, content: str) -> None:
+        """Adds a turn, pins the facts it mentions and queues the oldest turns for the summary if over budget."""
+        self.turns.append({"role": role, "content": content})
+        self._recent_tokens += estimate_tokens(content)
+        self._pin(content)
+        while self._recent_tokens > self.token_budget and len(self.turns) > self.min_recent_turns:
+            turn = self.turns.pop(0)
+            self._recent_tokens -= estimate_tokens(turn["content"])
+            self.pending.append(turn)
+        if len(self.pending) > MAX_PENDING_TURNS:
+            dropped = len(self.pending) - MAX_PENDING_TURNS
+            del self.pending[:dropped]
+            self.folded += dropped
+
+    def apply_summary(self, summary: str, covered: int) -> bool:
+        """
+        Replaces the summary with one that covers the first `covered` evicted turns and drops
+        those turns from the pending queue. Returns False for a summary older than the current one.
+        """
+        if covered <= self.folded:
+            return False
+        limit = self.summary_budget * CHARS_PER_TOKEN
+        self.summary = summary.strip()[:limit]
+        del self.pending[:covered - self.folded]
+        self.folded = covered
+        return True
+
+    def summary_request(self) -> str:
+        """The summarizer's input: the current summary and the pending turns to fold into it."""
+        turns = "\n".join(shorten(turn, self.summary_budget * CHARS_PER_TOKEN) for turn in self.pending)
+        return f"Current summary:\n{self.summary or '(empty)'}\n\nNew turns to fold in:\n{turns}"
+
+    def to_input(self) -> list[dict]:
+        """Returns the runner input: a context message with summary, pending turns and pinned facts, then the recent turns."""
+        context = []
+        if self.summary:
+            context.append("Summary of earlier conversation:\n" + self.summary)
+        if self.pending:
+            context.append("Earlier turns not yet in the summary:\n" + "\n".join(self._pending_lines()))
+        if self.addresses:
+            context.append("Addresses mentioned so far: " + ", ".join(self.addresses))
+        if self.tx_hashes:
+            context.append("Transaction hashes mentioned so far: " + ", ".join(self.tx_hashes))
+        if not context:
+            return list(self.turns)
+        return [{"role": "system", "content": "\n\n".join(context)}, *self.turns]
+
+    def stats(self) -> dict:
+        return {
+            "recent_turns": len(self.turns),
+            "recent_tokens": self._recent_tokens,
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0,
+            "pending_turns": len(self.pending),
+            "pinned_addresses": len(self.addresses),
+            "pinned_tx_hashes": len(self.tx_hashes),
+        }
+
+    def dump(self) -> bytes:
+        """Serializes the history (recent turns, summary, pending turns and pinned facts) as compressed JSON."""
+        state = [self.turns, self.summary, self.pending, self.folded, list(self.addresses), list(self.tx_hashes)]
+        return zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+
+    def restore(self, data: bytes) -> None:
+        """Replaces the history with one serialized by dump(); budgets are this instance's."""
+        self.turns, self.summary, self.pending, self.folded, addresses, tx_hashes = json.loads(zlib.decompress(data))
+        self.addresses = dict.fromkeys(addresses)
+        self.tx_hashes = dict.fromkeys(tx_hashes)
+        self._recent_tokens = sum(estimate_tokens(turn["content"]) for turn in self.turns)
+
+    def _pending_lines(self) -> list[str]:
+        """The newest pending turns as shortened lines, within the summary budget."""
+        lines, tokens = [], 0
+        for turn in reversed(self.pending):
+            line = shorten(turn)
+            tokens += estimate_tokens(line)
+            if lines and tokens > self.summary_budget:
+                break
+            lines.append(line)
+        return lines[::-1]
+
+    def _pin(self, content: str) -> None:
+        for tx_hash in TX_HASH_PATTERN.findall(content):
+            self._remember(self.tx_hashes, tx_hash.lower())
+        for address in ADDRESS_PATTERN.findall(content):
+            self._remember(self.addresses, address)
+
+    def _remember(self, facts: dict[str, None], value: str) -> None:
+        facts.pop(value, None)
+        facts[value] = None
+        while len(facts) > self.max_pinned:
+            facts.pop(next(iter(facts)))
@@ -0,0 +1,130 @@
+"""
+Compile-once ERC20 template used by deploy_erc20_token.
+
+Token name, symbol, decimals and supply are constructor arguments, so a single
+compiled artifact serves every deployment. The artifact is cached in memory and
+on disk, keyed by a hash of the source and compiler settings.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from solcx import compile_source, install_solc
+
+SOLC_VERSION = "0.8.29"
+SOLC_LONG_VERSION = "v0.8.29+commit.ab55807c"
+OPTIMIZE_RUNS = 200
+CONTRACT_NAME = "ERC20Token"
+CONSTRUCTOR_TYPES = ["string", "string", "uint8", "uint256"]
+
+ERC20_SOURCE = """
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.29;
+
+contract ERC20Token {
+    string public name;
+    string public symbol;
+    uint8 public immutable decimals;
+    uint256 public immutable totalSupply;
+
+    mapping(address => uint256) private _balances;
+    mapping(address => mapping(address => uint256)) private _allowances;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor(string memory name_, string memory symbol_, uint8 decimals_, uint256 totalSupply_) {
+        name = name_;
+        symbol = symbol_;
+        decimals = decimals_;
+        totalSupply = totalSupply_;
+        _balances[msg.sender] = totalSupply_;
+        emit Transfer(address(0), msg.sender, totalSupply_);
+    }
+
+    function balanceOf(address account) public view returns (uint256) {
+        return _balances[account];
+    }
+
+    function allowance(address owner, address spender) public view returns (uint256) {
+        return _allowances[owner][spender];
+    }
+
+    function transfer(address to, uint256 amount) public returns (bool) {
+        require(to != address(0), "ERC20: transfer to zero address");
+        require(_balances[msg.sender] >= amount, "ERC20: insufficient balance");
+
+        _balances[msg.sender] -= amount;
+        _balances[to] += amount;
+        emit Transfer(msg.sender, to, amount);
+        return true;
+    }
+
+    function approve(address spender, uint256 amount) public returns (bool) {
+        require(spender != address(0), "ERC20: approve to zero address");
+
+        _allowances[msg.sender][spender] = amount;
+        emit Approval(msg.sender, spender, amount);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 amount) public returns (bool) {
+        require(to != address(0), "ERC20: transfer to zero address");
+        require(_balances[from] >= amount, "ERC20: insufficient balance");
+        require(_allowances[from][msg.sender] >= amount, "ERC20: insufficient allowance");
+
+        _balances[from] -= amount;
+        _balances[to] += amount;
+        _allowances[from][msg.sender] -= amount;
+        emit Transfer(from, to, amount);
+        return true;
+    }
+}
+"""
+
+_artifact: dict | None = None
+_lock = threading.Lock()
+
+
+def artifact_key() -> str:
+    """Hash of the template source and every compiler setting that affects the output."""
+    settings = json.dumps({"solc": SOLC_VERSION, "optimize": True, "runs": OPTIMIZE_RUNS})
+    return hashlib.sha256((ERC20_SOURCE + settings).encode()).hexdigest()
+
+
+def get_erc20_artifact(cache_dir: str) -> dict:
+    """
+    Returns {"abi", "bin"} for the ERC20 template, compiling it only if neither the
+    in-memory nor the on-disk cache has an artifact for the current source and settings.
+    Blocking; call it from a worker thread inside the event loop.
+    """
+    global _artifact
+    with _lock:
+        if _artifact is not None:
+            return _artifact
+
+        path = os.path.join(cache_dir, f"erc20-{artifact_key()}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                _artifact = json.load(f)
+            return _artifact
+
+        install_solc(SOLC_VERSION)
+        compiled = compile_source(
+            ERC20_SOURCE,
+            output_values=["abi", "bin"],
+            solc_version=SOLC_VERSION,
+            optimize=True,
+            optimize_runs=OPTIMIZE_RUNS,
+        )
+        contract_interface = compiled[f"<stdin>:{CONTRACT_NAME}"]
+        artifact = {"abi": contract_interface["abi"], "bin": contract_interface["bin"]}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(artifact, f)
+        os.replace(tmp_path, path)
+        _artifact = artifact
+        return _artifact
@@ -0,0 +1,10 @@
+"""
+Text formatting shared by tool responses and session notifications.
+"""
+
+
+def format_table(headers, rows):
+    """Renders rows as a compact markdown table."""
+    lines = ["| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    lines += ["| " + " | ".join(row) + " |" for row in rows]
+    return "\n".join(lines)
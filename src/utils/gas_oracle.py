@@ -0,0 +1,103 @@
+"""
+Shared gas price oracle refreshed in the background once per new block or on a fixed interval.
+
+Fee estimation is delegated to a pluggable strategy: LegacyGasStrategy quotes
+`eth_gasPrice`, FeeHistoryGasStrategy derives EIP-1559 fees from a reward
+percentile of `eth_feeHistory`.
+"""
+
+import asyncio
+import logging
+import time
+from web3 import AsyncWeb3
+from .block_watcher import BlockWatcher
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyGasStrategy:
+    async def quote(self, w3: AsyncWeb3) -> tuple[dict, int]:
+        """Returns (transaction fee fields, effective gas price in wei)."""
+        gas_price = await w3.eth.gas_price
+        return {"gasPrice": gas_price}, gas_price
+
+
+class FeeHistoryGasStrategy:
+    def __init__(self, percentile: float = 50, block_count: int = 10):
+        self.percentile = percentile
+        self.block_count = block_count
+
+    async def quote(self, w3: AsyncWeb3) -> tuple[dict, int]:
+        """Returns (transaction fee fields, effective gas price in wei)."""
+        history = await w3.eth.fee_history(self.block_count, "latest", [self.percentile])
+        base_fee = history["baseFeePerGas"][-1]
+        rewards = sorted(reward[0] for reward in history.get("reward", []) if reward)
+        if not rewards:
+            # Chains without EIP-1559 fee data fall back to a legacy quote.
+            return await LegacyGasStrategy().quote(w3)
+        priority_fee = rewards[len(rewards) // 2]
+        fields = {"maxFeePerGas": 2 * base_fee + priority_fee, "maxPriorityFeePerGas": priority_fee}
+        return fields, base_fee + priority_fee
+
+
+class GasOracle:
+    def __init__(self, w3: AsyncWeb3, strategy, block_watcher: BlockWatcher, refresh_interval: float = 0, max_age: float = 60):
+        self.w3 = w3
+        self.strategy = strategy
+        self.block_watcher = block_watcher
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._fields: dict | None = None
+        self._gas_price: int | None = None
+        self._updated_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        if not refresh_interval:
+            block_watcher.subscribe(self._on_block)
+
+    def start(self) -> None:
+        """Starts background refreshes, per block by default or every refresh_interval seconds if set."""
+        if self.refresh_interval:
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._run())
+        else:
+            self.block_watcher.start()
+
+    async def fee_fields(self) -> dict:
+        """Returns the cached fee fields to merge into a transaction (gasPrice or EIP-1559 fees)."""
+        await self._ensure_fresh()
+        return dict(self._fields)
+
+    async def gas_price(self) -> int:
+        """Returns the cached effective gas price in wei."""
+        await self._ensure_fresh()
+        return self._gas_price
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._quote()
+
+    async def _ensure_fresh(self) -> None:
+        self.start()
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self._quote()
+
+    def _is_stale(self) -> bool:
+        return self._fields is None or time.monotonic() - self._updated_at > self.max_age
+
+    async def _quote(self) -> None:
+        self._fields, self._gas_price = await self.strategy.quote(self.w3)
+        self._updated_at = time.monotonic()
+
+    async def _on_block(self, block_number: int) -> None:
+        await self.refresh()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Error refreshing gas oracle: %s", e)
+            await asyncio.sleep(self.refresh_interval)
@@ -0,0 +1,72 @@
+"""
+On-disk index of which ERC20 tokens each address has received, built from Transfer logs.
+
+Rows are (chainid, holder, token) pairs, so a wallet's candidate tokens are one indexed lookup.
+Each chain has a checkpoint with the first indexed block and the next block to scan; pairs and
+the checkpoint are written in one transaction, so an interrupted scan resumes where it stopped.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class HoldingsIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS holdings (
+                    chainid INTEGER NOT NULL,
+                    holder TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    PRIMARY KEY (chainid, holder, token)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    chainid INTEGER PRIMARY KEY,
+                    start_block INTEGER NOT NULL,
+                    next_block INTEGER NOT NULL
+                );
+                """
+            )
+            self._db.commit()
+        return self._db
+
+    def checkpoint(self, chainid: int) -> tuple[int, int] | None:
+        """Returns (first indexed block, next block to scan) for the chain, or None if it was never indexed."""
+        with self._lock:
+            row = self._connect().execute("SELECT start_block, next_block FROM checkpoints WHERE chainid = ?", (chainid,)).fetchone()
+        return tuple(row) if row else None
+
+    def begin(self, chainid: int, start_block: int) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute("INSERT OR IGNORE INTO checkpoints (chainid, start_block, next_block) VALUES (?, ?, ?)", (chainid, start_block, start_block))
+            db.commit()
+
+    def add(self, chainid: int, pairs: set[tuple[str, str]], next_block: int) -> None:
+        """Stores (holder, token) pairs with lowercase addresses and moves the checkpoint to next_block."""
+        with self._lock:
+            db = self._connect()
+            db.executemany("INSERT OR IGNORE INTO holdings (chainid, holder, token) VALUES (?, ?, ?)", ((chainid, *pair) for pair in pairs))
+            db.execute("UPDATE checkpoints SET next_block = ? WHERE chainid = ?", (next_block, chainid))
+            db.commit()
+
+    def tokens(self, chainid: int, holder: str) -> list[str]:
+        with self._lock:
+            rows = self._connect().execute("SELECT token FROM holdings WHERE chainid = ? AND holder = ?", (chainid, holder.lower())).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,29 @@
+"""
+Process-wide pooled aiohttp session for explorer API calls.
+RPC providers get their own per-chain pools (see components/chain_clients.py).
+"""
+
+import aiohttp
+from ..config.settings import HTTP_TIMEOUT, HTTP_POOL_SIZE, HTTP_KEEPALIVE_TIMEOUT
+from .metrics import http_trace_config
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Returns the shared keep-alive session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+            trace_configs=[http_trace_config("explorer")],
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,5 +1,59 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
 import logfire
 
-def configure_logging():
-    logfire.configure(send_to_logfire="if-token-present")
-    logfire.instrument_openai_agents()
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Pass as extra= to keep an INFO record regardless of LOG_SAMPLE_RATE, e.g. for startup and recovery events.
+UNSAMPLED = {"sampled": False}
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps every WARNING and above, and the given share of lower-level records."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "sampled", True):
+            return True
+        return random.random() < self.rate
+
+
+def configure_logging(level: str = "INFO", sample_rate: float = 1.0, prometheus_port: int = 0):
+    """
+    Configures logfire and routes the app's log records to it as structured logs.
+    Records are sampled before they are queued, and formatted and exported on a listener thread
+    so logging never blocks the event loop.
+    """
+    logfire.configure(send_to_logfire="if-token-present", metrics=_metrics_options(prometheus_port))
+    logfire.instrument_openai_agents()
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+    listener = logging.handlers.QueueListener(records, logfire.LogfireLoggingHandler())
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger = logging.getLogger("src")
+    logger.setLevel(level.upper())
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+
+def _metrics_options(prometheus_port: int):
+    if not prometheus_port:
+        return None
+    try:
+        from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        from prometheus_client import start_http_server
+    except ImportError:
+        logger.warning('METRICS_PROMETHEUS_PORT is set but the Prometheus exporter is not installed: uv pip install -e ".[metrics]"')
+        return None
+    start_http_server(prometheus_port)
+    return logfire.MetricsOptions(additional_readers=[PrometheusMetricReader()])
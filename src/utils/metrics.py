@@ -0,0 +1,112 @@
+"""
+Hot-path metrics: latency histograms, outcomes and payload sizes for agent tools, JSON-RPC methods,
+outgoing HTTP calls, LLM hops and streamed chat messages.
+
+Instruments are created through logfire, so they go wherever logfire exports metrics: Logfire
+when LOGFIRE_TOKEN is set, any OpenTelemetry collector when OTEL_EXPORTER_OTLP_ENDPOINT is set,
+and a Prometheus scrape endpoint when METRICS_PROMETHEUS_PORT is set (see utils/logging.py).
+Every duration histogram carries an "outcome" attribute, so call counts and error rates are
+the histogram counts split by outcome.
+"""
+
+import functools
+import logging
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+import aiohttp
+import logfire
+from agents import RunHooks
+
+logger = logging.getLogger(__name__)
+
+tool_duration = logfire.metric_histogram("agent.tool.duration", unit="s", description="Agent tool call latency")
+tool_result_size = logfire.metric_histogram("agent.tool.result.size", unit="By", description="Size of the text a tool returns to the model")
+rpc_duration = logfire.metric_histogram("rpc.request.duration", unit="s", description="JSON-RPC request latency per method and endpoint")
+http_duration = logfire.metric_histogram("http.client.duration", unit="s", description="Outgoing HTTP request latency, up to the response headers")
+http_request_size = logfire.metric_histogram("http.client.request.size", unit="By", description="Outgoing HTTP request body size")
+http_response_size = logfire.metric_histogram("http.client.response.size", unit="By", description="Outgoing HTTP response body size, from Content-Length")
+llm_duration = logfire.metric_histogram("llm.hop.duration", unit="s", description="Latency of one model call by an agent")
+stream_frames = logfire.metric_histogram("chat.stream.frames", unit="{frame}", description="Websocket frames used to stream one assistant message")
+llm_tokens = logfire.metric_counter("llm.tokens", unit="{token}", description="Model tokens used per agent")
+
+
+def timed_tool(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Wraps a tool coroutine to record its latency, outcome and result size. Tools report failures as "Error: ..." strings."""
+    attributes = {"tool": func.__name__}
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await func(*args, **kwargs)
+            outcome = "error" if isinstance(result, str) and result.startswith("Error") else "ok"
+            tool_result_size.record(len(str(result).encode()), attributes)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            tool_duration.record(elapsed, {**attributes, "outcome": outcome})
+            logger.info("Tool %s finished (%s) in %.0f ms", func.__name__, outcome, elapsed * 1000)
+
+    return wrapper
+
+
+def record_rpc(method: str, endpoint: str, latency: float, outcome: str) -> None:
+    rpc_duration.record(latency, {"method": method, "endpoint": endpoint, "outcome": outcome})
+
+
+def http_trace_config(kind: str) -> aiohttp.TraceConfig:
+    """aiohttp tracing hooks recording latency and body sizes of every request made through a session, labelled with kind."""
+
+    def context(trace_request_ctx):
+        return SimpleNamespace(started=0.0, sent=0)
+
+    async def on_request_start(session, ctx, params):
+        ctx.started = time.perf_counter()
+
+    async def on_request_chunk_sent(session, ctx, params):
+        ctx.sent += len(params.chunk)
+
+    def record(ctx, url, outcome):
+        attributes = {"kind": kind, "host": urlsplit(str(url)).netloc, "outcome": outcome}
+        http_duration.record(time.perf_counter() - ctx.started, attributes)
+        http_request_size.record(ctx.sent, attributes)
+        return attributes
+
+    async def on_request_end(session, ctx, params):
+        attributes = record(ctx, params.url, str(params.response.status))
+        if params.response.content_length is not None:
+            http_response_size.record(params.response.content_length, attributes)
+
+    async def on_request_exception(session, ctx, params):
+        record(ctx, params.url, type(params.exception).__name__)
+
+    trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=context)
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+class LLMHopMetrics(RunHooks):
+    """Run hooks recording the latency and token usage of every model call an agent makes."""
+
+    def __init__(self):
+        self._started: dict[tuple[int, str], float] = {}
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self._started[(id(context), agent.name)] = time.perf_counter()
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        started = self._started.pop((id(context), agent.name), None)
+        attributes = {"agent": agent.name}
+        if started is not None:
+            llm_duration.record(time.perf_counter() - started, attributes)
+        llm_tokens.add(response.usage.input_tokens, {**attributes, "direction": "input"})
+        llm_tokens.add(response.usage.output_tokens, {**attributes, "direction": "output"})
+
+
+llm_hop_metrics = LLMHopMetrics()
@@ -0,0 +1,120 @@
+"""
+Batches read-only RPC and contract calls into a single round trip.
+
+Contract calls are aggregated through Multicall3 `aggregate3` when the chain
+has the contract deployed, and sent as one JSON-RPC batch request otherwise.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable
+from eth_utils.abi import get_abi_output_types
+from web3 import AsyncWeb3
+from web3.contract.async_contract import AsyncContractFunction
+from web3.exceptions import BadFunctionCallOutput, Web3TypeError
+from .abis import MULTICALL3_ABI, MULTICALL3_ADDRESS
+from .logging import UNSAMPLED
+
+logger = logging.getLogger(__name__)
+
+# chainid -> whether Multicall3 answered on that chain, learned from the first batch.
+_multicall_support: dict[int, bool] = {}
+
+
+class _CallFailed(ValueError):
+    pass
+
+
+async def batch_call(w3: AsyncWeb3, calls: list[AsyncContractFunction], chainid: int = 97, allow_failure: bool = False) -> list[Any]:
+    """
+    Executes the given bound contract calls in one round trip and returns their decoded results in order.
+    Raises ValueError if any of the calls reverts, unless allow_failure is set, in which case failed calls yield None.
+    """
+    if _multicall_support.get(chainid, True):
+        try:
+            results = await _aggregate3(w3, calls, allow_failure)
+            _multicall_support[chainid] = True
+            return results
+        except BadFunctionCallOutput:
+            # An empty result means there is no contract at the Multicall3 address on this chain.
+            logger.info("Multicall3 not deployed on chain %s, falling back to JSON-RPC batch", chainid, extra=UNSAMPLED)
+            _multicall_support[chainid] = False
+        except _CallFailed:
+            raise
+        except Exception as e:
+            logger.warning("Multicall3 call failed, falling back to JSON-RPC batch: %s", e)
+    if allow_failure:
+        # A JSON-RPC batch fails as a whole on one revert, so failures are isolated with separate calls.
+        results = await asyncio.gather(*(call.call() for call in calls), return_exceptions=True)
+        return [None if isinstance(result, Exception) else result for result in results]
+    return await _json_rpc_batch(w3, calls)
+
+
+async def _aggregate3(w3: AsyncWeb3, calls: list[AsyncContractFunction], allow_failure: bool = False) -> list[Any]:
+    multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    payload = [(call.address, allow_failure, call._encode_transaction_data()) for call in calls]
+    responses = await multicall.functions.aggregate3(payload).call()
+    if len(responses) != len(calls):
+        raise ValueError("Unexpected Multicall3 response length")
+
+    results = []
+    for call, (success, return_data) in zip(calls, responses):
+        if not success:
+            if allow_failure:
+                results.append(None)
+                continue
+            raise _CallFailed(f"Call to {call.fn_name} on {call.address} reverted")
+        output_types = get_abi_output_types(call.abi)
+        try:
+            decoded = w3.codec.decode(output_types, return_data)
+        except Exception:
+            # Non-ERC20 contracts can return data that does not decode as the expected type
+            if not allow_failure:
+                raise
+            results.append(None)
+            continue
+        results.append(decoded[0] if len(decoded) == 1 else decoded)
+    return results
+
+
+async def _json_rpc_batch(w3: AsyncWeb3, calls: list[AsyncContractFunction]) -> list[Any]:
+    try:
+        async with w3.batch_requests() as batch:
+            for call in calls:
+                batch.add(call)
+            return await batch.async_execute()
+    except Web3TypeError:
+        # The provider cannot batch (e.g. in-process test providers): issue the calls concurrently instead.
+        return list(await asyncio.gather(*(call.call() for call in calls)))
+
+
+async def batch_rpc(w3: AsyncWeb3, method: Callable, params: list[Any]) -> list[Any]:
+    """
+    Calls a single-argument `w3.eth` method once per entry of params in one JSON-RPC batch,
+    e.g. await batch_rpc(w3, w3.eth.get_balance, accounts).
+    """
+    if not params:
+        return []
+    try:
+        async with w3.batch_requests() as batch:
+            batch.add_mapping({method: params})
+            return await batch.async_execute()
+    except Web3TypeError:
+        return list(await asyncio.gather(*(method(param) for param in params)))
+
+
+async def batch_raw_rpc(w3: AsyncWeb3, requests: list[tuple[str, list]]) -> list[Any]:
+    """
+    Sends raw (method, params) JSON-RPC requests in one batch and returns the unformatted results in order.
+    A request that errors or has no result yields None instead of failing the whole batch.
+    """
+    if not requests:
+        return []
+    try:
+        responses = await w3.provider.make_batch_request(requests)
+    except NotImplementedError:
+        responses = [await w3.provider.make_request(method, params) for method, params in requests]
+    if isinstance(responses, dict):
+        # A single error object means the endpoint rejected the batch as a whole.
+        raise ValueError(responses.get("error", responses))
+    return [response.get("result") for response in responses]
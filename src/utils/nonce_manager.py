@@ -0,0 +1,78 @@
+"""
+Local per-(chain, sender) nonce allocation so transactions from one wallet can be pipelined.
+
+The first reservation for a sender syncs with the node's pending nonce; later
+reservations are handed out locally without an RPC round trip. Nonces of sends
+the node rejected are released for reuse, and a "nonce too low" error resyncs the
+sender. A send that timed out or lost its connection may still have been broadcast,
+so its nonce is never released; the sender is resynced from the node instead.
+"""
+
+import asyncio
+import aiohttp
+from web3 import AsyncWeb3
+
+NONCE_ERRORS = ("nonce too low", "nonce has already been used", "replacement transaction underpriced")
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a send failed because the local nonce is behind the node's view of the account."""
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """Whether the node already holds this exact signed transaction, so the send has in effect succeeded."""
+    return "already known" in str(error).lower()
+
+
+def may_have_been_broadcast(error: Exception) -> bool:
+    """Whether a send failed in transit (a timeout or a dropped connection) after the node may have accepted it."""
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return False
+    return isinstance(error, (TimeoutError, aiohttp.ClientError))
+
+
+class NonceManager:
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self._next: dict[tuple[int, str], int] = {}
+        self._released: dict[tuple[int, str], set[int]] = {}
+        self._locks: dict[tuple[int, str], asyncio.Lock] = {}
+
+    async def reserve(self, address: str, chainid: int = 97) -> int:
+        """Hands out the next nonce for address, preferring nonces released by failed sends."""
+        key = (chainid, address.lower())
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if key not in self._next:
+                self._next[key] = await self.w3.eth.get_transaction_count(address, "pending")
+                self._released[key] = set()
+            released = self._released[key]
+            if released:
+                nonce = min(released)
+                released.remove(nonce)
+                return nonce
+            nonce = self._next[key]
+            self._next[key] = nonce + 1
+            return nonce
+
+    def release(self, address: str, nonce: int, chainid: int = 97) -> None:
+        """Returns the nonce of a transaction that was never broadcast so it is reused by the next send."""
+        key = (chainid, address.lower())
+        if key not in self._next:
+            return
+        if nonce == self._next[key] - 1:
+            self._next[key] = nonce
+            # Collapse any released nonces that now sit at the top of the range.
+            while self._next[key] - 1 in self._released[key]:
+                self._released[key].remove(self._next[key] - 1)
+                self._next[key] -= 1
+        elif nonce < self._next[key]:
+            self._released[key].add(nonce)
+
+    async def resync(self, address: str, chainid: int = 97) -> None:
+        """Drops local state for address so the next reservation refetches the pending nonce."""
+        key = (chainid, address.lower())
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            self._next.pop(key, None)
+            self._released.pop(key, None)
@@ -0,0 +1,42 @@
+"""
+Pushes messages from background tasks to the Chainlit session that started the work.
+"""
+
+import asyncio
+import logging
+import chainlit as cl
+from chainlit.context import ChainlitContextException, init_ws_context
+from chainlit.session import WebsocketSession
+
+logger = logging.getLogger(__name__)
+
+
+def current_session_id() -> str | None:
+    """Returns the id of the Chainlit session handling the current call, or None outside a session."""
+    try:
+        return cl.context.session.id
+    except ChainlitContextException:
+        return None
+
+
+async def notify_session(session_id: str | None, content: str) -> None:
+    """Sends a message to the given session; sessions that have disconnected are skipped."""
+    if session_id is None:
+        logger.info("Notification outside a session: %s", content)
+        return
+
+    # init_ws_context looks a string up as a socket id, so resolve the session by its id first.
+    session = WebsocketSession.get_by_id(session_id)
+    if session is None:
+        logger.info("Session %s has disconnected, skipping notification", session_id)
+        return
+
+    async def send():
+        # Runs in its own task so the Chainlit context does not leak into the caller's loop.
+        init_ws_context(session)
+        await cl.Message(content=content).send()
+
+    try:
+        await asyncio.create_task(send())
+    except Exception as e:
+        logger.warning("Error notifying session %s: %s", session_id, e)
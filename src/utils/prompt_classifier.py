@@ -0,0 +1,70 @@
+"""
+Deterministic pre-classifier that clears obviously in-scope prompts before the LLM guardrail.
+
+A prompt is cleared only when the whole message fully matches one of the strict
+read-only grammar rules below, such as "balance of 0x…" or "gas price on BSC".
+The fast-path router answers the same READ_ONLY_RULES directly from the tools.
+Transfers, approvals, deployments and anything with extra text around a
+recognised query are left for the LLM guardrail; this classifier never rejects.
+"""
+
+import re
+from ..config.chains import find_chain
+
+ADDRESS = r"0x[a-fA-F0-9]{40}"
+ADDRESS_LIST = rf"{ADDRESS}(?:\s*(?:,|and|&)?\s*{ADDRESS})*"
+PREFIX = r"(?:(?:please\s+)?(?:what(?:'s|\s+is|\s+are)|get|show(?:\s+me)?|fetch|check|tell\s+me)\s+)?(?:the\s+)?(?:current\s+)?"
+# Optional network suffix, e.g. "on BSC", "on the Sepolia network", "on chain 56".
+CHAIN = r"(?:\s+(?:on|in)\s+(?:the\s+)?(?:chain\s+)?(?P<chain>[a-z0-9]+(?:\s+[a-z0-9]+)??)(?:\s+(?:network|chain|mainnet))?)?"
+
+# (pattern, tool name) tried in order; patterns must match the whole message.
+READ_ONLY_RULES = [
+    (rf"{PREFIX}gas\s*price", "eth_gas_price"),
+    (
+        rf"{PREFIX}token\s+balances?\s+(?:of|for)\s+(?P<accounts>{ADDRESS_LIST})\s+(?:for|of|on|in)\s+(?:the\s+)?(?:token\s+)?(?:at\s+)?(?P<token>{ADDRESS})",
+        "token_get_balance",
+    ),
+    (
+        rf"{PREFIX}(?:token\s+(?:info|information|details)|details\s+of\s+(?:the\s+)?token)\s+(?:of\s+|for\s+|at\s+)?(?P<token>{ADDRESS})",
+        "token_get_info",
+    ),
+    (rf"{PREFIX}(?:eth\s+|bnb\s+)?balances?\s+(?:of|for)\s+(?P<accounts>{ADDRESS_LIST})", "eth_get_balance"),
+    (rf"{PREFIX}(?:nonce|transaction\s+count|tx\s+count)s?\s+(?:of|for)\s+(?P<accounts>{ADDRESS_LIST})", "eth_get_transaction_count"),
+    (rf"{PREFIX}(?:byte\s*)?code\s+(?:of|for|at)\s+(?:the\s+)?(?:contract\s+)?(?:at\s+)?(?P<account>{ADDRESS})", "eth_get_code"),
+]
+
+# Queries that are in scope but only cleared here, not answered by the fast path.
+KNOWN_OPERATIONS = [
+    *READ_ONLY_RULES,
+    (
+        rf"{PREFIX}(?:(?:token\s+)?(?:portfolio|holdings)\s+(?:of|for)\s+{ADDRESS}|(?:which|what)\s+tokens\s+(?:does|do)\s+{ADDRESS}\s+(?:hold|own|have))",
+        "get_portfolio",
+    ),
+    (rf"(?:please\s+)?(?:watch|stop\s+watching|unwatch)\s+(?:the\s+)?(?:address\s+)?{ADDRESS}", "watch_address"),
+    (rf"{PREFIX}(?:list\s+(?:my\s+)?watch(?:es|ed\s+addresses)|watched\s+addresses)", "list_watches"),
+]
+
+
+def compile_rules(rules: list[tuple[str, str]]) -> list[tuple[re.Pattern, str]]:
+    """Adds the optional network suffix and trailing punctuation to each rule, for use with fullmatch."""
+    return [(re.compile(pattern + CHAIN + r"\s*[?.!]*", re.IGNORECASE), name) for pattern, name in rules]
+
+
+COMPILED_OPERATIONS = compile_rules(KNOWN_OPERATIONS)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercases and collapses whitespace so trivially different phrasings share a cache key."""
+    return " ".join(prompt.lower().split()).rstrip("?!. ")
+
+
+def preclassify(prompt: str) -> str | None:
+    """Returns the matched operation name if the whole prompt is a known read-only query, otherwise None."""
+    text = " ".join(prompt.split())
+    for pattern, operation in COMPILED_OPERATIONS:
+        match = pattern.fullmatch(text)
+        if match is not None:
+            # The network suffix takes any one or two words, so only known network names clear the prompt.
+            chain = match.groupdict().get("chain")
+            return operation if chain is None or find_chain(chain) is not None else None
+    return None
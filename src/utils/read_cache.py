@@ -0,0 +1,81 @@
+"""
+Shared cache for read-only query results, scoped to the current block.
+
+Mutable reads (balances, nonces) are keyed by (chain, method, args, block
+number) and dropped when the block watcher reports a new head. Immutable
+reads (contract code, token name/symbol/decimals) are kept across blocks
+and evicted least-recently-used first.
+"""
+
+from typing import Any, Awaitable, Callable, Hashable
+from .block_watcher import BlockWatcher
+from .ttl_cache import TTLCache
+
+
+class ReadCache:
+    def __init__(self, block_watcher: BlockWatcher, max_entries: int, max_immutable_entries: int, chainid: int = 97):
+        self.block_watcher = block_watcher
+        self.chainid = chainid
+        self._mutable = TTLCache(max_entries, ttl=None)
+        self._immutable = TTLCache(max_immutable_entries, ttl=None)
+        block_watcher.subscribe(self._on_block)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self._mutable.hits + self._immutable.hits,
+            "misses": self._mutable.misses + self._immutable.misses,
+            "entries": len(self._mutable) + len(self._immutable),
+        }
+
+    @property
+    def head(self) -> int | None:
+        """Latest block number reported by the block watcher, or None before the first poll."""
+        return self.block_watcher.latest
+
+    def get(self, method: str, args: tuple, immutable: bool = False) -> tuple[bool, Any]:
+        """Returns (cache hit, cached result) for method(*args)."""
+        return self._lookup(self._key(method, args, immutable), immutable)
+
+    def set(self, method: str, args: tuple, value: Any, immutable: bool = False, at_block: int | None = None) -> None:
+        """Stores a result; a mutable one read at an older block than the current head (at_block) is dropped."""
+        if not immutable and at_block is not None and at_block != self.head:
+            return
+        self._store(self._key(method, args, immutable), value, immutable)
+
+    async def fetch(self, method: str, args: tuple, load: Callable[[], Awaitable[Any]], immutable: bool = False) -> tuple[Any, bool]:
+        """Returns (result, cache hit) for method(*args), calling load() on a miss."""
+        # The key is taken before loading so a result is never filed under a block that arrived mid-request.
+        key = self._key(method, args, immutable)
+        hit, value = self._lookup(key, immutable)
+        if hit:
+            return value, True
+        value = await load()
+        self._store(key, value, immutable)
+        return value, False
+
+    def clear(self) -> None:
+        self._mutable.clear()
+        self._immutable.clear()
+
+    def _lookup(self, key: Hashable | None, immutable: bool) -> tuple[bool, Any]:
+        if key is None:
+            return False, None
+        entry = (self._immutable if immutable else self._mutable).get(key)
+        return (False, None) if entry is None else (True, entry[0])
+
+    def _store(self, key: Hashable | None, value: Any, immutable: bool) -> None:
+        if key is not None:
+            (self._immutable if immutable else self._mutable).set(key, (value,))
+
+    def _key(self, method: str, args: tuple, immutable: bool) -> Hashable | None:
+        if immutable:
+            return (self.chainid, method, args)
+        # Without a known head block there is nothing to scope a mutable read to, so it is not cached.
+        self.block_watcher.start()
+        if self.block_watcher.latest is None:
+            return None
+        return (self.chainid, method, args, self.block_watcher.latest)
+
+    async def _on_block(self, block_number: int) -> None:
+        self._mutable.clear()
@@ -0,0 +1,215 @@
+"""
+Multi-endpoint JSON-RPC provider with latency-aware routing, hedged reads and circuit breaking.
+
+Each endpoint keeps an EWMA of its latency and a window of recent samples.
+Reads go to the fastest healthy endpoint; if the answer takes longer than that
+endpoint's latency percentile, a duplicate is sent to the next best endpoint and
+the first answer wins. Transport failures (connection errors, timeouts, HTTP
+errors) count against an endpoint, and after enough consecutive failures its
+circuit opens: it is skipped until a cooldown passes, then a single trial
+request decides whether it closes again. Writes are never hedged and only fail
+over when the endpoint could not be reached, so a transaction is never sent twice.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit
+import aiohttp
+from web3 import AsyncHTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from .metrics import record_rpc
+from .logging import UNSAMPLED
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+# Hedging starts once an endpoint has this many latency samples.
+MIN_HEDGE_SAMPLES = 10
+
+
+class Endpoint:
+    def __init__(self, url: str, request_kwargs: dict | None, ewma_alpha: float = 0.3, window: int = 100):
+        self.url = url
+        # Metrics are labelled by host only, so API keys in the URL path or query never reach an exporter.
+        self.host = urlsplit(url).netloc
+        # Retries are handled across endpoints here, so the per-endpoint provider fails fast.
+        self.provider = AsyncHTTPProvider(url, request_kwargs=request_kwargs, exception_retry_configuration=None)
+        self.ewma_alpha = ewma_alpha
+        self.ewma: float | None = None
+        self.samples: deque[float] = deque(maxlen=window)
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    def available(self, cooldown: float) -> bool:
+        """Closed circuits are available; an open one allows a single trial request after the cooldown."""
+        if self.opened_at is None:
+            return True
+        return not self.trial_in_flight and time.monotonic() - self.opened_at >= cooldown
+
+    def record_latency(self, latency: float) -> None:
+        self.samples.append(latency)
+        self.ewma = latency if self.ewma is None else self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.ewma
+
+    def record_success(self, latency: float) -> None:
+        self.record_latency(latency)
+        self.failures = 0
+        self.trial_in_flight = False
+        if self.opened_at is not None:
+            logger.info("RPC endpoint %s recovered, closing circuit", self.host, extra=UNSAMPLED)
+            self.opened_at = None
+
+    def record_failure(self, failure_threshold: int) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= failure_threshold:
+            if self.opened_at is None:
+                logger.warning("RPC endpoint %s failed %d times in a row, opening circuit", self.host, self.failures)
+            self.opened_at = time.monotonic()
+
+    def hedge_delay(self, percentile: float, min_delay: float) -> float | None:
+        """Seconds to wait for this endpoint before hedging, or None while there are too few samples."""
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return max(min_delay, ordered[index])
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "ewma_ms": None if self.ewma is None else round(self.ewma * 1000, 1),
+            "samples": len(self.samples),
+            "consecutive_failures": self.failures,
+            "circuit": "closed" if self.opened_at is None else "open",
+        }
+
+
+class FailoverHTTPProvider(AsyncJSONBaseProvider):
+    def __init__(
+        self,
+        urls: list[str] | tuple[str, ...],
+        request_kwargs: dict | None = None,
+        hedge_percentile: float = 95,
+        min_hedge_delay: float = 0.05,
+        failure_threshold: int = 3,
+        cooldown: float = 30,
+        **kwargs: Any,
+    ):
+        if not urls:
+            raise ValueError("FailoverHTTPProvider needs at least one RPC URL")
+        self.endpoints = [Endpoint(url, request_kwargs) for url in urls]
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hedged_requests = 0
+        super().__init__(**kwargs)
+
+    def __str__(self) -> str:
+        return f"RPC connection {', '.join(endpoint.url for endpoint in self.endpoints)}"
+
+    async def cache_async_session(self, session: aiohttp.ClientSession) -> aiohttp.ClientSession:
+        for endpoint in self.endpoints:
+            await endpoint.provider.cache_async_session(session)
+        return session
+
+    async def disconnect(self) -> None:
+        for endpoint in self.endpoints:
+            await endpoint.provider.disconnect()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return await self._dispatch(lambda provider: provider.make_request(method, params), method, method in WRITE_METHODS)
+
+    async def make_batch_request(self, batch_requests: list[tuple[RPCEndpoint, Any]]) -> list[RPCResponse] | RPCResponse:
+        write = any(method in WRITE_METHODS for method, _ in batch_requests)
+        return await self._dispatch(lambda provider: provider.make_batch_request(batch_requests), "batch", write)
+
+    def stats(self) -> dict:
+        return {"hedged_requests": self.hedged_requests, "endpoints": [endpoint.stats() for endpoint in self.endpoints]}
+
+    def _ranked(self) -> list[Endpoint]:
+        """Healthy endpoints, fastest first; if every circuit is open, all endpoints, longest-open first."""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.available(self.cooldown)]
+        if healthy:
+            # Endpoints without samples sort first so a new or recovered endpoint gets measured.
+            return sorted(healthy, key=lambda endpoint: endpoint.ewma or 0.0)
+        return sorted(self.endpoints, key=lambda endpoint: endpoint.opened_at)
+
+    async def _dispatch(self, call: Callable[[AsyncHTTPProvider], Awaitable[Any]], method: str, write: bool) -> Any:
+        candidates = self._ranked()
+        if write:
+            return await self._failover(call, method, candidates)
+        return await self._hedged(call, method, candidates)
+
+    async def _attempt(self, endpoint: Endpoint, call: Callable[[AsyncHTTPProvider], Awaitable[Any]], method: str) -> Any:
+        if endpoint.opened_at is not None:
+            endpoint.trial_in_flight = True
+        start = time.monotonic()
+        try:
+            response = await call(endpoint.provider)
+        except asyncio.CancelledError:
+            # A request that lost a hedge race was at least this slow.
+            latency = time.monotonic() - start
+            endpoint.record_latency(latency)
+            endpoint.trial_in_flight = False
+            record_rpc(method, endpoint.host, latency, "cancelled")
+            raise
+        except Exception as e:
+            endpoint.record_failure(self.failure_threshold)
+            record_rpc(method, endpoint.host, time.monotonic() - start, type(e).__name__)
+            raise
+        latency = time.monotonic() - start
+        endpoint.record_success(latency)
+        record_rpc(method, endpoint.host, latency, "rpc_error" if isinstance(response, dict) and "error" in response else "ok")
+        return response
+
+    async def _failover(self, call, method: str, candidates: list[Endpoint]) -> Any:
+        for index, endpoint in enumerate(candidates):
+            try:
+                return await self._attempt(endpoint, call, method)
+            except aiohttp.ClientConnectorError as e:
+                if index == len(candidates) - 1:
+                    raise
+                logger.warning("RPC endpoint %s unreachable, failing over: %s", endpoint.host, e)
+
+    async def _hedged(self, call, method: str, candidates: list[Endpoint]) -> Any:
+        remaining = iter(candidates)
+        in_flight: dict[asyncio.Task, Endpoint] = {}
+        last_error: Exception | None = None
+        hedged = False
+
+        def launch() -> Endpoint | None:
+            endpoint = next(remaining, None)
+            if endpoint is not None:
+                in_flight[asyncio.create_task(self._attempt(endpoint, call, method))] = endpoint
+            return endpoint
+
+        primary = launch()
+        try:
+            while in_flight:
+                delay = None
+                if not hedged and len(candidates) > 1:
+                    delay = primary.hedge_delay(self.hedge_percentile, self.min_hedge_delay)
+                done, _ = await asyncio.wait(in_flight, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch() is not None:
+                        self.hedged_requests += 1
+                    continue
+                for task in done:
+                    endpoint = in_flight.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning("RPC endpoint %s failed: %s", endpoint.host, last_error)
+                if not in_flight:
+                    launch()
+            raise last_error
+        finally:
+            for task in in_flight:
+                task.cancel()
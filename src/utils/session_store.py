@@ -0,0 +1,196 @@
+"""
+Chat history storage keyed by Chainlit thread, so a conversation is not tied to one process.
+
+- MemorySessionStore keeps ChatHistory objects in process, least recently used first out past
+  a session bound. Good for a single worker.
+- SqliteSessionStore keeps them in a SQLite file shared by every worker on the host. Each turn
+  is appended as one row; every `snapshot_interval` turns the rows are folded into the session's
+  compressed ChatHistory snapshot and deleted, so a session's footprint stays within the history
+  budgets. Idle sessions expire after the TTL.
+
+Both bound what a session holds by the ChatHistory token budgets, and store the rolling
+summaries the history summarizer produces with update_summary().
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from .chat_history import ChatHistory
+
+
+class MemorySessionStore:
+    def __init__(self, new_history: Callable[[], ChatHistory], max_sessions: int, ttl: float):
+        self.new_history = new_history
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: OrderedDict[str, tuple[float, ChatHistory]] = OrderedDict()
+
+    async def load(self, session_id: str) -> ChatHistory:
+        entry = self._sessions.get(session_id)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return self.new_history()
+        self._sessions.move_to_end(session_id)
+        return entry[1]
+
+    async def append(self, session_id: str, role: str, content: str) -> ChatHistory:
+        """Adds a turn to the session's history and returns the history."""
+        history = await self.load(session_id)
+        history.append(role, content)
+        self._sessions[session_id] = (time.time(), history)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return history
+
+    async def update_summary(self, session_id: str, summary: str, covered: int) -> bool:
+        """Stores a summary covering the session's first `covered` evicted turns; False if the session is gone or has a newer one."""
+        entry = self._sessions.get(session_id)
+        return entry is not None and entry[1].apply_summary(summary, covered)
+
+    async def close(self) -> None:
+        self._sessions.clear()
+
+
+class SqliteSessionStore:
+    def __init__(self, path: str, new_history: Callable[[], ChatHistory], snapshot_interval: int, ttl: float):
+        self.path = path
+        self.new_history = new_history
+        self.snapshot_interval = snapshot_interval
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Autocommit mode, so writes can take the database lock up front with BEGIN IMMEDIATE
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    snapshot BLOB,
+                    snapshot_seq INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+                CREATE TABLE IF NOT EXISTS session_turns (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                );
+                """
+            )
+        return self._db
+
+    async def load(self, session_id: str) -> ChatHistory:
+        return await asyncio.to_thread(self._load, session_id)
+
+    async def append(self, session_id: str, role: str, content: str) -> ChatHistory:
+        """Appends a turn to the session and returns its history, folding pending turns into the snapshot when due."""
+        return await asyncio.to_thread(self._append, session_id, role, content)
+
+    async def update_summary(self, session_id: str, summary: str, covered: int) -> bool:
+        """Stores a summary covering the session's first `covered` evicted turns; False if the session is gone or has a newer one."""
+        return await asyncio.to_thread(self._update_summary, session_id, summary, covered)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _load(self, session_id: str) -> ChatHistory:
+        with self._lock:
+            return self._read(self._connect(), session_id)[0]
+
+    def _append(self, session_id: str, role: str, content: str) -> ChatHistory:
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                history, seq, pending = self._read(db, session_id)
+                history.append(role, content)
+                seq += 1
+                if pending + 1 >= self.snapshot_interval:
+                    self._snapshot(db, session_id, history, seq, now)
+                    self._expire(db, now)
+                else:
+                    db.execute("INSERT INTO session_turns (session_id, seq, role, content) VALUES (?, ?, ?, ?)", (session_id, seq, role, content))
+                    db.execute(
+                        "INSERT INTO sessions (session_id, updated_at) VALUES (?, ?) ON CONFLICT (session_id) DO UPDATE SET updated_at = excluded.updated_at",
+                        (session_id, now),
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return history
+
+    def _update_summary(self, session_id: str, summary: str, covered: int) -> bool:
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                history, seq, _ = self._read(db, session_id)
+                # The summary is only in the snapshot, so the pending turn rows are folded into it now.
+                applied = seq > 0 and history.apply_summary(summary, covered)
+                if applied:
+                    self._snapshot(db, session_id, history, seq, time.time())
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return applied
+
+    def _snapshot(self, db: sqlite3.Connection, session_id: str, history: ChatHistory, seq: int, now: float) -> None:
+        """Writes the session's history as its snapshot and deletes the turn rows it now contains."""
+        db.execute(
+            """
+            INSERT INTO sessions (session_id, snapshot, snapshot_seq, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (session_id) DO UPDATE SET snapshot = excluded.snapshot, snapshot_seq = excluded.snapshot_seq, updated_at = excluded.updated_at
+            """,
+            (session_id, history.dump(), seq, now),
+        )
+        db.execute("DELETE FROM session_turns WHERE session_id = ?", (session_id,))
+
+    def _read(self, db: sqlite3.Connection, session_id: str) -> tuple[ChatHistory, int, int]:
+        """Returns the session's history, the sequence number of its last turn and how many turns are not yet in the snapshot."""
+        history = self.new_history()
+        row = db.execute("SELECT snapshot, snapshot_seq, updated_at FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return history, 0, 0
+        if time.time() - row[2] > self.ttl:
+            self._delete(db, [session_id])
+            return history, 0, 0
+        snapshot, seq, _ = row
+        if snapshot is not None:
+            history.restore(snapshot)
+        turns = db.execute("SELECT seq, role, content FROM session_turns WHERE session_id = ? ORDER BY seq", (session_id,)).fetchall()
+        for seq, role, content in turns:
+            history.append(role, content)
+        return history, seq, len(turns)
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        self._delete(db, [row[0] for row in db.execute("SELECT session_id FROM sessions WHERE updated_at < ?", (now - self.ttl,))])
+
+    def _delete(self, db: sqlite3.Connection, session_ids: list[str]) -> None:
+        db.executemany("DELETE FROM session_turns WHERE session_id = ?", [(session_id,) for session_id in session_ids])
+        db.executemany("DELETE FROM sessions WHERE session_id = ?", [(session_id,) for session_id in session_ids])
+
+
+def open_session_store(kind: str, path: str, new_history: Callable[[], ChatHistory], max_sessions: int, snapshot_interval: int, ttl: float):
+    if kind == "sqlite":
+        return SqliteSessionStore(path, new_history, snapshot_interval, ttl)
+    if kind == "memory":
+        return MemorySessionStore(new_history, max_sessions, ttl)
+    raise ValueError(f"Unknown SESSION_STORE {kind!r}, expected 'memory' or 'sqlite'")
@@ -0,0 +1,62 @@
+"""
+Coalesces streamed model deltas into fewer websocket frames.
+
+Models emit a delta every few characters, and Message.stream_token sends one frame per call.
+TokenCoalescer buffers deltas and sends them as one token when the buffer is older than the
+flush interval or larger than the byte budget, or when the caller flushes at a boundary such
+as a tool call or a handoff. The first delta of a message is sent at once so time to first
+token is unchanged.
+"""
+
+import asyncio
+import chainlit as cl
+from .metrics import stream_frames
+
+
+class TokenCoalescer:
+    def __init__(self, msg: cl.Message, interval: float, max_bytes: int):
+        self.msg = msg
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.frames = 0
+        self.deltas = 0
+        self._buffer: list[str] = []
+        self._size = 0
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, delta: str) -> None:
+        if not delta:
+            return
+        self.deltas += 1
+        self._buffer.append(delta)
+        self._size += len(delta.encode())
+        if self.frames == 0 or self.interval <= 0 or self._size >= self.max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Sends everything buffered as one token; a no-op when the buffer is empty."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self._buffer:
+                return
+            token = "".join(self._buffer)
+            self._buffer.clear()
+            self._size = 0
+            self.frames += 1
+            await self.msg.stream_token(token)
+
+    async def close(self) -> None:
+        """Flushes what is left and records how many frames the message took."""
+        await self.flush()
+        stream_frames.record(self.frames)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        # Detach first, so a flush from add() cannot cancel this one while it is sending
+        self._timer = None
+        await self.flush()